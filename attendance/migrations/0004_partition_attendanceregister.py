@@ -0,0 +1,31 @@
+"""
+Particiona attendance_attendanceregister por mes de timestamp_in (solo PostgreSQL)
+
+Copia las marcas existentes mes por mes dentro de la transacción de la
+migración, que bloquea la tabla mientras dura: en tablas grandes conviene
+correrla en una ventana de mantenimiento. Ver payrolls/services/attendance_partitions.py
+"""
+from django.db import migrations
+
+
+def partition(apps, schema_editor):
+    from payrolls.services.attendance_partitions import partition_table
+
+    partition_table(schema_editor.connection)
+
+
+def unpartition(apps, schema_editor):
+    from payrolls.services.attendance_partitions import unpartition_table
+
+    unpartition_table(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_attendanceregister_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,31 @@
+"""
+Columna generada shift_range (tstzrange) con índice GiST y restricción de
+exclusión de turnos cruzados por empleado (solo PostgreSQL)
+
+Agregar la columna reescribe la tabla. Si ya hay turnos cerrados que se
+cruzan la migración falla indicando cuáles. Ver payrolls/services/shift_ranges.py
+"""
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from payrolls.services.shift_ranges import install_shift_range
+
+    install_shift_range(schema_editor.connection)
+
+
+def remove(apps, schema_editor):
+    from payrolls.services.shift_ranges import remove_shift_range
+
+    remove_shift_range(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_partition_attendanceregister'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, remove),
+    ]
@@ -0,0 +1,75 @@
+"""
+Las marcas referencian el NFCToken por llave foránea en lugar de guardar el JWT
+
+El texto pasa a legacy_nfc_token y se llena el FK buscando el token por su
+JWT, en lotes de ids que se confirman por separado (la migración no es
+atómica) para no bloquear la tabla de marcas mientras dura. A las marcas
+enlazadas se les borra el texto; solo lo conservan las de tokens que ya no
+existen. El reverso vuelve a copiar el JWT.
+"""
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+from django.db.models import Max, Min, OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def _batches(AttendanceRegister, using):
+    bounds = AttendanceRegister.objects.using(using).aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return
+    for start in range(bounds["first"], bounds["last"] + 1, BATCH_SIZE):
+        yield AttendanceRegister.objects.using(using).filter(
+            id__gte=start, id__lt=start + BATCH_SIZE
+        )
+
+
+def link_tokens(apps, schema_editor):
+    AttendanceRegister = apps.get_model("attendance", "AttendanceRegister")
+    NFCToken = apps.get_model("authentication", "NFCToken")
+    using = schema_editor.connection.alias
+
+    token_id = NFCToken.objects.using(using).filter(token=OuterRef("legacy_nfc_token"))
+    for batch in _batches(AttendanceRegister, using):
+        with transaction.atomic(using=using):
+            batch.filter(legacy_nfc_token__isnull=False, nfc_token__isnull=True).update(
+                nfc_token=Subquery(token_id.order_by("id").values("id")[:1])
+            )
+            batch.filter(nfc_token__isnull=False).update(legacy_nfc_token=None)
+
+
+def restore_tokens(apps, schema_editor):
+    AttendanceRegister = apps.get_model("attendance", "AttendanceRegister")
+    NFCToken = apps.get_model("authentication", "NFCToken")
+    using = schema_editor.connection.alias
+
+    token = NFCToken.objects.using(using).filter(id=OuterRef("nfc_token"))
+    for batch in _batches(AttendanceRegister, using):
+        with transaction.atomic(using=using):
+            batch.filter(nfc_token__isnull=False).update(
+                legacy_nfc_token=Subquery(token.values("token")[:1])
+            )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('attendance', '0005_attendanceregister_shift_range'),
+        ('authentication', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='attendanceregister',
+            old_name='nfc_token',
+            new_name='legacy_nfc_token',
+        ),
+        migrations.AddField(
+            model_name='attendanceregister',
+            name='nfc_token',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='registers', to='authentication.nfctoken'),
+        ),
+        migrations.RunPython(link_tokens, restore_tokens),
+    ]
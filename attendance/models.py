@@ -17,8 +17,28 @@ class AttendanceRegister(models.Model):
     pay_period = models.ForeignKey(
         PayPeriod, on_delete=models.SET_NULL, null=True, blank=True
     )
-    nfc_token = models.TextField(null=True, blank=True)
+    # Token con el que se marcó la entrada. Sin índice: solo se consulta desde
+    # la marca y así no crece la tabla más grande
+    nfc_token = models.ForeignKey(
+        "authentication.NFCToken",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="registers",
+        db_index=False,
+    )
+    # JWT completo de marcas anteriores al FK cuyo token ya no existe
+    legacy_nfc_token = models.TextField(null=True, blank=True)
     sync = models.BooleanField(default=False)
+    # Se incrementa en cada corrección para control de concurrencia optimista
+    version = models.PositiveIntegerField(default=0)
+
+    @property
+    def raw_nfc_token(self):
+        """JWT con el que se marcó: el del token referenciado o el texto de marcas anteriores"""
+        if self.nfc_token_id:
+            return self.nfc_token.token
+        return self.legacy_nfc_token
 
 
 class AttendanceDetail(models.Model):
@@ -4,6 +4,8 @@ from attendance.models import AttendanceRegister, AttendanceDetail
 
 class AttendanceRegisterSerializer(serializers.ModelSerializer):
     employee_name = serializers.SerializerMethodField()
+    # Se sigue exponiendo el JWT, aunque la marca solo guarde la referencia al token
+    nfc_token = serializers.CharField(source="raw_nfc_token", read_only=True, allow_null=True)
 
     class Meta: #type: ignore
         model = AttendanceRegister
@@ -16,14 +18,34 @@ class AttendanceRegisterSerializer(serializers.ModelSerializer):
             "method",
             "sync",
             "nfc_token",
+            "version",
         ]
-        read_only_fields = ["sync", "timestamp_in", "timestamp_out"]
+        read_only_fields = ["sync", "timestamp_in", "timestamp_out", "version"]
         extra_kwargs = {"employee": {"read_only": True}}
 
     def get_employee_name(self, obj) -> str:
         return obj.employee.get_full_name()
 
 
+class AttendanceRegisterCorrectionSerializer(serializers.Serializer):
+    """
+    Datos para corregir una marca de asistencia.
+    `version` debe ser la versión del registro que leyó el cliente.
+    """
+
+    timestamp_in = serializers.DateTimeField()
+    timestamp_out = serializers.DateTimeField(required=False, allow_null=True)
+    version = serializers.IntegerField(min_value=0)
+
+    def validate(self, data): #type: ignore
+        timestamp_out = data.get("timestamp_out")
+        if timestamp_out and timestamp_out <= data["timestamp_in"]:
+            raise serializers.ValidationError(
+                "La hora de salida debe ser después de la hora de entrada"
+            )
+        return data
+
+
 class AttendanceDetailSerializer(serializers.ModelSerializer):
     employee_name = serializers.SerializerMethodField()
     formatted_date = serializers.SerializerMethodField()
@@ -69,3 +91,18 @@ class AttendanceStatsEmployeeSerializer(serializers.Serializer):
 class AttendanceStatsResponseSerializer(serializers.Serializer):
     pay_period = serializers.DictField()
     stats = serializers.ListField()
+
+
+class AttendanceExportSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    employee_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False
+    )
+
+    def validate(self, attrs):
+        if attrs["end_date"] < attrs["start_date"]:
+            raise serializers.ValidationError(
+                "La fecha final debe ser posterior a la inicial"
+            )
+        return attrs
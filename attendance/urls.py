@@ -2,6 +2,8 @@ from attendance.views import (
     AttendanceMarkView,
     AttendanceMarkOutView,
     AttendanceStatsView,
+    AttendanceRegisterCorrectionView,
+    AttendanceExportView,
 )
 from django.urls import path
 
@@ -10,4 +12,10 @@ urlpatterns = [
     path("in/", AttendanceMarkView.as_view(), name="Marcaje de asistencia"),
     path("out/", AttendanceMarkOutView.as_view(), name="Marcaje de asistencia"),
     path("stats/", AttendanceStatsView.as_view(), name="Estadísticas de asistencia"),
+    path("export/", AttendanceExportView.as_view(), name="attendance-export"),
+    path(
+        "<int:pk>/",
+        AttendanceRegisterCorrectionView.as_view(),
+        name="attendance-register-correction",
+    ),
 ]
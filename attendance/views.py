@@ -1,34 +1,48 @@
-from django.utils.timezone import localtime
+from datetime import datetime, time
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils.timezone import localtime, make_aware
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from attendance.models import AttendanceRegister
 from attendance.serializers import (
+    AttendanceExportSerializer,
+    AttendanceRegisterCorrectionSerializer,
     AttendanceRegisterSerializer,
     AttendanceStatsResponseSerializer,
 )
 from authentication.models import NFCToken
+from core.db_router import ReplicaReadMixin
+from core.metrics import KIOSK_TAP_SECONDS
+from core.permissions import IsAdmin
+from core.report_cache import cached_report, period_report_tags
+from core.response_formats import ReportFormatsMixin
 from employee.models import Employee
-from timers.models import Timer
-
-
-def truncate_seconds(dt):
-    """Trunca segundos y microsegundos de un datetime."""
-    return dt.replace(second=0, microsecond=0)
-
-
-def round_early_entry(timestamp_in):
-    """Redondea entradas entre 7:00-7:59 AM a las 8:00 AM."""
-    if timestamp_in.hour == 7:
-        return timestamp_in.replace(hour=8, minute=0, second=0, microsecond=0)
-    return timestamp_in
+from payrolls.models import PayPeriod
+from payrolls.services.attendance_export import (
+    copy_export_supported,
+    iter_attendance_csv_gzip,
+)
+from payrolls.services.attendance_partitions import add_months, month_start
+from payrolls.services.period_reports import attendance_stats
+from payrolls.services.period_snapshot import serve_period_snapshot
+from payrolls.services.shift_correction import (
+    RegisterVersionConflict,
+    correct_attendance_register,
+)
+from payrolls.services.shift_ranges import OverlappingShift, is_overlap_violation
+from payrolls.signals import invalidate_attendance_dates
 
 
 class AttendanceMarkView(generics.CreateAPIView):
     serializer_class = AttendanceRegisterSerializer
     permission_classes = [permissions.AllowAny]
 
+    @KIOSK_TAP_SECONDS.labels("mark_in").time()
     def post(self, request, *args, **kwargs):
         data = request.data
         nfc_token = data.get("token")
@@ -40,8 +54,8 @@ class AttendanceMarkView(generics.CreateAPIView):
             )
 
         # Validar el token NFC
-        payload = NFCToken.validate_token(nfc_token)
-        if not payload:
+        token = NFCToken.get_valid(nfc_token)
+        if not token:
             return Response(
                 {"error": "Token NFC inválido o revocado"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -49,7 +63,7 @@ class AttendanceMarkView(generics.CreateAPIView):
 
         # Obtener el empleado del payload
         try:
-            employee_id = payload.get("employee_id")
+            employee_id = token.payload.get("employee_id")
             employee = Employee.objects.get(id=employee_id)
         except Employee.DoesNotExist:
             return Response(
@@ -59,12 +73,12 @@ class AttendanceMarkView(generics.CreateAPIView):
 
         employee_full_name = employee.get_full_name()
 
-        # Registrar entrada con timestamp real
+        # Registrar entrada con timestamp real; se guarda la referencia al token, no el JWT
         AttendanceRegister.objects.create(
             employee=employee,
             method="nfc",
             timestamp_in=localtime(employee.get_current_timestamp()),
-            nfc_token=nfc_token,
+            nfc_token=token,
         )
 
         return Response(
@@ -83,6 +97,7 @@ class AttendanceMarkOutView(generics.UpdateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = AttendanceRegisterSerializer
 
+    @KIOSK_TAP_SECONDS.labels("mark_out").time()
     def post(self, request, *args, **kwargs):
         data = request.data
         nfc_token = data.get("token")
@@ -111,9 +126,18 @@ class AttendanceMarkOutView(generics.UpdateAPIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        timestamp_out = localtime(employee.get_current_timestamp())
+        # Solo las particiones de este mes y del anterior: una entrada abierta
+        # más vieja es una salida olvidada que corrige un administrador
+        since = make_aware(
+            datetime.combine(add_months(month_start(timestamp_out.date()), -1), time.min)
+        )
         attendance = (
             AttendanceRegister.objects.filter(
-                employee=employee, timestamp_out__isnull=True
+                employee=employee,
+                timestamp_out__isnull=True,
+                timestamp_in__gte=since,
+                timestamp_in__lte=timestamp_out,
             )
             .order_by("-timestamp_in")
             .first()
@@ -127,9 +151,34 @@ class AttendanceMarkOutView(generics.UpdateAPIView):
 
         employee_full_name = employee.get_full_name()
 
-        # Registrar salida con timestamp real
-        attendance.timestamp_out = localtime(employee.get_current_timestamp())
-        attendance.save()
+        # Registrar salida con timestamp real. timestamp_in en el filtro limita
+        # el UPDATE a la partición de la marca
+        try:
+            with transaction.atomic():
+                updated = AttendanceRegister.objects.filter(
+                    pk=attendance.pk,
+                    timestamp_in=attendance.timestamp_in,
+                    timestamp_out__isnull=True,
+                ).update(timestamp_out=timestamp_out, version=F("version") + 1)
+        except IntegrityError as e:
+            if not is_overlap_violation(e):
+                raise
+            return Response(
+                {"error": "La salida se cruza con otro turno registrado del empleado"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Otra marca de salida cerró el turno entre la búsqueda y el UPDATE
+        if not updated:
+            return Response(
+                {"error": "No hay registro de entrada pendiente"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # update() no dispara post_save
+        invalidate_attendance_dates(
+            [localtime(attendance.timestamp_in).date()], attendance.pay_period_id
+        )
 
         return Response(
             [
@@ -140,15 +189,114 @@ class AttendanceMarkOutView(generics.UpdateAPIView):
         )
 
 
-class AttendanceStatsView(APIView):
+class AttendanceRegisterCorrectionView(APIView):
+    """
+    Corrige las marcas de entrada/salida de un registro de asistencia.
+
+    Usa concurrencia optimista: el cliente envía la `version` que leyó y si el
+    registro cambió mientras tanto se responde 409. Si el registro ya estaba
+    pagado solo se recalculan los días afectados y el SalaryRecord del empleado,
+    sin necesidad de resetear el período.
+
+    PATCH /attendance/<id>/
+    Body:
+    {
+        "timestamp_in": "2025-01-10T08:00:00-06:00",
+        "timestamp_out": "2025-01-10T16:00:00-06:00",
+        "version": 0
+    }
+    """
+
+    permission_classes = [IsAdmin]
+    serializer_class = AttendanceRegisterCorrectionSerializer
+
+    def patch(self, request, pk):
+        serializer = AttendanceRegisterCorrectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            register = AttendanceRegister.objects.select_related(
+                "employee", "pay_period", "nfc_token"
+            ).get(pk=pk)
+        except AttendanceRegister.DoesNotExist:
+            return Response(
+                {"error": "Registro de asistencia no encontrado"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        timestamp_in = serializer.validated_data["timestamp_in"]
+        pay_period = register.pay_period
+        work_date = localtime(timestamp_in).date()
+
+        # Los reportes de un período cerrado están congelados: no se corrige
+        # una marca que está en uno ni se mueve una marca hacia uno
+        dates = (localtime(register.timestamp_in).date(), work_date)
+        if (pay_period and pay_period.is_closed) or PayPeriod.objects.filter(
+            is_closed=True, start_date__lte=max(dates), end_date__gte=min(dates)
+        ).exists():
+            return Response(
+                {"error": "No se pueden corregir marcas de un período cerrado"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if register.paid and pay_period:
+            if not pay_period.start_date <= work_date <= pay_period.end_date:
+                return Response(
+                    {"error": f"La marca de entrada debe estar dentro del período {pay_period.description}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        try:
+            result = correct_attendance_register(
+                register,
+                timestamp_in,
+                serializer.validated_data.get("timestamp_out"),
+                serializer.validated_data["version"],
+            )
+        except RegisterVersionConflict:
+            register.refresh_from_db()
+            return Response(
+                {
+                    "error": "El registro fue modificado por otra persona. Recarga e intenta de nuevo.",
+                    "current": AttendanceRegisterSerializer(register).data,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        except OverlappingShift:
+            return Response(
+                {"error": "La corrección se cruza con otro turno registrado del empleado"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        from payrolls.serializers import SalaryRecordSerializer
+
+        salary_record = result["salary_record"]
+        return Response(
+            {
+                "register": AttendanceRegisterSerializer(result["register"]).data,
+                "recalculated_dates": [
+                    work_date.isoformat() for work_date in result["recalculated_dates"]
+                ],
+                "salary_record": (
+                    SalaryRecordSerializer(salary_record).data if salary_record else None
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class AttendanceStatsView(ReplicaReadMixin, ReportFormatsMixin, APIView):
     """
     Proporciona estadísticas de horas trabajadas por empleado en el período activo
     para mostrar en el frontend como gráficos, rankings, etc.
+    Acepta ?fields= y ?format=columnar (ver core.response_formats).
     """
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AttendanceStatsResponseSerializer
 
+    @serve_period_snapshot("stats")
+    @cached_report(period_report_tags)
     def get(self, request):
         period_id = request.query_params.get("period_id")
 
@@ -174,124 +322,46 @@ class AttendanceStatsView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        # Buscar todos los empleados con registros en el período
-        employees = Employee.objects.filter(
-            attendanceregister__timestamp_in__date__gte=pay_period.start_date,
-            attendanceregister__timestamp_in__date__lte=pay_period.end_date,
-        ).distinct()
+        # Usar los serializers para validar y serializar los datos
+        data = attendance_stats(pay_period)
+
+        serializer = AttendanceStatsResponseSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
 
-        stats = []
+        return Response(serializer.validated_data)
 
-        # Constante para deducción de almuerzo (igual que en calculate_payroll)
-        MINIMUM_HOURS_FOR_LUNCH_DEDUCTION = 7
 
-        for employee in employees:
-            # Obtener registros completos (con entrada y salida)
-            registers = AttendanceRegister.objects.filter(
-                employee=employee,
-                timestamp_in__date__gte=pay_period.start_date,
-                timestamp_in__date__lte=pay_period.end_date,
-                timestamp_out__isnull=False,
-            ).order_by("timestamp_in")
-
-            total_worked_seconds = 0
-            regular_hours_seconds = 0
-            night_hours_seconds = 0
-            days_worked = 0
-            # Diccionario para acumular horas por día (para calcular deducción de almuerzo)
-            daily_hours = {}
-
-            for register in registers:
-                timestamp_in_local = localtime(register.timestamp_in)
-                timestamp_out_local = localtime(register.timestamp_out)
-
-                # Truncar segundos (solo contar horas y minutos)
-                timestamp_in_local = truncate_seconds(timestamp_in_local)
-                timestamp_out_local = truncate_seconds(timestamp_out_local)
-
-                # Redondear entradas tempranas (7:XX AM -> 8:00 AM)
-                timestamp_in_local = round_early_entry(timestamp_in_local)
-
-                # Verificar si es un día nuevo
-                day_date = timestamp_in_local.date()
-                if day_date not in daily_hours:
-                    daily_hours[day_date] = 0
-                    days_worked += 1
-
-                # Calcular tiempo trabajado en segundos (ya sin segundos/microsegundos)
-                worked_time = timestamp_out_local - timestamp_in_local
-                # Truncar a minutos completos
-                worked_seconds = int(worked_time.total_seconds() // 60) * 60
-                total_worked_seconds += worked_seconds
-                daily_hours[day_date] += worked_seconds
-
-                # Verificar si es turno nocturno o diurno
-                is_night = False
-
-                # Verificar si tiene un timer asignado para ese día
-                day_of_week = timestamp_in_local.weekday()
-                timer = Timer.objects.filter(
-                    employee=employee, day=day_of_week, is_active=True
-                ).first()
-
-                if timer and timer.is_night_shift:
-                    is_night = True
-                # Verificar por rango de horas (noche: 10pm a 6am)
-                elif timestamp_in_local.hour >= 22 or timestamp_in_local.hour < 6:
-                    is_night = True
-
-                # Determinar tipo de horas (regulares o nocturnas)
-                if is_night:
-                    night_hours_seconds += worked_seconds
-                else:
-                    regular_hours_seconds += worked_seconds
-
-            # Calcular deducción de almuerzo: 1 hora por cada día con >= 7 horas trabajadas
-            lunch_deduction_hours = 0
-            for day_date, seconds in daily_hours.items():
-                hours_worked_that_day = seconds / 3600
-                if hours_worked_that_day >= MINIMUM_HOURS_FOR_LUNCH_DEDUCTION:
-                    lunch_deduction_hours += 1
-
-            # Convertir segundos a horas
-            total_hours = round(total_worked_seconds / 3600, 2)
-            regular_hours = round(regular_hours_seconds / 3600, 2)
-            night_hours = round(night_hours_seconds / 3600, 2)
-            # Horas netas = total - deducción de almuerzo
-            net_hours = round(total_hours - lunch_deduction_hours, 2)
-
-            stats.append(
-                {
-                    "employee_id": employee.id,  # type: ignore
-                    "employee_name": employee.get_full_name(),
-                    "username": employee.username,
-                    "days_worked": days_worked,
-                    "total_hours": total_hours,
-                    "regular_hours": regular_hours,
-                    "night_hours": night_hours,
-                    "lunch_deduction_hours": float(lunch_deduction_hours),
-                    "net_hours": net_hours,
-                    "target_biweekly_hours": float(employee.biweekly_hours),
-                    "hourly_rate": float(employee.salary_hour),
-                }
-            )
+class AttendanceExportView(APIView):
+    """
+    Exporta las marcas de asistencia de un rango de fechas como CSV comprimido
+    en gzip, generado por PostgreSQL con COPY. Pensado para auditorías.
 
-        # Ordenar por total de horas trabajadas (descendente)
-        stats = sorted(stats, key=lambda x: x["total_hours"], reverse=True)
+    GET /attendance/export/?start_date=2025-01-01&end_date=2025-12-31
+    GET /attendance/export/?start_date=2025-01-01&end_date=2025-12-31&employee_ids=3&employee_ids=7
+    """
 
-        # Usar los serializers para validar y serializar los datos
-        data = {
-            "pay_period": {
-                "id": pay_period.id,  # type: ignore
-                "description": pay_period.description,
-                "start_date": pay_period.start_date,
-                "end_date": pay_period.end_date,
-                "is_closed": pay_period.is_closed,
-            },
-            "stats": stats,
-        }
+    permission_classes = [IsAdmin]
+    serializer_class = AttendanceExportSerializer
 
-        serializer = AttendanceStatsResponseSerializer(data=data)
+    def get(self, request):
+        serializer = AttendanceExportSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
 
-        return Response(serializer.validated_data)
+        if not copy_export_supported():
+            return Response(
+                {"error": "La exportación masiva requiere PostgreSQL"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        start_date = serializer.validated_data["start_date"]
+        end_date = serializer.validated_data["end_date"]
+        response = StreamingHttpResponse(
+            iter_attendance_csv_gzip(
+                start_date, end_date, serializer.validated_data.get("employee_ids")
+            ),
+            content_type="application/gzip",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="asistencias-{start_date}-{end_date}.csv.gz"'
+        )
+        return response
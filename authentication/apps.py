@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        # Registrar la revocación de tokens y el esquema OpenAPI del login
+        from authentication import schema, signals  # noqa: F401
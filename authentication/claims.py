@@ -0,0 +1,175 @@
+"""
+Autenticación JWT basada en los claims del token.
+
+El JWTAuthentication de simplejwt busca al Employee en cada petición solo para
+armar request.user. Los tokens que emite el login llevan firmados los datos
+que usan los permisos (username, is_admin, is_staff, is_superuser), así que
+ClaimsJWTAuthentication arma request.user a partir del token sin consultar la
+base de datos. El Employee completo se carga solo si la vista pide un atributo
+que no está en el token.
+
+Revocación: cuando a un empleado le cambian el PIN, los permisos o se
+desactiva, se guarda la hora del cambio y se rechazan los tokens emitidos
+antes. La marca se guarda en la caché, donde vive lo mismo que un token de
+acceso, y en TokenRevocation.
+
+Armar request.user sin consultar la base requiere una caché compartida
+(Redis): con una caché local del proceso (LocMemCache, sin REDIS_URL) un
+worker no ve las marcas de otro. En ese caso se hace lo mismo que
+JWTAuthentication, una consulta al Employee por petición, que además trae su
+revocación de TokenRevocation. Esa consulta va siempre a la base principal,
+nunca a la réplica, para que una revocación se vea de inmediato.
+
+Cambios hechos con queryset.update() no pasan por las señales y no revocan
+tokens.
+"""
+from datetime import datetime, timezone
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import OuterRef, Subquery
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import TokenRevocation
+from employee.models import Employee
+
+REVOKED_PREFIX = "auth-revoked"
+
+# Backends cuyo contenido no ven los demás procesos
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+# Datos del empleado que viajan firmados en el token
+TOKEN_CLAIMS = ("username", "is_admin", "is_staff", "is_superuser")
+
+# Campos que, si cambian, invalidan los tokens ya emitidos
+REVOKING_FIELDS = (*TOKEN_CLAIMS, "is_active", "unique_pin", "password")
+
+
+def _revoked_key(employee_id):
+    return f"{REVOKED_PREFIX}:{employee_id}"
+
+
+def tokens_for_employee(employee: Employee) -> RefreshToken:
+    """
+    Refresh token con los claims del empleado. El token de acceso que se
+    obtiene de él hereda los mismos claims.
+    """
+    refresh = RefreshToken.for_user(employee)
+    for claim in TOKEN_CLAIMS:
+        refresh[claim] = getattr(employee, claim)
+    return refresh
+
+
+def revocations_in_cache() -> bool:
+    """True si la caché por defecto es compartida entre procesos"""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], PROCESS_LOCAL_CACHES)
+
+
+def revoke_employee_tokens(employee_id):
+    """Rechaza los tokens del empleado emitidos hasta este momento"""
+    revoked_at = datetime.now(timezone.utc)
+    TokenRevocation.objects.update_or_create(
+        employee_id=employee_id, defaults={"revoked_at": revoked_at}
+    )
+    cache.set(
+        _revoked_key(employee_id),
+        revoked_at.timestamp(),
+        timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def _issued_before(validated_token, revoked_at) -> bool:
+    return revoked_at is not None and validated_token.get("iat", 0) <= revoked_at
+
+
+def is_token_revoked(validated_token) -> bool:
+    """Revisa la marca en la caché; solo es confiable si la caché es compartida"""
+    revoked_at = cache.get(_revoked_key(validated_token[api_settings.USER_ID_CLAIM]))
+    return _issued_before(validated_token, revoked_at)
+
+
+class EmployeeTokenUser(TokenUser):
+    """
+    Usuario armado con los claims del token. Los atributos que no están en el
+    token se leen del Employee, que se carga una sola vez al primer uso.
+    """
+
+    @cached_property
+    def is_admin(self) -> bool:
+        return self.token["is_admin"]
+
+    @cached_property
+    def is_staff(self) -> bool:
+        return self.token["is_staff"]
+
+    @cached_property
+    def is_superuser(self) -> bool:
+        return self.token["is_superuser"]
+
+    @cached_property
+    def employee(self) -> Employee:
+        try:
+            return Employee.objects.get(pk=self.id)
+        except Employee.DoesNotExist:
+            raise AuthenticationFailed("Usuario no encontrado", code="user_not_found")
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.employee, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que arma request.user con los claims del token.
+    Los tokens emitidos antes de agregar los claims siguen funcionando con la
+    búsqueda del empleado en la base de datos.
+    """
+
+    def get_user(self, validated_token):
+        claims = (api_settings.USER_ID_CLAIM, *TOKEN_CLAIMS)
+        if any(claim not in validated_token for claim in claims):
+            return super().get_user(validated_token)
+
+        if not revocations_in_cache():
+            return self.get_employee(validated_token)
+
+        if is_token_revoked(validated_token):
+            raise AuthenticationFailed("El token fue revocado", code="token_revoked")
+
+        return EmployeeTokenUser(validated_token)
+
+    def get_employee(self, validated_token) -> Employee:
+        """
+        Carga al empleado y su revocación en una sola consulta a la base
+        principal, con las mismas validaciones que JWTAuthentication.get_user
+        """
+        revoked_at = TokenRevocation.objects.filter(employee_id=OuterRef("pk")).values(
+            "revoked_at"
+        )[:1]
+        try:
+            employee = (
+                Employee.objects.using(DEFAULT_DB_ALIAS)
+                .annotate(tokens_revoked_at=Subquery(revoked_at))
+                .get(**{api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM]})
+            )
+        except Employee.DoesNotExist:
+            raise AuthenticationFailed("Usuario no encontrado", code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not employee.is_active:
+            raise AuthenticationFailed("Usuario inactivo", code="user_inactive")
+
+        revoked_at = employee.tokens_revoked_at
+        if _issued_before(validated_token, revoked_at and revoked_at.timestamp()):
+            raise AuthenticationFailed("El token fue revocado", code="token_revoked")
+
+        return employee
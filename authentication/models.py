@@ -37,15 +37,39 @@ class NFCToken(models.Model):
         """
         Valida un token JWT y devuelve la información si es válido
         """
+        nfc_token = NFCToken.get_valid(token)
+        if not nfc_token:
+            return None
+        return nfc_token.payload
+
+    @staticmethod
+    def get_valid(token):
+        """
+        Valida un token JWT y devuelve el NFCToken vigente al que corresponde,
+        con el payload decodificado en `payload`, o None si no es válido
+        """
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            nfc_token = NFCToken.objects.filter(token=token, revoked=False).first()
-
-            if not nfc_token:
-                return None
-
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+
+        nfc_token = NFCToken.objects.filter(token=token, revoked=False).first()
+        if not nfc_token:
+            return None
+
+        nfc_token.payload = payload
+        return nfc_token
+
+
+class TokenRevocation(models.Model):
+    """
+    Hora a partir de la cual se rechazan los tokens de acceso ya emitidos a un
+    empleado. Respaldo de la marca en caché cuando la caché no es compartida
+    entre procesos (ver authentication.claims). Guarda el id sin llave foránea
+    para que la revocación sobreviva al borrado del empleado.
+    """
+
+    employee_id = models.BigIntegerField(primary_key=True)
+    revoked_at = models.DateTimeField()
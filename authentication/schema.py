@@ -0,0 +1,8 @@
+"""
+Esquema OpenAPI de la autenticación basada en claims
+"""
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = "authentication.claims.ClaimsJWTAuthentication"
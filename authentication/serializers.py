@@ -1,6 +1,6 @@
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import serializers
 from employee.models import Employee
+from authentication.claims import tokens_for_employee
 from authentication.models import NFCToken
 
 
@@ -20,7 +20,7 @@ class CustomTokenObtainPairSerializer(serializers.Serializer):
                 "Solo los administradores pueden iniciar sesión"
             )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_employee(user)
 
         return {
             "refresh": str(refresh),
@@ -0,0 +1,28 @@
+"""
+Revocación de tokens cuando cambian los datos firmados en ellos
+"""
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from authentication.claims import REVOKING_FIELDS, revoke_employee_tokens
+from employee.models import Employee
+
+
+@receiver(pre_save, sender=Employee)
+def revoke_tokens_on_change(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    previous = (
+        Employee.objects.filter(pk=instance.pk).values(*REVOKING_FIELDS).first()
+    )
+    if previous is None:
+        return
+
+    if any(previous[field] != getattr(instance, field) for field in REVOKING_FIELDS):
+        revoke_employee_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_employee_tokens(instance.pk)
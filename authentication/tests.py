@@ -1,3 +1,147 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from decimal import Decimal
+from employee.models import Employee
+from authentication.claims import (
+    ClaimsJWTAuthentication,
+    EmployeeTokenUser,
+    tokens_for_employee,
+)
+
+EMPLOYEES_URL = "/v1/employee/"
+
+# Caché que comparten los procesos del mismo servidor, como Redis
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(prefix="auth-cache-"),
+    }
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ClaimsJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = Employee.objects.create(
+            username="admin",
+            first_name="Ana",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+            unique_pin="1234",
+        )
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return ClaimsJWTAuthentication().authenticate(Request(request))
+
+    def access_token(self, employee):
+        return str(tokens_for_employee(employee).access_token)
+
+    def test_login_token_carries_claims(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"), {"unique_pin": "1234"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        cache.clear()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(response.data["access"])
+
+        self.assertIsInstance(user, EmployeeTokenUser)
+        self.assertEqual(user.id, self.admin.id)
+        self.assertEqual(user.username, "admin")
+        self.assertTrue(user.is_admin)
+        self.assertFalse(user.is_superuser)
+        self.assertTrue(user.is_authenticated)
+
+    def test_full_employee_loaded_on_demand(self):
+        user, _ = self.authenticate(self.access_token(self.admin))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Ana")
+            self.assertEqual(user.salary_hour, Decimal("40.00"))
+
+    def test_admin_view_without_user_query(self):
+        """Crear empleados valida is_admin con el token"""
+        token = self.access_token(self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get(EMPLOYEES_URL, {"page_size": 5})
+        self.assertEqual(response.status_code, 200)
+
+        employee = Employee.objects.create(
+            username="employee", salary_hour=Decimal("20.00")
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token(employee)}"
+        )
+        response = self.client.post(
+            EMPLOYEES_URL,
+            {"username": "nuevo", "salary_hour": "10.00"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_tokens_revoked_when_permissions_change(self):
+        token = self.access_token(self.admin)
+
+        self.admin.first_name = "Ana María"
+        self.admin.save()
+        self.assertIsNotNone(self.authenticate(token))
+
+        self.admin.is_admin = False
+        self.admin.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(EMPLOYEES_URL)
+        self.assertEqual(response.status_code, 401)
+
+    def test_tokens_without_claims_use_database(self):
+        token = str(RefreshToken.for_user(self.admin).access_token)
+
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(token)
+        self.assertIsInstance(user, Employee)
+
+
+
+class LocalCacheAuthenticationTest(TestCase):
+    """Con LocMemCache (sin REDIS_URL) cada worker tiene su propia caché"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+            unique_pin="1234",
+        )
+        self.token = str(tokens_for_employee(self.admin).access_token)
+
+    def authenticate(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return ClaimsJWTAuthentication().authenticate(Request(request))
+
+    def test_loads_employee_with_one_query(self):
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate()
+        self.assertIsInstance(user, Employee)
+        self.assertTrue(user.is_admin)
+
+    def test_revocation_seen_by_other_processes(self):
+        self.admin.unique_pin = "4321"
+        self.admin.save()
+        # Otro worker no tiene la marca en su caché local
+        cache.clear()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        response = self.client.get(EMPLOYEES_URL)
+        self.assertEqual(response.status_code, 401)
@@ -7,6 +7,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from authentication.models import NFCToken
+from core.metrics import KIOSK_TAP_SECONDS
 from employee.models import Employee
 
 
@@ -54,6 +55,7 @@ class NFCTokenValidateView(APIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = NFCTokenValidateSerializer
 
+    @KIOSK_TAP_SECONDS.labels("nfc_validate").time()
     def post(self, request):
         serializer = NFCTokenValidateSerializer(data=request.data)
         if serializer.is_valid():
@@ -0,0 +1,11 @@
+"""
+Carga sintética y suite de benchmarks del sistema de planilla.
+
+- workload: genera con bulk_create N empleados × M períodos con horarios,
+  turnos nocturnos, salidas sin marcar y entradas tempranas, a partir de una
+  semilla (misma semilla, mismos datos).
+- suite: mide los caminos críticos (cálculo de planilla, reportes, marcaje
+  en el kiosco) a varias escalas y guarda los resultados en JSON.
+
+Se ejecuta con python manage.py run_benchmarks.
+"""
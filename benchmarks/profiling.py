@@ -0,0 +1,193 @@
+"""
+Perfil de memoria y CPU del cálculo de planilla de un período.
+
+Cada motor (implementación del cálculo del período completo) se ejecuta
+varias veces sobre los mismos datos: sin instrumentar para el tiempo, con
+tracemalloc para el pico de memoria, con tracemalloc y snapshots cerca del
+pico para los sitios que más asignan, y con cProfile para las funciones más
+costosas. Se separan porque cada instrumento deforma las mediciones de los
+otros. Las ejecuciones corren en una transacción que se revierte y con la
+caché desactivada.
+
+Un motor es una función (pay_period) -> None. Además de los de ENGINES se
+puede indicar la ruta de cualquier función ("paquete.modulo.funcion") para
+comparar una implementación nueva con la actual.
+"""
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils.module_loading import import_string
+
+from benchmarks.suite import DUMMY_CACHES, Rollback
+from employee.models import Employee
+from payrolls.services.payroll_preview import preview_period_pay
+from payrolls.services.payroll_run import calculate_and_save_salary
+
+
+def calculate_engine(pay_period):
+    """Cálculo que guarda SalaryRecord, como GET /v1/salary/calculate-all/"""
+    employees = Employee.objects.filter(
+        **pay_period.register_filter("attendanceregister__"),
+        attendanceregister__paid=False,
+    ).distinct()
+    for employee in employees:
+        calculate_and_save_salary(employee, pay_period, apply_night_factor=True, wait=False)
+
+
+def preview_engine(pay_period):
+    """Vista previa por lotes de solo lectura, como GET /v1/salary/preview/"""
+    preview_period_pay(pay_period, apply_night_factor=True)
+
+
+ENGINES = {
+    "calculate": calculate_engine,
+    "preview": preview_engine,
+}
+
+
+def resolve_engine(name):
+    """
+    Args:
+        name: Nombre en ENGINES o ruta de una función
+
+    Returns:
+        Función (pay_period) -> None
+    """
+    if name in ENGINES:
+        return ENGINES[name]
+    try:
+        return import_string(name)
+    except ImportError:
+        raise ValueError(
+            f"Motor desconocido: {name}. Opciones: {', '.join(ENGINES)} o la ruta de una función"
+        )
+
+
+def _run_rolled_back(run):
+    try:
+        with transaction.atomic():
+            run()
+            raise Rollback()
+    except Rollback:
+        pass
+
+
+class _PeakSnapshot:
+    """
+    Función de sys.setprofile que toma un snapshot de tracemalloc cada vez que
+    la memoria en uso crece más de PEAK_STEP. Al terminar queda el más cercano
+    al pico: al final de la ejecución los objetos temporales ya se liberaron.
+    """
+
+    PEAK_STEP = 1.1
+
+    def __init__(self):
+        self.current = 0
+        self.snapshot = None
+
+    def __call__(self, frame, event, arg):
+        if event != "return":
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.current * self.PEAK_STEP:
+            self.current = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+
+def _allocation_sites(snapshot, top, include):
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    if include:
+        filters.append(tracemalloc.Filter(True, include))
+    statistics = snapshot.filter_traces(filters).statistics("lineno")
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "kib": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in statistics[:top]
+    ]
+
+
+def _hot_functions(profiler, top, sort):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, lineno, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append(
+            {
+                # Las funciones de C no tienen archivo ("~")
+                "function": function if filename == "~" else f"{filename}:{lineno}({function})",
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000, 2),
+                "cumtime_ms": round(cumtime * 1000, 2),
+            }
+        )
+    key = "cumtime_ms" if sort == "cumulative" else "tottime_ms"
+    return sorted(rows, key=lambda row: row[key], reverse=True)[:top]
+
+
+def profile_engine(name, pay_period, top=10, include=None, sort="tottime", dump=None):
+    """
+    Perfila un motor sobre un período.
+
+    Args:
+        name: Nombre del motor o ruta de la función
+        pay_period: Período a calcular
+        top: Cantidad de sitios de asignación y funciones a reportar
+        include: Patrón de archivo (fnmatch) para limitar los sitios de asignación
+        sort: "tottime" (tiempo propio) o "cumulative" (incluye llamadas)
+        dump: Archivo donde guardar las estadísticas de cProfile (.prof)
+
+    Returns:
+        Diccionario con tiempos, consultas, pico de memoria, sitios y funciones
+    """
+    engine = resolve_engine(name)
+
+    with override_settings(CACHES=DUMMY_CACHES):
+        # Calentamiento: cachés de consultas y módulos importados no cuentan
+        with CaptureQueriesContext(connection) as queries:
+            _run_rolled_back(lambda: engine(pay_period))
+
+        started = time.perf_counter()
+        _run_rolled_back(lambda: engine(pay_period))
+        wall = time.perf_counter() - started
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            _run_rolled_back(lambda: engine(pay_period))
+            _, peak = tracemalloc.get_traced_memory()
+
+            # Los snapshots también ocupan memoria: se toman en otra ejecución
+            peak_snapshot = _PeakSnapshot()
+            sys.setprofile(peak_snapshot)
+            try:
+                _run_rolled_back(lambda: engine(pay_period))
+            finally:
+                sys.setprofile(None)
+        finally:
+            tracemalloc.stop()
+
+        profiler = cProfile.Profile()
+        _run_rolled_back(lambda: profiler.runcall(engine, pay_period))
+
+    if dump:
+        profiler.dump_stats(dump)
+
+    return {
+        "engine": name,
+        "wall_ms": round(wall * 1000, 2),
+        "queries": len(queries.captured_queries),
+        "peak_kib": round((peak - baseline) / 1024, 1),
+        "allocation_sites": _allocation_sites(peak_snapshot.snapshot, top, include),
+        "hot_functions": _hot_functions(profiler, top, sort),
+    }
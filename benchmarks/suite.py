@@ -0,0 +1,285 @@
+"""
+Suite de benchmarks repetible.
+
+Cada escala genera su carga sintética dentro de una transacción que se
+revierte al terminar, así que la base de datos queda igual. Los escenarios que
+escriben (cálculo de planilla, marcaje) corren cada repetición dentro de un
+savepoint que también se revierte, para que todas midan el mismo trabajo.
+
+Las vistas se llaman directamente con APIRequestFactory (sin middleware) e
+incluyen el renderizado de la respuesta. La caché se reemplaza por DummyCache
+para medir siempre el cálculo y no una lectura de la caché.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import django
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from attendance.models import AttendanceRegister
+from attendance.views import AttendanceMarkOutView, AttendanceMarkView, AttendanceStatsView
+from benchmarks.workload import SCALES, generate_workload
+from employee.models import Employee
+from payrolls.services.calculate_payroll import calculate_pay_to_go
+from payrolls.views import (
+    CalculateAllSalaries,
+    ListEmployeesWithNightHours,
+    LiveAttendanceSummaryView,
+)
+
+DUMMY_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def _call_view(view_class, method, params, user=None):
+    """Función que llama a la vista y renderiza la respuesta"""
+    factory = APIRequestFactory()
+    view = view_class.as_view()
+
+    def call():
+        if method == "post":
+            request = factory.post("/", params, format="json")
+        else:
+            request = factory.get("/", params)
+        if user is not None:
+            force_authenticate(request, user=user)
+        response = view(request)
+        response.render()
+        return response.status_code
+
+    return call
+
+
+def _open_register(employee):
+    """Deja una entrada sin salida para poder medir la marca de salida"""
+    AttendanceRegister.objects.create(
+        employee=employee, timestamp_in=timezone.now(), method="nfc"
+    )
+
+
+def build_scenarios(workload):
+    """
+    Escenarios a medir sobre una carga generada.
+
+    Returns:
+        Lista de diccionarios con name, run, writes y opcionalmente prepare
+    """
+    period_id = workload["active_period"].id
+    employee = workload["employees"][0]
+    token = workload["nfc_tokens"][0].token
+    admin = Employee.objects.create(
+        username=f"{employee.username}-admin",
+        is_admin=True,
+        salary_hour=employee.salary_hour,
+    )
+    params = {"period_id": period_id}
+
+    return [
+        {
+            "name": "calculate_pay_to_go",
+            "run": lambda: calculate_pay_to_go(employee, period_id=period_id),
+            "writes": True,
+        },
+        {
+            "name": "calculate_all",
+            "run": _call_view(CalculateAllSalaries, "get", params, admin),
+            "writes": True,
+        },
+        {
+            "name": "attendance_stats",
+            "run": _call_view(AttendanceStatsView, "get", params, admin),
+            "writes": False,
+        },
+        {
+            "name": "night_hours",
+            "run": _call_view(ListEmployeesWithNightHours, "get", params, admin),
+            "writes": False,
+        },
+        {
+            "name": "live_summary",
+            "run": _call_view(LiveAttendanceSummaryView, "get", params, admin),
+            "writes": False,
+        },
+        {
+            "name": "kiosk_mark_in",
+            "run": _call_view(AttendanceMarkView, "post", {"token": token}),
+            "writes": True,
+        },
+        {
+            "name": "kiosk_mark_out",
+            "prepare": lambda: _open_register(employee),
+            "run": _call_view(AttendanceMarkOutView, "post", {"token": token}),
+            "writes": True,
+        },
+    ]
+
+
+def _run_once(scenario):
+    """Ejecuta el escenario y devuelve (segundos, resultado)"""
+    if not scenario["writes"]:
+        started = time.perf_counter()
+        result = scenario["run"]()
+        return time.perf_counter() - started, result
+
+    try:
+        with transaction.atomic():
+            if scenario.get("prepare"):
+                scenario["prepare"]()
+            started = time.perf_counter()
+            result = scenario["run"]()
+            elapsed = time.perf_counter() - started
+            raise Rollback()
+    except Rollback:
+        pass
+    return elapsed, result
+
+
+def measure(scenario, repeat):
+    """
+    Mide un escenario: una ejecución de calentamiento que cuenta consultas y
+    luego repeat ejecuciones cronometradas.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        _, result = _run_once(scenario)
+
+    timings = [_run_once(scenario)[0] for _ in range(repeat)]
+    return {
+        "scenario": scenario["name"],
+        "status": result if isinstance(result, int) else None,
+        "queries": len(queries.captured_queries),
+        "best_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+    }
+
+
+def run_scale(name, employees, periods, seed=0, repeat=5, on_result=None):
+    """
+    Genera la carga de una escala, mide todos los escenarios y revierte todo.
+
+    Returns:
+        Lista de resultados, uno por escenario
+    """
+    results = []
+    try:
+        with override_settings(CACHES=DUMMY_CACHES), transaction.atomic():
+            workload = generate_workload(employees, periods, seed=seed)
+            for scenario in build_scenarios(workload):
+                result = {
+                    "scale": name,
+                    "employees": employees,
+                    "periods": periods,
+                    "registers": workload["registers"],
+                    **measure(scenario, repeat),
+                }
+                results.append(result)
+                if on_result:
+                    on_result(result)
+            raise Rollback()
+    except Rollback:
+        pass
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scales, seed=0, repeat=5, on_result=None):
+    """
+    Corre la suite en las escalas indicadas.
+
+    Args:
+        scales: Lista de (nombre, empleados, períodos)
+        seed: Semilla del generador
+        repeat: Repeticiones por escenario
+        on_result: Función opcional que recibe cada resultado al medirlo
+
+    Returns:
+        Diccionario listo para guardar en JSON con meta y results
+    """
+    results = []
+    for name, employees, periods in scales:
+        results.extend(run_scale(name, employees, periods, seed, repeat, on_result))
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "commit": _git_commit(),
+            "seed": seed,
+            "repeat": repeat,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "results": results,
+    }
+
+
+def resolve_scales(names):
+    """Convierte nombres de escala ("small,medium") a (nombre, empleados, períodos)"""
+    scales = []
+    for name in names:
+        if name not in SCALES:
+            raise ValueError(
+                f"Escala desconocida: {name}. Opciones: {', '.join(SCALES)}"
+            )
+        scales.append((name, *SCALES[name]))
+    return scales
+
+
+def compare_results(baseline, current):
+    """
+    Compara dos corridas por (escala, escenario).
+
+    Returns:
+        Lista de diccionarios con scale, scenario, baseline_ms, current_ms,
+        ratio (actual / base) y la diferencia de consultas
+    """
+    base = {(row["scale"], row["scenario"]): row for row in baseline["results"]}
+    comparison = []
+    for row in current["results"]:
+        previous = base.get((row["scale"], row["scenario"]))
+        if previous is None:
+            continue
+        comparison.append(
+            {
+                "scale": row["scale"],
+                "scenario": row["scenario"],
+                "baseline_ms": previous["best_ms"],
+                "current_ms": row["best_ms"],
+                "ratio": round(row["best_ms"] / previous["best_ms"], 3)
+                if previous["best_ms"]
+                else None,
+                "queries_delta": row["queries"] - previous["queries"],
+            }
+        )
+    return comparison
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
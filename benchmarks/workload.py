@@ -0,0 +1,208 @@
+"""
+Generador de carga sintética reproducible.
+
+Crea empleados, horarios, períodos de pago, marcas de asistencia y tokens NFC
+con bulk_create. Todo sale de la semilla, así que la misma semilla, escala y fecha de
+referencia producen exactamente los mismos datos. Cada empleado usa su propio
+generador: aumentar la escala agrega empleados sin cambiar los existentes.
+Por defecto la fecha de referencia es hoy, para que el último período sea el
+activo.
+
+Perfiles de empleado:
+- diurno: lunes a viernes de 8:00 a 17:00, a veces marca entre 7:00 y 7:59
+  (entrada temprana que el cálculo redondea a las 8:00)
+- tarde: lunes a sábado de 14:00 a 22:00, con horas nocturnas reales
+- nocturno: domingo a jueves de 19:00 a 6:00, con horario marcado como nocturno
+
+En cada día programado hay una probabilidad de ausencia y de salida sin
+marcar. Los períodos anteriores al activo quedan cerrados y pagados.
+"""
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from attendance.models import AttendanceRegister
+from authentication.models import NFCToken
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from timers.models import Timer
+
+BATCH_SIZE = 2000
+PERIOD_DAYS = 15
+
+# Escalas predefinidas: (empleados, períodos)
+SCALES = {
+    "small": (10, 2),
+    "medium": (50, 4),
+    "large": (200, 6),
+}
+
+PROFILES = (
+    # nombre, peso, días (0 = lunes), entrada, duración, horario nocturno
+    ("day", 6, (0, 1, 2, 3, 4), time(8, 0), timedelta(hours=9), False),
+    ("evening", 2, (0, 1, 2, 3, 4, 5), time(14, 0), timedelta(hours=8), False),
+    ("night", 2, (6, 0, 1, 2, 3), time(19, 0), timedelta(hours=11), True),
+)
+
+ABSENCE_RATE = 0.05
+MISSED_CHECKOUT_RATE = 0.03
+EARLY_ENTRY_RATE = 0.15
+
+SALARY_HOURS = (
+    Decimal("2000.00"),
+    Decimal("2500.00"),
+    Decimal("3000.00"),
+    Decimal("8750.00"),
+)
+
+
+def _period_bounds(periods, today, elapsed_days):
+    """Períodos de 15 días consecutivos; el último contiene hoy"""
+    active_start = today - timedelta(days=elapsed_days)
+    starts = [
+        active_start - timedelta(days=PERIOD_DAYS * offset)
+        for offset in range(periods - 1, -1, -1)
+    ]
+    return [(start, start + timedelta(days=PERIOD_DAYS - 1)) for start in starts]
+
+
+def _shift(rng, day, profile):
+    """Entrada y salida de un turno programado, o None si hubo ausencia"""
+    _, _, _, start, duration, _ = profile
+    if rng.random() < ABSENCE_RATE:
+        return None
+
+    scheduled_in = timezone.make_aware(datetime.combine(day, start))
+    if profile[0] == "day" and rng.random() < EARLY_ENTRY_RATE:
+        timestamp_in = scheduled_in - timedelta(minutes=rng.randint(1, 59))
+    else:
+        timestamp_in = scheduled_in + timedelta(minutes=rng.randint(-10, 15))
+    timestamp_in += timedelta(seconds=rng.randint(0, 59))
+
+    timestamp_out = scheduled_in + duration + timedelta(
+        minutes=rng.randint(-5, 30), seconds=rng.randint(0, 59)
+    )
+    if rng.random() < MISSED_CHECKOUT_RATE:
+        timestamp_out = None
+    return timestamp_in, timestamp_out
+
+
+def generate_workload(
+    employees=10, periods=2, seed=0, prefix="bench", now=None, elapsed_days=None
+):
+    """
+    Crea la carga sintética en la base de datos.
+
+    Args:
+        employees: Cantidad de empleados
+        periods: Cantidad de períodos de pago; el último es el activo
+        seed: Semilla del generador
+        prefix: Prefijo de los usernames (deben ser únicos en la base)
+        now: Momento de referencia; no se generan marcas posteriores
+        elapsed_days: Días del período activo anteriores a hoy (default la
+            mitad del período); cambia cuántos turnos tiene cada empleado en él
+
+    Returns:
+        Diccionario con employees, timers, periods, active_period, nfc_tokens
+        y la cantidad de registers creados
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    # Proporciones fijas según el peso de cada perfil, en orden aleatorio
+    pattern = [profile for profile in PROFILES for _ in range(profile[1])]
+    random.Random(seed).shuffle(pattern)
+    profiles = [pattern[index % len(pattern)] for index in range(employees)]
+    rngs = [random.Random(f"{seed}:{index}") for index in range(employees)]
+    created_employees = Employee.objects.bulk_create(
+        (
+            Employee(
+                username=f"{prefix}-{seed}-{index}",
+                first_name=f"Empleado {index}",
+                last_name=profile[0].capitalize(),
+                salary_hour=rngs[index].choice(SALARY_HOURS),
+                biweekly_hours=Decimal("96.00"),
+                night_shift_factor=Decimal("1.20") if profile[5] else Decimal("1.00"),
+            )
+            for index, profile in enumerate(profiles)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    timers = Timer.objects.bulk_create(
+        (
+            # El cálculo busca el horario con weekday() (0 = lunes)
+            Timer(
+                employee=employee,
+                day=weekday,
+                timeIn=profile[3],
+                timeOut=(datetime.combine(today, profile[3]) + profile[4]).time(),
+                is_night_shift=profile[5],
+            )
+            for employee, profile in zip(created_employees, profiles)
+            for weekday in profile[2]
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    if elapsed_days is None:
+        elapsed_days = PERIOD_DAYS // 2
+    if not 0 <= elapsed_days < PERIOD_DAYS:
+        raise ValueError(f"elapsed_days debe estar entre 0 y {PERIOD_DAYS - 1}")
+    bounds = _period_bounds(periods, today, elapsed_days)
+    created_periods = PayPeriod.objects.bulk_create(
+        PayPeriod(
+            start_date=start,
+            end_date=end,
+            is_closed=index < len(bounds) - 1,
+            # bulk_create no pasa por PayPeriod.save()
+            description=f"Quincena {start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}",
+        )
+        for index, (start, end) in enumerate(bounds)
+    )
+    active_period = created_periods[-1]
+
+    def registers():
+        for period in created_periods:
+            day = period.start_date
+            while day <= min(period.end_date, today):
+                for employee, profile, rng in zip(created_employees, profiles, rngs):
+                    if day.weekday() not in profile[2]:
+                        continue
+                    shift = _shift(rng, day, profile)
+                    if shift is None or shift[0] > now:
+                        continue
+                    timestamp_in, timestamp_out = shift
+                    if timestamp_out is not None and timestamp_out > now:
+                        # Sigue trabajando
+                        timestamp_out = None
+                    yield AttendanceRegister(
+                        employee=employee,
+                        timestamp_in=timestamp_in,
+                        timestamp_out=timestamp_out,
+                        method="nfc",
+                        paid=period.is_closed,
+                        pay_period=period if period.is_closed else None,
+                    )
+                day += timedelta(days=1)
+
+    register_count = len(
+        AttendanceRegister.objects.bulk_create(registers(), batch_size=BATCH_SIZE)
+    )
+
+    nfc_tokens = []
+    for index, employee in enumerate(created_employees):
+        nfc_token = NFCToken(employee=employee, tag_id=f"{prefix}-tag-{seed}-{index}")
+        nfc_token.generate_token()
+        nfc_tokens.append(nfc_token)
+    NFCToken.objects.bulk_create(nfc_tokens, batch_size=BATCH_SIZE)
+
+    return {
+        "employees": created_employees,
+        "timers": timers,
+        "periods": created_periods,
+        "active_period": active_period,
+        "nfc_tokens": nfc_tokens,
+        "registers": register_count,
+    }
@@ -0,0 +1,148 @@
+"""
+Router de base de datos para leer los reportes desde una réplica.
+
+Las vistas de reportes del dashboard heredan de ReplicaReadMixin: sus GET
+leen del alias "replica" (REPLICA_DATABASE_URL) y dejan la base principal
+para las marcas del kiosco. Todas las escrituras van siempre a "default".
+
+Si la réplica no está configurada, no responde o su retraso de replicación
+pasa de REPLICA_MAX_LAG_SECONDS, las lecturas vuelven a la base principal.
+También dentro de una transacción abierta en la principal: la réplica no ve
+lo que esa transacción escribió. Por eso los TestCase, que corren dentro de
+una transacción, leen siempre de la principal.
+El retraso se consulta como mucho una vez cada REPLICA_LAG_CHECK_INTERVAL
+segundos por proceso.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = "replica"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_read_alias = ContextVar("read_alias", default=None)
+
+# (momento de la última consulta, réplica disponible)
+_last_check = (None, False)
+
+
+def replication_lag(alias=REPLICA_ALIAS):
+    """
+    Segundos de retraso de la réplica respecto de la base principal.
+
+    Solo PostgreSQL informa el retraso; en otros motores se asume 0. Si la
+    réplica ya aplicó todo lo que recibió, el retraso es 0 aunque la última
+    transacción sea vieja (la principal puede no estar escribiendo).
+    """
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE
+                WHEN NOT pg_is_in_recovery() THEN 0
+                WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(
+                    EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+                )
+            END
+            """
+        )
+        return float(cursor.fetchone()[0])
+
+
+def replica_available():
+    """True si la réplica está configurada y su retraso está dentro del límite"""
+    global _last_check
+
+    if REPLICA_ALIAS not in connections.databases:
+        return False
+
+    checked_at, available = _last_check
+    now = time.monotonic()
+    interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 5)
+    if checked_at is not None and now - checked_at < interval:
+        return available
+
+    max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 10)
+    try:
+        lag = replication_lag()
+        available = lag <= max_lag
+        if not available:
+            logger.warning(
+                f"Réplica con {lag:.1f}s de retraso (máximo {max_lag}s): se lee de la principal"
+            )
+    except DatabaseError as e:
+        logger.warning(f"Réplica no disponible, se lee de la principal: {e}")
+        available = False
+
+    _last_check = (now, available)
+    return available
+
+
+def reset_replica_check():
+    """Descarta el último resultado de replica_available()"""
+    global _last_check
+    _last_check = (None, False)
+
+
+def read_alias():
+    """Alias desde el que lee la petición actual"""
+    return _read_alias.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Las lecturas dentro del bloque van a la réplica si está disponible.
+
+    Returns:
+        Alias usado para las lecturas
+    """
+    in_transaction = connections[DEFAULT_DB_ALIAS].in_atomic_block
+    alias = (
+        REPLICA_ALIAS if not in_transaction and replica_available() else DEFAULT_DB_ALIAS
+    )
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaReadMixin:
+    """Opt-in para vistas de solo lectura: sus GET leen de la réplica"""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Explícito: sin esto Django escribiría un objeto en la base de la que se leyó
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por la replicación
+        return db != REPLICA_ALIAS
@@ -0,0 +1,123 @@
+"""
+Métricas de la aplicación en formato de texto de Prometheus.
+
+Mide las rutas críticas del kiosco y de la planilla:
+    payroll_kiosk_tap_seconds{endpoint}          latencia de marcas y validación NFC
+    payroll_employee_calculation_seconds         cálculo y guardado de un empleado
+    payroll_run_seconds                          cálculo de la planilla completa
+    payroll_rows_per_second                      marcas procesadas por segundo
+    payroll_cache_requests_total{cache,result}   aciertos y fallos de caché
+    payroll_task_seconds{task}                   duración de las tareas de Celery
+
+La proporción de aciertos se obtiene en Prometheus con
+    sum(rate(payroll_cache_requests_total{result="hit"}[5m])) by (cache)
+    / sum(rate(payroll_cache_requests_total[5m])) by (cache)
+
+Con gunicorn cada worker es un proceso distinto: si existe la variable de
+entorno PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py la define) cada proceso
+escribe sus valores en archivos de ese directorio y el endpoint los suma. Los
+workers de Celery en la misma máquina que usen el mismo directorio también se
+incluyen. Sin la variable las métricas son las del proceso actual.
+"""
+import hmac
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+KIOSK_TAP_SECONDS = Histogram(
+    "payroll_kiosk_tap_seconds",
+    "Latencia de las marcas del kiosco y de la validación de tokens NFC",
+    ["endpoint"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+EMPLOYEE_CALCULATION_SECONDS = Histogram(
+    "payroll_employee_calculation_seconds",
+    "Duración del cálculo y guardado del salario de un empleado",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+RUN_SECONDS = Histogram(
+    "payroll_run_seconds",
+    "Duración del cálculo de la planilla de todos los empleados de un período",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+ROWS_PER_SECOND = Histogram(
+    "payroll_rows_per_second",
+    "Marcas de asistencia procesadas por segundo en el cálculo de un empleado",
+    buckets=(100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000),
+)
+
+CACHE_REQUESTS = Counter(
+    "payroll_cache_requests",
+    "Lecturas de caché por caché y resultado (hit o miss)",
+    ["cache", "result"],
+)
+
+TASK_SECONDS = Histogram(
+    "payroll_task_seconds",
+    "Duración de las tareas periódicas de Celery",
+    ["task"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+
+def count_cache(cache_name, hits=0, misses=0):
+    """
+    Suma lecturas de caché al contador de aciertos y fallos.
+
+    Args:
+        cache_name: Nombre de la caché (report, preview)
+        hits: Lecturas encontradas en caché
+        misses: Lecturas que hubo que calcular
+    """
+    if hits:
+        CACHE_REQUESTS.labels(cache_name, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache_name, "miss").inc(misses)
+
+
+def observe_rows(rows, seconds):
+    """Registra el rendimiento del cálculo de un empleado en marcas por segundo"""
+    if rows and seconds > 0:
+        ROWS_PER_SECOND.observe(rows / seconds)
+
+
+def _registry():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    Exposición de las métricas para el scraper de Prometheus.
+
+    Requiere METRICS_TOKEN en la configuración y que la petición lo envíe como
+    "Authorization: Bearer <token>"; sin token configurado el endpoint no existe.
+    """
+    expected = getattr(settings, "METRICS_TOKEN", "")
+    if not expected:
+        raise Http404()
+
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.strip().encode(), expected.encode()
+    ):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,39 @@
+"""
+Paginación por cursor (keyset) para los listados.
+
+En lugar de OFFSET, cada página continúa desde la clave de orden del último
+elemento de la anterior, así el costo de una página no crece con la posición ni
+con el tamaño de la tabla siempre que el orden use una columna indexada. Cada
+vista define su orden en `keyset_ordering`.
+
+Mientras el frontend migra, ?paginate=false devuelve la lista completa con la
+forma anterior.
+"""
+from rest_framework.pagination import CursorPagination
+
+PAGINATION_OPT_OUT_PARAM = "paginate"
+
+
+def pagination_disabled(request):
+    """Si la petición pidió explícitamente la lista completa sin paginar"""
+    return request.query_params.get(PAGINATION_OPT_OUT_PARAM, "").lower() in (
+        "false",
+        "0",
+    )
+
+
+class KeysetPagination(CursorPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-id"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "keyset_ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if pagination_disabled(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,54 @@
+"""
+Renderer JSON rápido para DRF.
+
+Usa orjson, que codifica en C los tipos comunes (incluidas fechas y horas), y
+para el resto (Decimal, cadenas perezosas, UUID...) usa el mismo encoder de
+DRF, así que la salida es idéntica a la de JSONRenderer: los campos de dinero
+de los serializers siguen siendo cadenas y un Decimal suelto sigue saliendo
+como número. Si orjson no está instalado, o se pide JSON indentado (API
+navegable), se usa el JSONRenderer de DRF.
+"""
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_drf_default = JSONEncoder().default
+
+# Igual que DRF: UTC como "Z" y claves no string convertidas a string
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+)
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return _drf_default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        # Igual que JSONRenderer: U+2028 y U+2029 son válidos en JSON pero no
+        # en JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,208 @@
+"""
+Caché de respuestas para los reportes del dashboard basada en etiquetas.
+
+Cada respuesta se guarda junto con la versión de sus etiquetas (período,
+empleado, horarios...). Invalidar una etiqueta solo cambia su versión, así que
+todas las respuestas que la usan dejan de ser válidas sin tener que buscarlas.
+Una consulta repetida cuesta una sola lectura a la caché (get_many de la
+respuesta y sus etiquetas).
+
+Las versiones de las etiquetas también sirven como sello para GET
+condicionales: cada respuesta lleva ETag/Last-Modified y un If-None-Match que
+coincide se responde con 304 antes de calcular o serializar el reporte.
+
+Las respuestas calculadas en la réplica de lectura (core.db_router) pueden ser
+anteriores a las versiones vigentes: la réplica puede no haber aplicado todavía
+el cambio que las produjo. Se guardan solo REPLICA_MAX_LAG_SECONDS (como mucho
+el retraso que ya se tolera al leer de la réplica, así que un reporte puede
+llegar con hasta el doble de atraso) y nunca llevan validadores, para que un
+cliente no se quede con un 304 sobre datos viejos hasta el próximo cambio.
+"""
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.db_router import read_alias
+from core.metrics import count_cache
+
+ENTRY_PREFIX = "report"
+TAG_PREFIX = "report-tag"
+
+# Etiqueta de las respuestas calculadas sobre el período activo (sin period_id)
+ACTIVE_PERIOD_TAG = "periods:active"
+
+
+def period_tag(period_id):
+    return f"period:{period_id}"
+
+
+def employee_tag(employee_id):
+    return f"employee:{employee_id}"
+
+
+def _tag_key(tag):
+    return f"{TAG_PREFIX}:{tag}"
+
+
+def _new_tag_version():
+    """Versión de una etiqueta: milisegundos del cambio + sufijo aleatorio"""
+    return f"{int(time.time() * 1000)}:{uuid.uuid4().hex[:12]}"
+
+
+def _version_timestamp(version):
+    try:
+        return int(version.split(":", 1)[0]) / 1000
+    except (AttributeError, ValueError):
+        return None
+
+
+def invalidate_tags(*tags):
+    """
+    Invalida todas las respuestas etiquetadas con alguna de las etiquetas.
+    Dentro de una transacción se aplica al hacer commit, para que nadie guarde
+    en caché datos que aún no son visibles.
+    """
+    if tags:
+        transaction.on_commit(
+            lambda: cache.set_many(
+                {_tag_key(tag): _new_tag_version() for tag in tags}, None
+            )
+        )
+
+
+def invalidate_period(period_id):
+    """Invalida los reportes de un período y los del período activo"""
+    invalidate_tags(period_tag(period_id), ACTIVE_PERIOD_TAG)
+
+
+def report_period_tag(request):
+    """Etiqueta del período que consulta la petición"""
+    period_id = request.query_params.get("period_id")
+    return period_tag(period_id) if period_id else ACTIVE_PERIOD_TAG
+
+
+def period_report_tags(request):
+    """
+    Etiquetas de los reportes de un período: el período, los empleados
+    incluidos (uno o todos) y los horarios que definen las horas nocturnas.
+    """
+    employee_id = request.query_params.get("employee_id")
+    return [
+        report_period_tag(request),
+        employee_tag(employee_id) if employee_id else "employees",
+        "timers",
+    ]
+
+
+def _entry_key(name, request):
+    params = sorted(
+        (key, tuple(values)) for key, values in request.query_params.lists()
+    )
+    digest = hashlib.md5(repr(params).encode("utf-8")).hexdigest()
+    return f"{ENTRY_PREFIX}:{name}:{digest}"
+
+
+def _set_validators(response, etag, versions):
+    response["ETag"] = etag
+    timestamps = [
+        timestamp
+        for timestamp in map(_version_timestamp, versions.values())
+        if timestamp is not None
+    ]
+    if timestamps:
+        response["Last-Modified"] = http_date(max(timestamps))
+    # El cliente puede guardar la respuesta pero debe revalidarla siempre
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def cached_report(get_tags):
+    """
+    Decorador para el método get de un APIView que guarda la respuesta en caché
+    según los parámetros de la consulta y responde GET condicionales.
+
+    Args:
+        get_tags: Función (request) -> lista de etiquetas de la respuesta
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = _entry_key(type(self).__name__, request)
+            tag_keys = [_tag_key(tag) for tag in get_tags(request)]
+
+            cached = cache.get_many([key, *tag_keys])
+            entry = cached.pop(key, None)
+
+            # Etiquetas que aún no existen se inicializan con una versión nueva
+            missing = {
+                tag_key: _new_tag_version()
+                for tag_key in tag_keys
+                if tag_key not in cached
+            }
+            if missing:
+                cache.set_many(missing, None)
+                cached.update(missing)
+
+            etag = quote_etag(
+                hashlib.md5(
+                    repr((key, sorted(cached.items()))).encode("utf-8")
+                ).hexdigest()
+            )
+
+            # Nada cambió desde la última respuesta que tiene el cliente
+            if_none_match = request.headers.get("If-None-Match")
+            if if_none_match:
+                client_etags = parse_etags(if_none_match)
+                if "*" in client_etags or etag in client_etags or f"W/{etag}" in client_etags:
+                    count_cache("report", hits=1)
+                    return _set_validators(
+                        Response(status=status.HTTP_304_NOT_MODIFIED), etag, cached
+                    )
+
+            if entry is not None and entry["tags"] == cached:
+                count_cache("report", hits=1)
+                response = Response(entry["data"], status=entry["status"])
+                if entry.get("replica"):
+                    return response
+                return _set_validators(response, etag, cached)
+
+            # Las versiones se leen antes de calcular: si algo cambia mientras
+            # tanto, la respuesta guardada ya nace invalidada. Eso solo vale si
+            # se calculó en la principal; la réplica puede ir atrasada respecto
+            # de las versiones leídas y su respuesta dura lo que el retraso
+            # máximo tolerado
+            count_cache("report", misses=1)
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            timeout = getattr(settings, "REPORT_CACHE_TIMEOUT", 300)
+            from_replica = read_alias() != DEFAULT_DB_ALIAS
+            if from_replica:
+                timeout = min(timeout, getattr(settings, "REPLICA_MAX_LAG_SECONDS", 10))
+            if timeout > 0:
+                cache.set(
+                    key,
+                    {
+                        "tags": cached,
+                        "data": response.data,
+                        "status": response.status_code,
+                        "replica": from_replica,
+                    },
+                    timeout,
+                )
+            if not from_replica:
+                _set_validators(response, etag, cached)
+            return response
+
+        return wrapper
+
+    return decorator
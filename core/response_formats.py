@@ -0,0 +1,90 @@
+"""
+Formatos de respuesta reducidos para los reportes del dashboard.
+
+- ?fields=employee_id,total_hours deja solo esos campos en cada fila.
+- ?format=columnar devuelve cada lista de filas como un arreglo por campo
+  ({"employee_id": [1, 2], "total_hours": [80.5, 76.0]}) en lugar de repetir
+  todas las claves en cada fila.
+
+Las filas son las listas de diccionarios de la respuesta: la respuesta misma
+si es una lista, o las listas dentro de un diccionario ("stats",
+"employees", "results"...). El resto de la respuesta no cambia.
+"""
+from rest_framework import status
+from rest_framework.settings import api_settings
+
+from core.renderers import FastJSONRenderer
+
+FIELDS_PARAM = "fields"
+
+
+def _is_rows(value):
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+def _map_rows(data, transform):
+    """Aplica transform a las listas de filas de la respuesta"""
+    if _is_rows(data):
+        return transform(data)
+    if isinstance(data, dict):
+        return {
+            key: transform(value) if value and _is_rows(value) else value
+            for key, value in data.items()
+        }
+    return data
+
+
+def requested_fields(request):
+    """Campos pedidos con ?fields=, o None si se piden todos"""
+    value = request.query_params.get(FIELDS_PARAM, "")
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    return fields or None
+
+
+def select_fields(data, fields):
+    """Deja en cada fila solo los campos pedidos, en el orden pedido"""
+    return _map_rows(
+        data,
+        lambda rows: [
+            {field: row[field] for field in fields if field in row} for row in rows
+        ],
+    )
+
+
+def to_columnar(data):
+    """Convierte cada lista de filas en un diccionario de arreglos por campo"""
+
+    def columns(rows):
+        keys = list(rows[0].keys()) if rows else []
+        return {key: [row.get(key) for row in rows] for key in keys}
+
+    return _map_rows(data, columns)
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """JSON con las filas en columnas. Se elige con ?format=columnar"""
+
+    media_type = "application/vnd.payroll.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columnar(data), accepted_media_type, renderer_context)
+
+
+class ReportFormatsMixin:
+    """
+    Agrega a una vista ?fields= y ?format=columnar. Se aplica al final, así
+    que también funciona con respuestas desde caché o desde fotos congeladas.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        fields = requested_fields(request)
+        if (
+            fields
+            and response.status_code == status.HTTP_200_OK
+            and getattr(response, "data", None) is not None
+        ):
+            response.data = select_fields(response.data, fields)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -57,6 +57,7 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'x-debug-queries',
 ]
 CORS_ALLOW_METHODS = [
     'DELETE',
@@ -67,6 +68,9 @@ CORS_ALLOW_METHODS = [
     'PUT',
 ]
 
+# Permitir que el frontend lea los validadores de los GET condicionales y el perfilado
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified", "Server-Timing", "X-Debug-Queries"]
+
 # CSRF Trusted Origins
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 
@@ -92,6 +96,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero para medir la petición completa; solo actúa con SERVER_TIMING_ENABLED
+    "core.server_timing.ServerTimingMiddleware",
+    # Solo actúa con SLOW_QUERY_CAPTURE_ENABLED
+    "core.slow_queries.SlowQueryMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -124,13 +132,22 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 # RESTFRAMEWORK
 REST_FRAMEWORK = {
+    # request.user se arma con los claims del token, sin consultar la base de datos
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.claims.ClaimsJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson con la misma salida que JSONRenderer de DRF
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
     ],
+    # Paginación por cursor; ?paginate=false devuelve la lista completa
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "100")),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -153,6 +170,73 @@ DATABASES = {
     )
 }
 
+# Réplica de lectura para los reportes del dashboard (core/db_router.py).
+# Las respuestas de core/report_cache.py calculadas en la réplica se guardan
+# solo REPLICA_MAX_LAG_SECONDS (no REPORT_CACHE_TIMEOUT) y sin ETag: con réplica
+# un reporte puede llegar hasta 2 x REPLICA_MAX_LAG_SECONDS atrasado y los GET
+# condicionales solo responden 304 a respuestas calculadas en la principal
+if os.getenv("REPLICA_DATABASE_URL"):
+    DATABASES["replica"] = dj_database_url.parse(
+        os.getenv("REPLICA_DATABASE_URL"),
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    # En los tests la réplica apunta a la misma base de pruebas que default
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+# Segundos de retraso de la réplica a partir de los que se lee de la principal
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+# Segundos entre consultas del retraso de la réplica (por proceso)
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+
+# Cache
+# Local: memoria del proceso. En producción con varios workers de gunicorn se
+# debe usar un backend compartido (REDIS_URL) para que la invalidación llegue a todos.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Header Server-Timing con tiempos de SQL y serializers (core/server_timing.py)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "False") == "True"
+# Fracción de peticiones medidas (0 a 1); X-Debug-Queries siempre se mide
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", "1.0"))
+
+# Captura de consultas lentas con EXPLAIN (core/slow_queries.py)
+SLOW_QUERY_CAPTURE_ENABLED = os.getenv("SLOW_QUERY_CAPTURE_ENABLED", "False") == "True"
+# Milisegundos de SQL de una petición a partir de los que se captura
+SLOW_QUERY_REQUEST_MS = float(os.getenv("SLOW_QUERY_REQUEST_MS", "500"))
+# Milisegundos a partir de los que una sentencia se explica
+SLOW_QUERY_STATEMENT_MS = float(os.getenv("SLOW_QUERY_STATEMENT_MS", "100"))
+SLOW_QUERY_TOP = int(os.getenv("SLOW_QUERY_TOP", "3"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+# Segundos antes de volver a explicar la misma sentencia
+SLOW_QUERY_COOLDOWN = int(os.getenv("SLOW_QUERY_COOLDOWN", "300"))
+# Alias de una réplica donde correr el EXPLAIN (vacío: la misma base)
+SLOW_QUERY_EXPLAIN_DATABASE = os.getenv("SLOW_QUERY_EXPLAIN_DATABASE", "")
+
+# Particiones mensuales de las marcas (PostgreSQL, manage.py attendance_partitions)
+# Meses futuros con partición creada de antemano
+ATTENDANCE_PARTITIONS_AHEAD = int(os.getenv("ATTENDANCE_PARTITIONS_AHEAD", "3"))
+# Meses después de los que una partición recibe su índice BRIN
+ATTENDANCE_BRIN_AFTER_MONTHS = int(os.getenv("ATTENDANCE_BRIN_AFTER_MONTHS", "2"))
+
+# Token Bearer del scraper de Prometheus para /v1/metrics/ (sin token no se expone)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Segundos máximos que se guarda un reporte del dashboard (se invalida al cambiar los datos)
+REPORT_CACHE_TIMEOUT = int(os.getenv("REPORT_CACHE_TIMEOUT", "300"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -200,6 +284,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SIMPLE_JWT = {"ACCESS_TOKEN_LIFETIME": timedelta(hours=24)}
 
+# Segundos que se memoriza la vista previa de planilla (se invalida sola al cambiar las marcas)
+PAYROLL_PREVIEW_CACHE_TIMEOUT = int(os.getenv("PAYROLL_PREVIEW_CACHE_TIMEOUT", "300"))
+
 # Production Security Settings
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
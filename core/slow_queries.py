@@ -0,0 +1,206 @@
+"""
+Captura de consultas lentas con su plan de ejecución.
+
+Si el SQL de una petición suma más de SLOW_QUERY_REQUEST_MS, las sentencias
+SELECT más lentas (las que pasan de SLOW_QUERY_STATEMENT_MS, hasta
+SLOW_QUERY_TOP) se vuelven a ejecutar con EXPLAIN (ANALYZE, BUFFERS) dentro de
+un savepoint que se revierte. Con SLOW_QUERY_EXPLAIN_DATABASE el EXPLAIN corre
+en esa base (una réplica) en lugar de la que atendió la consulta. En motores
+distintos de PostgreSQL se guarda el plan sin ANALYZE, igual que para las
+sentencias que toman bloqueos (FOR UPDATE/FOR SHARE, pg_advisory_*): volver a
+ejecutarlas haría esperar a la petición otra vez por el mismo bloqueo.
+
+Las capturas se guardan en un buffer circular de SLOW_QUERY_BUFFER_SIZE
+entradas en la caché, compartido por todos los workers cuando la caché es
+Redis. Una misma sentencia se vuelve a explicar como mucho una vez cada
+SLOW_QUERY_COOLDOWN segundos para no duplicar la carga de una vista lenta.
+
+Se activa con SLOW_QUERY_CAPTURE_ENABLED=True. Solo se guarda el SQL sin los
+parámetros, que pueden incluir PINs o tokens.
+"""
+import hashlib
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from core.server_timing import _view_name
+
+PREFIX = "slow-queries"
+SEQUENCE_KEY = f"{PREFIX}:seq"
+MAX_SQL_LENGTH = 2000
+
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Sentencias que toman bloqueos: se explican sin ejecutarlas
+LOCKING = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b|\bpg_\w*advisory\w*\s*\(",
+    re.IGNORECASE,
+)
+
+
+def _buffer_size():
+    return getattr(settings, "SLOW_QUERY_BUFFER_SIZE", 100)
+
+
+def _slot_key(sequence):
+    return f"{PREFIX}:slot:{sequence % _buffer_size()}"
+
+
+def record_capture(capture):
+    """
+    Guarda una captura en el buffer circular, reemplazando la más antigua.
+
+    Returns:
+        Número de secuencia asignado a la captura
+    """
+    cache.add(SEQUENCE_KEY, 0, None)
+    sequence = cache.incr(SEQUENCE_KEY)
+    cache.set(_slot_key(sequence), {**capture, "id": sequence}, None)
+    return sequence
+
+
+def recent_captures():
+    """Capturas del buffer, de la más reciente a la más antigua"""
+    last = cache.get(SEQUENCE_KEY) or 0
+    sequences = range(last, max(last - _buffer_size(), 0), -1)
+    stored = cache.get_many([_slot_key(sequence) for sequence in sequences])
+    # Un slot puede tener una captura vieja si el buffer cambió de tamaño
+    return [
+        stored[_slot_key(sequence)]
+        for sequence in sequences
+        if stored.get(_slot_key(sequence), {}).get("id") == sequence
+    ]
+
+
+def clear_captures():
+    last = cache.get(SEQUENCE_KEY) or 0
+    cache.delete_many(
+        [SEQUENCE_KEY]
+        + [_slot_key(sequence) for sequence in range(last, max(last - _buffer_size(), 0), -1)]
+    )
+
+
+def explain_statement(alias, sql, params):
+    """
+    Plan de ejecución de una sentencia SELECT, ejecutada en un savepoint que
+    se revierte.
+
+    Args:
+        alias: Base de datos donde se ejecutó la consulta
+        sql: SQL con los marcadores de parámetros
+        params: Parámetros de la consulta
+
+    Returns:
+        (alias donde se ejecutó el EXPLAIN, plan en texto)
+    """
+    target = getattr(settings, "SLOW_QUERY_EXPLAIN_DATABASE", "") or alias
+    if target not in connections.databases:
+        target = alias
+    connection = connections[target]
+
+    analyze = connection.vendor == "postgresql" and not LOCKING.search(sql)
+    options = {"analyze": True, "buffers": True} if analyze else {}
+    prefix = connection.ops.explain_query_prefix(**options)
+    try:
+        with transaction.atomic(using=target):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+            transaction.set_rollback(True, using=target)
+    except DatabaseError as e:
+        return target, f"No se pudo obtener el plan: {e}"
+    # PostgreSQL devuelve una línea por fila; SQLite deja el detalle al final
+    return target, "\n".join(str(row[-1]) for row in rows)
+
+
+class StatementRecorder:
+    """execute_wrapper que guarda las sentencias que pasan del umbral"""
+
+    def __init__(self, statement_threshold):
+        self.statement_threshold = statement_threshold
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.view = None
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.sql_count += 1
+            self.sql_time += elapsed
+            if elapsed >= self.statement_threshold and not many:
+                self.slow.append((elapsed, context["connection"].alias, sql, params))
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "SLOW_QUERY_CAPTURE_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.request_threshold = getattr(settings, "SLOW_QUERY_REQUEST_MS", 500) / 1000
+        self.statement_threshold = getattr(settings, "SLOW_QUERY_STATEMENT_MS", 100) / 1000
+        self.top = getattr(settings, "SLOW_QUERY_TOP", 3)
+        self.cooldown = getattr(settings, "SLOW_QUERY_COOLDOWN", 300)
+
+    def __call__(self, request):
+        recorder = StatementRecorder(self.statement_threshold)
+        request._slow_queries = recorder
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        if recorder.sql_time >= self.request_threshold and recorder.slow:
+            self.capture(request, response, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = getattr(request, "_slow_queries", None)
+        if recorder is not None:
+            recorder.view = _view_name(view_func)
+
+    def capture(self, request, response, recorder):
+        statements = []
+        slowest = sorted(recorder.slow, key=lambda statement: statement[0], reverse=True)
+        for elapsed, alias, sql, params in slowest:
+            if len(statements) >= self.top:
+                break
+            if not EXPLAINABLE.match(sql):
+                continue
+            # La misma sentencia solo se explica una vez por período de espera
+            digest = hashlib.md5(sql.encode("utf-8")).hexdigest()
+            if not cache.add(f"{PREFIX}:seen:{digest}", 1, self.cooldown):
+                continue
+            explained_on, plan = explain_statement(alias, sql, params)
+            statements.append(
+                {
+                    "ms": round(elapsed * 1000, 2),
+                    "db": alias,
+                    "explained_on": explained_on,
+                    "sql": sql[:MAX_SQL_LENGTH],
+                    "plan": plan,
+                }
+            )
+
+        if statements:
+            record_capture(
+                {
+                    "captured_at": timezone.now().isoformat(),
+                    "method": request.method,
+                    "path": request.path,
+                    "view": recorder.view,
+                    "status": response.status_code,
+                    "sql_ms": round(recorder.sql_time * 1000, 2),
+                    "queries": recorder.sql_count,
+                    "statements": statements,
+                }
+            )
+
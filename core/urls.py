@@ -1,4 +1,5 @@
 from django.urls import path, include
+from core.metrics import metrics_view
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -22,4 +23,5 @@ urlpatterns = [
     path("v1/attendance/", include("attendance.urls")),
     path("v1/auth/", include("authentication.urls")),
     path("v1/salary/", include("payrolls.urls")),
+    path("v1/metrics/", metrics_view, name="metrics"),
 ]
@@ -1,20 +1,22 @@
+from django.db.models import Prefetch
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from employee.models import Employee
 from employee.serializers import EmployeeSerializer, CurrentlyWorkingEmployeeSerializer
 from attendance.models import AttendanceRegister
+from core.report_cache import cached_report
 
 
 class EmployeeListCreateView(generics.ListCreateAPIView):
     serializer_class = EmployeeSerializer
     queryset = Employee.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = "id"
 
     def create(self, request, *args, **kwargs):
-        user = self.request.user
-
-        if not Employee.objects.filter(id=user.id, is_admin=True).exists(): # type: ignore
+        # is_admin viene en el token, no hace falta consultar al empleado
+        if not request.user.is_admin:
             return Response(
                 {"error": "No tienes permiso para realizar esta accion"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -46,23 +48,29 @@ class CurrentlyWorkingEmployeesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = CurrentlyWorkingEmployeeSerializer
 
+    @cached_report(lambda request: ["attendance", "employees"])
     def get(self, request):
         # Encontrar empleados que han marcado entrada pero no salida
-        empleados_trabajando = Employee.objects.filter(
-            attendanceregister__timestamp_out__isnull=True
-        ).distinct()
+        # Sus marcas abiertas se cargan en una sola consulta, la más reciente primero
+        empleados_trabajando = (
+            Employee.objects.filter(attendanceregister__timestamp_out__isnull=True)
+            .distinct()
+            .prefetch_related(
+                Prefetch(
+                    "attendanceregister_set",
+                    queryset=AttendanceRegister.objects.filter(
+                        timestamp_out__isnull=True
+                    ).order_by("-timestamp_in"),
+                    to_attr="open_registers",
+                )
+            )
+        )
 
         # Obtener información detallada para cada empleado
         resultado = []
         for empleado in empleados_trabajando:
-            # Obtener el registro de asistencia activo (la última marca de entrada sin salida)
-            registro_activo = (
-                AttendanceRegister.objects.filter(
-                    employee=empleado, timestamp_out__isnull=True
-                )
-                .order_by("-timestamp_in")
-                .first()
-            )
+            # El registro de asistencia activo (la última marca de entrada sin salida)
+            registro_activo = next(iter(empleado.open_registers), None)
 
             if registro_activo:
                 data = {
@@ -0,0 +1,27 @@
+"""
+Configuración de gunicorn (se carga automáticamente desde el directorio actual)
+
+Prepara el directorio donde cada worker guarda sus métricas de Prometheus
+(core/metrics.py) para que el endpoint de métricas sume las de todos.
+"""
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "payroll-prometheus"),
+)
+
+
+def on_starting(server):
+    # Los archivos de una ejecución anterior sumarían valores viejos
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
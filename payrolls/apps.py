@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PayrollsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'payrolls'
+
+    def ready(self):
+        # Registrar la invalidación de la caché de reportes
+        from payrolls import signals  # noqa: F401
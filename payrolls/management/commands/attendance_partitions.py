@@ -0,0 +1,89 @@
+"""
+Management command para mantener las particiones mensuales de las marcas
+Pensado para correr una vez al día (cron); solo aplica en PostgreSQL
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payrolls.services.attendance_partitions import (
+    add_brin_indexes,
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+)
+
+
+class Command(BaseCommand):
+    help = """
+    Crea las particiones de los próximos meses de attendance_attendanceregister,
+    agrega índices BRIN a las particiones viejas y archiva (separa) particiones.
+
+    Uso:
+    1. Mantenimiento diario (particiones futuras e índices BRIN):
+       python manage.py attendance_partitions
+
+    2. Ver las particiones:
+       python manage.py attendance_partitions --list
+
+    3. Archivar los meses anteriores a enero de 2024:
+       python manage.py attendance_partitions --detach-before=2024-01
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead", type=int, help="Meses futuros con partición (default: configuración)"
+        )
+        parser.add_argument(
+            "--brin-after",
+            type=int,
+            help="Meses después de los que se agrega el índice BRIN (default: configuración)",
+        )
+        parser.add_argument(
+            "--detach-before",
+            help="Separa las particiones de los meses anteriores a este (AAAA-MM)",
+        )
+        parser.add_argument("--list", action="store_true", help="Solo lista las particiones")
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            raise CommandError(
+                "La tabla de marcas no está particionada (requiere PostgreSQL y la migración attendance 0004)"
+            )
+
+        if options["list"]:
+            for partition in list_partitions():
+                brin = " BRIN" if partition["has_brin"] else ""
+                self.stdout.write(
+                    f"  {partition['month']:%Y-%m}  ~{partition['rows']} marcas{brin}  {partition['name']}"
+                )
+            return
+
+        if options["detach_before"]:
+            try:
+                limit = month_start(datetime.strptime(options["detach_before"], "%Y-%m").date())
+            except ValueError:
+                raise CommandError("--detach-before debe tener el formato AAAA-MM")
+
+            for partition in list_partitions():
+                if partition["month"] >= limit:
+                    continue
+                try:
+                    name = detach_partition(partition["month"])
+                except ValueError as e:
+                    raise CommandError(str(e))
+                self.stdout.write(f"  ✓ Separada {name}")
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✓ Particiones anteriores a {limit:%Y-%m} archivadas"
+                )
+            )
+            return
+
+        for name in ensure_partitions(months_ahead=options["ahead"]):
+            self.stdout.write(f"  ✓ Creada {name}")
+        for name in add_brin_indexes(after_months=options["brin_after"]):
+            self.stdout.write(f"  ✓ Índice BRIN en {name}")
+        self.stdout.write(self.style.SUCCESS("✓ Particiones al día"))
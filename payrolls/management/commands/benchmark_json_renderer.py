@@ -0,0 +1,98 @@
+"""
+Management command para comparar el JSONRenderer de DRF con FastJSONRenderer
+Los registros se arman en memoria, no toca la base de datos
+"""
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONRenderer
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.serializers import SalaryRecordSerializer
+
+
+class Command(BaseCommand):
+    help = """
+    Mide el tiempo de renderizar una respuesta de SalaryRecordSerializer con el
+    JSONRenderer de DRF y con FastJSONRenderer, y verifica que la salida sea
+    idéntica.
+
+    Uso:
+       python manage.py benchmark_json_renderer --rows=5000 --repeat=5
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=5000, help="Registros de salario a generar"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Repeticiones por medición"
+        )
+
+    def build_data(self, rows):
+        period = PayPeriod(
+            id=1,
+            start_date=date(2000, 1, 1),
+            end_date=date(2000, 1, 15),
+            description="Quincena de prueba",
+        )
+        paid_at = timezone.now()
+        records = [
+            SalaryRecord(
+                id=index + 1,
+                employee=Employee(
+                    id=index + 1,
+                    username=f"benchmark-json-{index}",
+                    first_name="Empleado",
+                    last_name=str(index),
+                ),
+                pay_period=period,
+                total_hours=Decimal("100.50"),
+                regular_hours=Decimal("96.00"),
+                night_hours=Decimal(index % 3),
+                extra_hours=Decimal("4.50"),
+                lunch_deduction_hours=Decimal("10.00"),
+                gross_salary=Decimal("2055.00"),
+                other_deductions=Decimal("12.35"),
+                salary_to_pay=Decimal("1855.00"),
+                paid_at=paid_at,
+            )
+            for index in range(rows)
+        ]
+        return SalaryRecordSerializer(records, many=True).data
+
+    def measure(self, label, render, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(f"  {label:<20} {best * 1000:9.1f} ms  {len(output):9d} bytes")
+        return best, output
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        data = self.build_data(rows)
+
+        self.stdout.write(
+            self.style.WARNING(f"RENDER DE {rows} REGISTROS DE SALARIO (mejor de {repeat})")
+        )
+        slow, expected = self.measure(
+            "JSONRenderer", lambda: JSONRenderer().render(data), repeat
+        )
+        fast, output = self.measure(
+            "FastJSONRenderer", lambda: FastJSONRenderer().render(data), repeat
+        )
+
+        if output != expected:
+            self.stdout.write(self.style.ERROR("  La salida no es idéntica"))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(f"  Salida idéntica, {slow / fast:.1f}x más rápido")
+        )
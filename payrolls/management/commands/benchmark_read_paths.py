@@ -0,0 +1,152 @@
+"""
+Management command para comparar los serializers con la lectura rápida de listados
+Crea datos de prueba dentro de una transacción que se revierte al terminar
+"""
+import time
+from datetime import date, timedelta, time as dt_time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from attendance.models import AttendanceDetail
+from attendance.serializers import AttendanceDetailSerializer
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.serializers import SalaryRecordSerializer
+from payrolls.services.row_encoders import (
+    attendance_detail_values,
+    encode_attendance_detail_row,
+    encode_salary_row,
+    salary_record_values,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = """
+    Mide tiempo y consultas de SalaryRecordSerializer / AttendanceDetailSerializer
+    frente a la lectura con values() y codificadores de filas.
+
+    Uso:
+       python manage.py benchmark_read_paths --rows=1000 --repeat=5
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=1000, help="Registros de salario a generar"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Repeticiones por medición"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options["rows"], options["repeat"])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def seed(self, rows):
+        period = PayPeriod.objects.create(
+            start_date=date(2000, 1, 1), end_date=date(2000, 1, 15), is_closed=True
+        )
+        employees = Employee.objects.bulk_create(
+            Employee(
+                username=f"benchmark-read-{index}",
+                first_name="Empleado",
+                last_name=str(index),
+                salary_hour=Decimal("20.00"),
+            )
+            for index in range(rows)
+        )
+        SalaryRecord.objects.bulk_create(
+            SalaryRecord(
+                employee=employee,
+                pay_period=period,
+                total_hours=Decimal("100.50"),
+                regular_hours=Decimal("96.00"),
+                night_hours=Decimal(index % 3),
+                extra_hours=Decimal("4.50"),
+                lunch_deduction_hours=Decimal("10.00"),
+                gross_salary=Decimal("2055.00"),
+                salary_to_pay=Decimal("1855.00"),
+            )
+            for index, employee in enumerate(employees)
+        )
+        # Un solo empleado con tantos días de detalle como filas pedidas
+        details_employee = employees[0]
+        AttendanceDetail.objects.bulk_create(
+            AttendanceDetail(
+                employee=details_employee,
+                pay_period=period,
+                work_date=date(2000, 1, 1) + timedelta(days=day),
+                time_in=dt_time(8, 0),
+                time_out=dt_time(17, 0),
+                regular_hours=Decimal("8.00"),
+                lunch_deduction=Decimal("1.00"),
+            )
+            for day in range(rows)
+        )
+        return period, details_employee
+
+    def measure(self, label, build, repeat):
+        with CaptureQueriesContext(connection) as queries:
+            build()
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            build()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(
+            f"  {label:<32} {best * 1000:9.1f} ms  {len(queries.captured_queries):4d} consultas"
+        )
+        return best
+
+    def run(self, rows, repeat):
+        period, details_employee = self.seed(rows)
+        records = SalaryRecord.objects.filter(pay_period=period).order_by("id")
+        details = AttendanceDetail.objects.filter(
+            employee=details_employee, pay_period=period
+        ).order_by("work_date")
+
+        self.stdout.write(self.style.WARNING(f"LISTADOS DE {rows} FILAS (mejor de {repeat})"))
+
+        self.stdout.write("Registros de salario")
+        slow = self.measure(
+            "SalaryRecordSerializer",
+            lambda: SalaryRecordSerializer(
+                records.select_related("employee", "pay_period"), many=True
+            ).data,
+            repeat,
+        )
+        fast = self.measure(
+            "values() + encode_salary_row",
+            lambda: [encode_salary_row(row) for row in salary_record_values(records.all())],
+            repeat,
+        )
+        self.stdout.write(self.style.SUCCESS(f"  {slow / fast:.1f}x más rápido"))
+
+        self.stdout.write("Detalles de asistencia")
+        slow = self.measure(
+            "AttendanceDetailSerializer",
+            lambda: AttendanceDetailSerializer(
+                details.select_related("employee"), many=True
+            ).data,
+            repeat,
+        )
+        fast = self.measure(
+            "values() + encode_detail_row",
+            lambda: [
+                encode_attendance_detail_row(row)
+                for row in attendance_detail_values(details.all())
+            ],
+            repeat,
+        )
+        self.stdout.write(self.style.SUCCESS(f"  {slow / fast:.1f}x más rápido"))
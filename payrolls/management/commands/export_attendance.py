@@ -0,0 +1,77 @@
+"""
+Management command para exportar marcas de asistencia con COPY de PostgreSQL
+Útil para auditorías de rangos largos (CSV comprimido en gzip)
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from payrolls.services.attendance_export import (
+    copy_export_supported,
+    iter_attendance_csv_gzip,
+)
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {value} (use AAAA-MM-DD)")
+
+
+class Command(BaseCommand):
+    help = """
+    Exporta las marcas de asistencia de un rango de fechas a un CSV comprimido en gzip.
+
+    Uso:
+    1. Todos los empleados:
+       python manage.py export_attendance --start-date=2025-01-01 --end-date=2025-12-31 --output=asistencias.csv.gz
+
+    2. Empleados específicos:
+       python manage.py export_attendance --start-date=2025-01-01 --end-date=2025-12-31 --employees 1 2 3 --output=asistencias.csv.gz
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            required=True,
+            help="Primer día incluido (AAAA-MM-DD, hora local)",
+        )
+        parser.add_argument(
+            "--end-date",
+            required=True,
+            help="Último día incluido (AAAA-MM-DD, hora local)",
+        )
+        parser.add_argument(
+            "--employees",
+            nargs="+",
+            type=int,
+            help="IDs de empleados a exportar (separados por espacio)",
+        )
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Archivo de salida (.csv.gz)",
+        )
+
+    def handle(self, *args, **options):
+        start_date = parse_date(options["start_date"])
+        end_date = parse_date(options["end_date"])
+        if end_date < start_date:
+            raise CommandError("La fecha final debe ser posterior a la inicial")
+
+        if not copy_export_supported():
+            raise CommandError("La exportación masiva requiere PostgreSQL")
+
+        written = 0
+        with open(options["output"], "wb") as output:
+            for chunk in iter_attendance_csv_gzip(
+                start_date, end_date, options.get("employees")
+            ):
+                output.write(chunk)
+                written += len(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Exportado {options['output']} ({written / 1024:.1f} KiB comprimidos)"
+            )
+        )
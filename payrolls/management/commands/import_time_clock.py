@@ -0,0 +1,89 @@
+"""
+Management command para importar marcas de un reloj marcador anterior
+Carga el CSV con COPY en una tabla temporal y hace el upsert con SQL por conjuntos
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from payrolls.services.attendance_import import import_time_clock_csv
+
+
+class Command(BaseCommand):
+    help = """
+    Importa marcas de asistencia desde un CSV con columnas:
+    empleado (username o PIN), entrada, salida (opcional).
+
+    Uso:
+    1. Importar un archivo con encabezado:
+       python manage.py import_time_clock --file=marcas.csv
+
+    2. Validar sin guardar y escribir los rechazos:
+       python manage.py import_time_clock --file=marcas.csv --dry-run --rejects-file=rechazos.csv
+
+    3. Importar historial ya pagado:
+       python manage.py import_time_clock --file=marcas.csv --mark-paid
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", required=True, help="Archivo CSV a importar")
+        parser.add_argument(
+            "--no-header",
+            action="store_true",
+            help="El archivo no tiene fila de encabezado",
+        )
+        parser.add_argument(
+            "--mark-paid",
+            action="store_true",
+            help="Guardar las marcas insertadas como pagadas",
+        )
+        parser.add_argument(
+            "--rejects-file",
+            help="Archivo CSV donde escribir las filas rechazadas",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validar e informar sin guardar cambios",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("La importación masiva requiere PostgreSQL")
+
+        try:
+            with open(options["file"], newline="", encoding="utf-8-sig") as source:
+                result = import_time_clock_csv(
+                    source,
+                    has_header=not options["no_header"],
+                    mark_paid=options["mark_paid"],
+                    dry_run=options["dry_run"],
+                )
+        except FileNotFoundError:
+            raise CommandError(f"No existe el archivo {options['file']}")
+
+        rejected = result["rejected"]
+        if options.get("rejects_file"):
+            with open(options["rejects_file"], "w", newline="", encoding="utf-8") as output:
+                writer = csv.DictWriter(output, fieldnames=["line", "employee_ref", "reason"])
+                writer.writeheader()
+                writer.writerows(rejected)
+
+        title = "DRY RUN" if options["dry_run"] else "MODO REAL"
+        self.stdout.write(self.style.WARNING(f"IMPORTACIÓN DE MARCAS - {title}"))
+        self.stdout.write(f"  Filas leídas:   {result['total']}")
+        self.stdout.write(f"  Insertadas:     {result['inserted']}")
+        self.stdout.write(f"  Actualizadas:   {result['updated']}")
+        self.stdout.write(f"  Sin cambios:    {result['unchanged']}")
+        self.stdout.write(f"  Rechazadas:     {len(rejected)}")
+
+        for reject in rejected[:20]:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"    línea {reject['line']} ({reject['employee_ref']}): {reject['reason']}"
+                )
+            )
+        if len(rejected) > 20:
+            self.stdout.write(f"    ... y {len(rejected) - 20} más")
+
+        self.stdout.write(self.style.SUCCESS("\n✓ Importación completada"))
@@ -0,0 +1,132 @@
+"""
+Management command para perfilar memoria y CPU del cálculo de planilla de un período
+Los cálculos corren en una transacción que se revierte: no guarda nada
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.profiling import ENGINES, profile_engine, resolve_engine
+from payrolls.models import PayPeriod
+
+
+class Command(BaseCommand):
+    help = f"""
+    Ejecuta el cálculo de planilla de un período con tracemalloc y cProfile y
+    reporta el pico de memoria, los sitios que más memoria asignan y las
+    funciones más costosas. Con --compare perfila un segundo motor y muestra
+    ambos lado a lado.
+
+    Motores: {", ".join(ENGINES)} o la ruta de una función (pay_period) -> None
+
+    Uso:
+       python manage.py profile_payroll --period-id=12
+       python manage.py profile_payroll --period-id=12 --compare=preview
+       python manage.py profile_payroll --period-id=12 --include="*payrolls/*" --dump=perfil.prof
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period-id", type=int, required=True, help="ID del período a calcular"
+        )
+        parser.add_argument(
+            "--engine", default="calculate", help="Motor a perfilar (default calculate)"
+        )
+        parser.add_argument("--compare", help="Segundo motor para comparar")
+        parser.add_argument(
+            "--top", type=int, default=10, help="Sitios y funciones a mostrar"
+        )
+        parser.add_argument(
+            "--include",
+            help='Patrón de archivos para los sitios de asignación (ej. "*payrolls/*")',
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["tottime", "cumulative"],
+            default="tottime",
+            help="Orden de las funciones: tiempo propio o acumulado",
+        )
+        parser.add_argument(
+            "--dump", help="Archivo .prof donde guardar las estadísticas de cProfile"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            pay_period = PayPeriod.objects.get(id=options["period_id"])
+        except PayPeriod.DoesNotExist:
+            raise CommandError(f"No existe un período de pago con ID {options['period_id']}")
+
+        engines = [options["engine"]]
+        if options["compare"]:
+            engines.append(options["compare"])
+        for engine in engines:
+            try:
+                resolve_engine(engine)
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.WARNING(f"PERFIL DEL PERÍODO {pay_period.description}")
+        )
+        results = []
+        for engine in engines:
+            dump = options["dump"]
+            if dump and len(engines) > 1:
+                root, ext = os.path.splitext(dump)
+                dump = f"{root}.{engine.rsplit('.', 1)[-1]}{ext or '.prof'}"
+            results.append(
+                profile_engine(
+                    engine,
+                    pay_period,
+                    top=options["top"],
+                    include=options["include"],
+                    sort=options["sort"],
+                    dump=dump,
+                )
+            )
+            if dump:
+                self.stdout.write(f"  Estadísticas de cProfile de {engine} en {dump}")
+
+        self.write_summary(results)
+        for result in results:
+            self.write_details(result, options["sort"])
+
+    def write_summary(self, results):
+        self.stdout.write(self.style.WARNING("RESUMEN"))
+        self.stdout.write(
+            f"  {'':<12}" + "".join(f"{result['engine'][-20:]:>22}" for result in results)
+        )
+        for label, key in (
+            ("tiempo ms", "wall_ms"),
+            ("consultas", "queries"),
+            ("pico KiB", "peak_kib"),
+        ):
+            self.stdout.write(
+                f"  {label:<12}" + "".join(f"{result[key]:>22}" for result in results)
+            )
+
+        if len(results) == 2:
+            base, other = results
+            for label, key in (("tiempo", "wall_ms"), ("memoria", "peak_kib")):
+                if base[key]:
+                    self.stdout.write(
+                        f"  {label}: {other['engine']} = x{other[key] / base[key]:.2f} "
+                        f"de {base['engine']}"
+                    )
+
+    def write_details(self, result, sort):
+        self.stdout.write(self.style.WARNING(f"MOTOR {result['engine']}"))
+
+        self.stdout.write(self.style.SUCCESS("  Sitios de asignación (cerca del pico)"))
+        for site in result["allocation_sites"]:
+            self.stdout.write(
+                f"    {site['kib']:10.1f} KiB {site['count']:8d} bloques  {site['site']}"
+            )
+
+        column = "cumtime_ms" if sort == "cumulative" else "tottime_ms"
+        self.stdout.write(self.style.SUCCESS(f"  Funciones más costosas ({sort})"))
+        for function in result["hot_functions"]:
+            self.stdout.write(
+                f"    {function[column]:10.2f} ms {function['calls']:8d} llamadas  "
+                f"{function['function']}"
+            )
@@ -3,10 +3,8 @@ Management command para resetear el estado 'paid' de asistencias
 Útil cuando se calcula salario antes del fin del período y se necesita recalcular
 """
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from attendance.models import AttendanceRegister, AttendanceDetail
-from payrolls.models import SalaryRecord, PayPeriod
-from employee.models import Employee
+from payrolls.models import PayPeriod
+from payrolls.services.attendance_reset import reset_attendance_paid_status
 
 
 class Command(BaseCommand):
@@ -98,74 +96,49 @@ class Command(BaseCommand):
         self.stdout.write(f"Período: {pay_period.description}")
         self.stdout.write(f"Fechas: {pay_period.start_date} - {pay_period.end_date}\n")
 
-        # Obtener empleados a procesar
-        if all_employees:
-            # Todos los empleados que tienen asistencias en este período
-            employee_ids = (
-                AttendanceRegister.objects.filter(pay_period=pay_period)
-                .values_list("employee_id", flat=True)
-                .distinct()
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    "⚠️  MODO DRY RUN - No se harán cambios reales\n"
+                )
             )
-            employees = Employee.objects.filter(id__in=employee_ids)
-        else:
-            employees = Employee.objects.filter(id__in=employee_ids)
 
-        if not employees.exists():
+        # Obtener empleados a procesar y aplicar el reseteo en bloque
+        result = reset_attendance_paid_status(
+            pay_period,
+            employee_ids=None if all_employees else employee_ids,
+            delete_salary_records=delete_salary,
+            dry_run=dry_run,
+        )
+        employees_data = result["employees"]
+
+        if not employees_data:
             self.stdout.write(self.style.ERROR("No se encontraron empleados"))
             return
 
         self.stdout.write(
             self.style.WARNING(
-                f"Empleados a procesar ({employees.count()}):"
+                f"Empleados procesados ({len(employees_data)}):"
             )
         )
-        for emp in employees:
-            self.stdout.write(f"  - {emp.username} (ID: {emp.id})")
+        for info in employees_data:
+            self.stdout.write(
+                f"  - {info['employee_username']} (ID: {info['employee_id']})"
+            )
 
         self.stdout.write("\n")
 
-        # Estadísticas
-        total_attendance_reset = 0
-        total_details_deleted = 0
-        total_salary_deleted = 0
+        # Mostrar el reporte de cada empleado
+        for info in employees_data:
+            count_paid = info["attendance_to_reset"]
+            count_details = info["details_to_delete"]
+            count_salary = info["current_salary_records"]
 
-        if dry_run:
-            self.stdout.write(
-                self.style.WARNING(
-                    "⚠️  MODO DRY RUN - No se harán cambios reales\n"
-                )
-            )
-
-        # Procesar cada empleado
-        for employee in employees:
             self.stdout.write(
                 self.style.HTTP_INFO(
-                    f"\n--- Procesando: {employee.username} (ID: {employee.id}) ---"
+                    f"\n--- Procesando: {info['employee_username']} (ID: {info['employee_id']}) ---"
                 )
             )
-
-            # Contar asistencias marcadas como pagadas
-            paid_attendance = AttendanceRegister.objects.filter(
-                employee=employee,
-                pay_period=pay_period,
-                paid=True,
-            )
-            count_paid = paid_attendance.count()
-
-            # Contar detalles de asistencia
-            attendance_details = AttendanceDetail.objects.filter(
-                employee=employee,
-                pay_period=pay_period,
-            )
-            count_details = attendance_details.count()
-
-            # Contar registros de salario
-            salary_records = SalaryRecord.objects.filter(
-                employee=employee,
-                pay_period=pay_period,
-            )
-            count_salary = salary_records.count()
-
             self.stdout.write(f"  Asistencias marcadas como pagadas: {count_paid}")
             self.stdout.write(f"  Detalles de asistencia: {count_details}")
             self.stdout.write(f"  Registros de salario: {count_salary}")
@@ -177,55 +150,43 @@ class Command(BaseCommand):
                 continue
 
             # Mostrar información del registro de salario si existe
-            if count_salary > 0:
-                salary_record = salary_records.first()
+            salary_info = info.get("current_salary_info")
+            if salary_info:
                 self.stdout.write(
-                    f"  Salario actual registrado: ${salary_record.salary_to_pay}"
+                    f"  Salario actual registrado: ${salary_info['salary_to_pay']}"
                 )
                 self.stdout.write(
-                    f"  Horas totales: {salary_record.total_hours}"
+                    f"  Horas totales: {salary_info['total_hours']}"
                 )
                 self.stdout.write(
-                    f"  Fecha de cálculo: {salary_record.paid_at}"
+                    f"  Fecha de cálculo: {salary_info['calculated_at']}"
                 )
 
             if not dry_run:
-                with transaction.atomic():
-                    # Resetear asistencias
-                    if count_paid > 0:
-                        updated = paid_attendance.update(paid=False)
-                        total_attendance_reset += updated
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"  ✓ {updated} asistencias reseteadas a paid=False"
-                            )
+                if count_paid > 0:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"  ✓ {count_paid} asistencias reseteadas a paid=False"
                         )
-
-                    # Eliminar detalles de asistencia
-                    if count_details > 0:
-                        deleted_count = attendance_details.delete()[0]
-                        total_details_deleted += deleted_count
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"  ✓ {deleted_count} detalles de asistencia eliminados"
-                            )
+                    )
+                if count_details > 0:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"  ✓ {count_details} detalles de asistencia eliminados"
                         )
-
-                    # Eliminar registros de salario si se solicita
-                    if delete_salary and count_salary > 0:
-                        deleted_count = salary_records.delete()[0]
-                        total_salary_deleted += deleted_count
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"  ✓ {deleted_count} registros de salario eliminados"
-                            )
+                    )
+                if delete_salary and count_salary > 0:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"  ✓ {count_salary} registros de salario eliminados"
                         )
-                    elif count_salary > 0:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                "  ⚠️  Registro de salario NO eliminado (usa --delete-salary-records para eliminarlo)"
-                            )
+                    )
+                elif count_salary > 0:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            "  ⚠️  Registro de salario NO eliminado (usa --delete-salary-records para eliminarlo)"
                         )
+                    )
             else:
                 self.stdout.write(
                     self.style.WARNING(
@@ -244,6 +205,11 @@ class Command(BaseCommand):
                         )
                     )
 
+        summary = result["summary"]
+        total_attendance_reset = summary["attendance_reset"]
+        total_details_deleted = summary["details_deleted"]
+        total_salary_deleted = summary["salary_records_deleted"]
+
         # Resumen final
         self.stdout.write(
             self.style.WARNING(f"\n{'='*60}")
@@ -0,0 +1,114 @@
+"""
+Management command para correr la suite de benchmarks sobre carga sintética
+Los datos se generan dentro de una transacción que se revierte al terminar
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.suite import (
+    compare_results,
+    load_results,
+    resolve_scales,
+    run_suite,
+    save_results,
+)
+
+
+class Command(BaseCommand):
+    help = """
+    Mide el cálculo de planilla, los reportes y el marcaje del kiosco sobre
+    carga sintética a varias escalas y guarda los resultados en JSON.
+
+    Uso:
+       python manage.py run_benchmarks --scales=small,medium --output=bench.json
+       python manage.py run_benchmarks --employees=500 --periods=3
+       python manage.py run_benchmarks --compare=bench-main.json --output=bench.json
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="small,medium,large",
+            help="Escalas predefinidas separadas por coma (small, medium, large)",
+        )
+        parser.add_argument(
+            "--employees", type=int, help="Escala personalizada: cantidad de empleados"
+        )
+        parser.add_argument(
+            "--periods",
+            type=int,
+            default=2,
+            help="Escala personalizada: cantidad de períodos",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Repeticiones por escenario"
+        )
+        parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+        parser.add_argument(
+            "--compare", help="Resultados JSON de otra corrida para comparar"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.2,
+            help="Proporción a partir de la cual se marca una regresión (default 1.2)",
+        )
+
+    def handle(self, *args, **options):
+        if options["employees"]:
+            scales = [("custom", options["employees"], options["periods"])]
+        else:
+            try:
+                scales = resolve_scales(
+                    [name.strip() for name in options["scales"].split(",") if name.strip()]
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        baseline = load_results(options["compare"]) if options["compare"] else None
+
+        self.stdout.write(
+            self.style.WARNING(
+                f"BENCHMARKS (semilla {options['seed']}, mejor de {options['repeat']})"
+            )
+        )
+        results = run_suite(
+            scales,
+            seed=options["seed"],
+            repeat=options["repeat"],
+            on_result=self.write_result,
+        )
+
+        if options["output"]:
+            save_results(results, options["output"])
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['output']}"))
+
+        if baseline:
+            self.write_comparison(compare_results(baseline, results), options["threshold"])
+
+    def write_result(self, result):
+        self.stdout.write(
+            f"  {result['scale']:<7} {result['scenario']:<20} "
+            f"{result['best_ms']:9.1f} ms  (mediana {result['median_ms']:.1f})  "
+            f"{result['queries']:5d} consultas"
+        )
+
+    def write_comparison(self, comparison, threshold):
+        self.stdout.write(self.style.WARNING("COMPARACIÓN CON LA CORRIDA BASE"))
+        regressions = 0
+        for row in comparison:
+            line = (
+                f"  {row['scale']:<7} {row['scenario']:<20} "
+                f"{row['baseline_ms']:9.1f} -> {row['current_ms']:9.1f} ms  "
+                f"x{row['ratio']}  consultas {row['queries_delta']:+d}"
+            )
+            if row["ratio"] is not None and row["ratio"] >= threshold:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            self.stdout.write(self.style.ERROR(f"{regressions} escenario(s) más lentos"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Sin regresiones"))
@@ -0,0 +1,48 @@
+"""
+Management command para generar las fotos congeladas de períodos cerrados
+Útil para períodos cerrados antes de existir las fotos o después de un reset
+"""
+from django.core.management.base import BaseCommand, CommandError
+from payrolls.models import PayPeriod
+from payrolls.services.period_snapshot import build_period_snapshot
+
+
+class Command(BaseCommand):
+    help = """
+    Genera la foto de reportes de los períodos cerrados que no la tienen.
+
+    Uso:
+    1. Todos los períodos cerrados sin foto:
+       python manage.py snapshot_closed_periods
+
+    2. Regenerar la foto de un período específico:
+       python manage.py snapshot_closed_periods --period-id=1
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period-id",
+            type=int,
+            help="ID del período cerrado a congelar (regenera su foto si ya existe)",
+        )
+
+    def handle(self, *args, **options):
+        period_id = options.get("period_id")
+
+        if period_id:
+            try:
+                periods = [PayPeriod.objects.get(id=period_id, is_closed=True)]
+            except PayPeriod.DoesNotExist:
+                raise CommandError(f"No existe un período cerrado con ID {period_id}")
+        else:
+            periods = PayPeriod.objects.filter(
+                is_closed=True, snapshot__isnull=True
+            ).order_by("start_date")
+
+        count = 0
+        for period in periods:
+            build_period_snapshot(period)
+            count += 1
+            self.stdout.write(f"  ✓ {period.description}")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✓ {count} período(s) congelado(s)"))
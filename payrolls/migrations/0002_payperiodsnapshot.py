@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:16
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payrolls', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayPeriodSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('salary_records', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('attendance_details', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('stats', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('live_summary', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+                ('pay_period', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='payrolls.payperiod')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payrolls', '0002_payperiodsnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payperiod',
+            name='start_date',
+            field=models.DateField(db_index=True),
+        ),
+    ]
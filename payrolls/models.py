@@ -1,10 +1,13 @@
+from datetime import datetime, time, timedelta
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from employee.models import Employee
 from decimal import Decimal
 
 
 class PayPeriod(models.Model):
-    start_date = models.DateField()
+    start_date = models.DateField(db_index=True)
     end_date = models.DateField()
     is_closed = models.BooleanField(default=False)
     description = models.CharField(max_length=50, blank=True)
@@ -16,6 +19,34 @@ class PayPeriod(models.Model):
     def __str__(self):
         return self.description
 
+    def timestamp_range(self):
+        """
+        Inicio y fin (exclusivo) del período en la zona horaria actual.
+
+        Returns:
+            (datetime, datetime) de la medianoche del primer día y del día
+            siguiente al último
+        """
+        start = timezone.make_aware(datetime.combine(self.start_date, time.min))
+        end = timezone.make_aware(
+            datetime.combine(self.end_date + timedelta(days=1), time.min)
+        )
+        return start, end
+
+    def register_filter(self, prefix=""):
+        """
+        Filtro de las marcas cuya entrada cae en el período.
+
+        Equivale a timestamp_in__date entre start_date y end_date, pero compara
+        la columna directamente: así PostgreSQL puede usar índices y leer solo
+        las particiones mensuales del período.
+
+        Args:
+            prefix: Prefijo de la relación (ej. "attendanceregister__")
+        """
+        start, end = self.timestamp_range()
+        return {f"{prefix}timestamp_in__gte": start, f"{prefix}timestamp_in__lt": end}
+
 
 class SalaryRecord(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
@@ -71,3 +102,23 @@ class SalaryRecord(models.Model):
         self.salary_to_pay = self.gross_salary - lunch_deduction - self.other_deductions
 
         return self.salary_to_pay
+
+
+class PayPeriodSnapshot(models.Model):
+    """
+    Foto congelada de los reportes de un período cerrado. Se genera al cerrar
+    el período y se sirve tal cual: los datos de un período cerrado no cambian.
+    """
+
+    pay_period = models.OneToOneField(
+        PayPeriod, on_delete=models.CASCADE, related_name="snapshot"
+    )
+    salary_records = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    # Detalles diarios por empleado: {"<employee_id>": [...]}
+    attendance_details = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    stats = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    live_summary = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    generated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Foto de {self.pay_period}"
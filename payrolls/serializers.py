@@ -96,3 +96,15 @@ class CalculateAllSalariesSerializer(serializers.Serializer):
     other_deductions_description = serializers.CharField(
         max_length=255, required=False, allow_blank=True
     )
+
+
+class PayrollPreviewSerializer(serializers.Serializer):
+    period_id = serializers.IntegerField(required=False)
+    employee_id = serializers.IntegerField(required=False)
+    apply_night_factor = serializers.BooleanField(default=False)
+    other_deductions = serializers.DecimalField(
+        max_digits=10, decimal_places=2, required=False, default=0 # type: ignore
+    )
+    other_deductions_description = serializers.CharField(
+        max_length=255, required=False, allow_blank=True, default=""
+    )
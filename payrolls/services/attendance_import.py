@@ -0,0 +1,309 @@
+"""
+Importación masiva de marcas de un reloj marcador anterior.
+
+El CSV (referencia del empleado, entrada, salida) se valida y normaliza en
+Python mientras se envía con COPY a una tabla temporal. El resto es SQL por
+conjuntos: resolver empleados por username o PIN, asignar el período por la
+fecha local de entrada, descartar filas inválidas y hacer el upsert en
+AttendanceRegister con un UPDATE y un INSERT. Nada se crea fila por fila.
+"""
+import csv
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from attendance.models import AttendanceRegister
+from core.report_cache import ACTIVE_PERIOD_TAG, invalidate_tags, period_tag
+from employee.models import Employee
+from payrolls.models import PayPeriod
+
+STAGING_TABLE = "time_clock_import"
+
+REJECT_INVALID_ROW = "Fila incompleta"
+REJECT_INVALID_TIMESTAMP = "Fecha u hora inválida"
+REJECT_OUT_BEFORE_IN = "La salida no es posterior a la entrada"
+REJECT_UNKNOWN_EMPLOYEE = "Empleado no encontrado"
+REJECT_CLOSED_PERIOD = "La fecha pertenece a un período cerrado"
+REJECT_DUPLICATE = "Marca duplicada en el archivo"
+REJECT_OVERLAP = "El turno se cruza con otro turno del empleado"
+
+
+def parse_local_timestamp(value: str, local_tz) -> Optional[datetime]:
+    """
+    Convierte una fecha y hora del reloj a datetime con zona horaria.
+
+    Acepta ISO 8601 ("2025-01-10 08:00", "2025-01-10T08:00:00-06:00") y
+    "10/01/2025 08:00". Las horas sin zona se interpretan en hora local.
+
+    Returns:
+        datetime con zona horaria, o None si el valor está vacío
+
+    Raises:
+        ValueError: Si el valor no tiene un formato reconocido
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = datetime.strptime(value, "%d/%m/%Y %H:%M")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=local_tz)
+    return parsed
+
+
+def normalize_rows(
+    rows: Iterable[List[str]], rejects: List[Dict[str, Any]], first_line=1
+) -> Iterable[Tuple[int, str, datetime, Optional[datetime]]]:
+    """
+    Valida las filas del CSV y produce (línea, referencia, entrada, salida).
+    Las filas inválidas se agregan a rejects y no se producen.
+    """
+    local_tz = timezone.get_current_timezone()
+    for line, row in enumerate(rows, start=first_line):
+        if len(row) < 2 or not row[0].strip():
+            rejects.append({"line": line, "employee_ref": "", "reason": REJECT_INVALID_ROW})
+            continue
+
+        employee_ref = row[0].strip()
+        try:
+            timestamp_in = parse_local_timestamp(row[1], local_tz)
+            timestamp_out = (
+                parse_local_timestamp(row[2], local_tz) if len(row) > 2 else None
+            )
+        except ValueError:
+            timestamp_in = None
+            timestamp_out = None
+            reason = REJECT_INVALID_TIMESTAMP
+        else:
+            reason = None if timestamp_in else REJECT_INVALID_TIMESTAMP
+
+        if reason is None and timestamp_out is not None and timestamp_out <= timestamp_in:
+            reason = REJECT_OUT_BEFORE_IN
+
+        if reason:
+            rejects.append({"line": line, "employee_ref": employee_ref, "reason": reason})
+            continue
+
+        yield line, employee_ref, timestamp_in, timestamp_out
+
+
+def import_time_clock_csv(
+    lines: Iterable[str],
+    has_header=True,
+    mark_paid=False,
+    dry_run=False,
+    using=DEFAULT_DB_ALIAS,
+) -> Dict[str, Any]:
+    """
+    Importa un CSV de marcas (referencia del empleado, entrada, salida).
+
+    Las marcas con el mismo empleado y hora de entrada que una existente sin
+    pagar actualizan su salida; las demás se insertan. Solo funciona con
+    PostgreSQL.
+
+    Args:
+        lines: Líneas del archivo CSV (por ejemplo, el archivo abierto)
+        has_header: Si la primera línea es un encabezado
+        mark_paid: Si las marcas insertadas se guardan como pagadas (historial)
+        dry_run: Si es True se valida e informa sin guardar cambios
+
+    Returns:
+        {
+            "total": int,
+            "inserted": int,
+            "updated": int,
+            "unchanged": int,
+            "rejected": List[{"line": int, "employee_ref": str, "reason": str}],
+        }
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    registers = quote(AttendanceRegister._meta.db_table)
+    employees = quote(Employee._meta.db_table)
+    periods = quote(PayPeriod._meta.db_table)
+
+    reader = csv.reader(lines)
+    first_line = 1
+    if has_header:
+        next(reader, None)
+        first_line = 2
+
+    rejects: List[Dict[str, Any]] = []
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # Dentro de una transacción externa la tabla de una importación anterior
+        # todavía existe
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(
+            f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                line integer PRIMARY KEY,
+                employee_ref text NOT NULL,
+                timestamp_in timestamptz NOT NULL,
+                timestamp_out timestamptz,
+                employee_id bigint,
+                pay_period_id bigint,
+                reject_reason text
+            ) ON COMMIT DROP
+            """
+        )
+
+        with cursor.copy(
+            f"COPY {STAGING_TABLE} (line, employee_ref, timestamp_in, timestamp_out) FROM STDIN"
+        ) as copy:
+            for row in normalize_rows(reader, rejects, first_line):
+                copy.write_row(row)
+
+        # Resolver empleados: primero por username y luego por PIN
+        cursor.execute(
+            f"""
+            UPDATE {STAGING_TABLE} s SET employee_id = e.id
+            FROM {employees} e WHERE e.username = s.employee_ref
+            """
+        )
+        cursor.execute(
+            f"""
+            UPDATE {STAGING_TABLE} s SET employee_id = e.id
+            FROM {employees} e
+            WHERE s.employee_id IS NULL AND e.unique_pin = s.employee_ref
+            """
+        )
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} SET reject_reason = %s WHERE employee_id IS NULL",
+            [REJECT_UNKNOWN_EMPLOYEE],
+        )
+
+        # Período según la fecha local de entrada; los cerrados no se tocan
+        cursor.execute(
+            f"""
+            UPDATE {STAGING_TABLE} s
+            SET pay_period_id = p.id,
+                reject_reason = CASE WHEN p.is_closed THEN %s END
+            FROM {periods} p
+            WHERE s.reject_reason IS NULL
+              AND (s.timestamp_in AT TIME ZONE %s)::date BETWEEN p.start_date AND p.end_date
+            """,
+            [REJECT_CLOSED_PERIOD, settings.TIME_ZONE],
+        )
+
+        # Si una marca se repite en el archivo, gana la última línea
+        cursor.execute(
+            f"""
+            UPDATE {STAGING_TABLE} s SET reject_reason = %s
+            WHERE s.reject_reason IS NULL AND EXISTS (
+                SELECT 1 FROM {STAGING_TABLE} later
+                WHERE later.reject_reason IS NULL
+                  AND later.employee_id = s.employee_id
+                  AND later.timestamp_in = s.timestamp_in
+                  AND later.line > s.line
+            )
+            """,
+            [REJECT_DUPLICATE],
+        )
+
+        # Turnos cerrados que se cruzan con otro turno cerrado del empleado, ya
+        # guardado (salvo la marca que se actualiza) o de otra línea del archivo;
+        # la restricción de exclusión rechazaría toda la importación
+        cursor.execute(
+            f"""
+            UPDATE {STAGING_TABLE} s SET reject_reason = %s
+            WHERE s.reject_reason IS NULL AND s.timestamp_out IS NOT NULL AND (
+                EXISTS (
+                    SELECT 1 FROM {registers} r
+                    WHERE r.employee_id = s.employee_id
+                      AND r.timestamp_out IS NOT NULL
+                      AND r.timestamp_in <> s.timestamp_in
+                      AND r.shift_range && tstzrange(s.timestamp_in, s.timestamp_out, '[)')
+                )
+                OR EXISTS (
+                    SELECT 1 FROM {STAGING_TABLE} other
+                    WHERE other.reject_reason IS NULL
+                      AND other.employee_id = s.employee_id
+                      AND other.timestamp_out IS NOT NULL
+                      AND other.line <> s.line
+                      AND tstzrange(other.timestamp_in, other.timestamp_out, '[)')
+                          && tstzrange(s.timestamp_in, s.timestamp_out, '[)')
+                )
+            )
+            """,
+            [REJECT_OVERLAP],
+        )
+
+        cursor.execute(f"SELECT count(*) FROM {STAGING_TABLE} WHERE reject_reason IS NULL")
+        accepted = cursor.fetchone()[0]
+
+        # Upsert: actualizar la salida de marcas existentes sin pagar...
+        cursor.execute(
+            f"""
+            UPDATE {registers} r
+            SET timestamp_out = s.timestamp_out, version = r.version + 1
+            FROM {STAGING_TABLE} s
+            WHERE s.reject_reason IS NULL
+              AND r.employee_id = s.employee_id
+              AND r.timestamp_in = s.timestamp_in
+              AND NOT r.paid
+              AND r.timestamp_out IS DISTINCT FROM s.timestamp_out
+            """
+        )
+        updated = cursor.rowcount
+
+        # ...e insertar las que no existen
+        cursor.execute(
+            f"""
+            INSERT INTO {registers}
+                (employee_id, timestamp_in, timestamp_out, method, paid,
+                 pay_period_id, sync, version)
+            SELECT s.employee_id, s.timestamp_in, s.timestamp_out, 'nfc', %s,
+                   s.pay_period_id, false, 0
+            FROM {STAGING_TABLE} s
+            WHERE s.reject_reason IS NULL AND NOT EXISTS (
+                SELECT 1 FROM {registers} r
+                WHERE r.employee_id = s.employee_id AND r.timestamp_in = s.timestamp_in
+            )
+            """,
+            [mark_paid],
+        )
+        inserted = cursor.rowcount
+
+        cursor.execute(
+            f"""
+            SELECT line, employee_ref, reject_reason FROM {STAGING_TABLE}
+            WHERE reject_reason IS NOT NULL
+            """
+        )
+        rejects.extend(
+            {"line": line, "employee_ref": employee_ref, "reason": reason}
+            for line, employee_ref, reason in cursor.fetchall()
+        )
+
+        cursor.execute(
+            f"""
+            SELECT DISTINCT pay_period_id FROM {STAGING_TABLE}
+            WHERE reject_reason IS NULL AND pay_period_id IS NOT NULL
+            """
+        )
+        period_ids = [row[0] for row in cursor.fetchall()]
+
+        if dry_run:
+            transaction.set_rollback(True, using=using)
+        elif inserted or updated:
+            # Las señales no se disparan con SQL directo
+            invalidate_tags(
+                "attendance",
+                ACTIVE_PERIOD_TAG,
+                *(period_tag(period_id) for period_id in period_ids),
+            )
+
+    rejects.sort(key=lambda reject: reject["line"])
+    return {
+        "total": accepted + len(rejects),
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": accepted - inserted - updated,
+        "rejected": rejects,
+    }
@@ -0,0 +1,375 @@
+"""
+Particiones mensuales de AttendanceRegister en PostgreSQL.
+
+La tabla de marcas se particiona por rango de timestamp_in, una partición por
+mes calendario en la zona horaria del proyecto. Las consultas de un período
+filtran timestamp_in por rango (PayPeriod.register_filter), así PostgreSQL
+lee solo una o dos particiones.
+
+- La llave primaria pasa a ser (id, timestamp_in): PostgreSQL exige que
+  incluya la columna de partición. El id sigue siendo único por su secuencia.
+- Una partición DEFAULT recibe las marcas de meses sin partición para que el
+  kiosco nunca falle; al crear la partición del mes se mueven a ella.
+- Las particiones de meses ya pagados reciben un índice BRIN sobre
+  timestamp_in: ocupa unas pocas páginas porque las marcas llegan en orden.
+- Archivar es separar (DETACH) la partición: queda como tabla independiente
+  que se puede respaldar y borrar sin tocar la tabla activa.
+
+En otros motores la tabla no se particiona y estas funciones no hacen nada.
+"""
+from datetime import date, datetime, time
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from attendance.models import AttendanceRegister
+
+TABLE = AttendanceRegister._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+SEQUENCE = f"{TABLE}_id_seq"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def month_bounds(month: date) -> Tuple[datetime, datetime]:
+    """Medianoche local del primer día del mes y del primer día del siguiente"""
+    tz = timezone.get_default_timezone()
+    return (
+        timezone.make_aware(datetime.combine(month, time.min), tz),
+        timezone.make_aware(datetime.combine(add_months(month, 1), time.min), tz),
+    )
+
+
+def is_partitioned(using=DEFAULT_DB_ALIAS) -> bool:
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [TABLE],
+        )
+        return cursor.fetchone()[0]
+
+
+def list_partitions(using=DEFAULT_DB_ALIAS) -> List[dict]:
+    """
+    Particiones mensuales adjuntas, de la más antigua a la más nueva.
+
+    Returns:
+        Lista de {"name", "month", "rows", "has_brin"}; rows es la estimación
+        de las estadísticas de PostgreSQL
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, c.reltuples::bigint,
+                   EXISTS (
+                       SELECT 1 FROM pg_index i
+                       JOIN pg_class ic ON ic.oid = i.indexrelid
+                       JOIN pg_am am ON am.oid = ic.relam
+                       WHERE i.indrelid = c.oid AND am.amname = 'brin'
+                   )
+            FROM pg_inherits inh
+            JOIN pg_class c ON c.oid = inh.inhrelid
+            WHERE inh.inhparent = to_regclass(%s) AND c.relname <> %s
+            ORDER BY c.relname
+            """,
+            [TABLE, DEFAULT_PARTITION],
+        )
+        rows = cursor.fetchall()
+
+    prefix = f"{TABLE}_p"
+    return [
+        {
+            "name": name,
+            "month": datetime.strptime(name.removeprefix(prefix), "%Y_%m").date(),
+            "rows": max(estimate, 0),
+            "has_brin": has_brin,
+        }
+        for name, estimate, has_brin in rows
+        if name.startswith(prefix)
+    ]
+
+
+def _bounds_sql(connection, month):
+    lower, upper = month_bounds(month)
+    # Las cláusulas DDL no aceptan parámetros: se componen en el cliente
+    return connection.ops.compose_sql("FROM (%s) TO (%s)", [lower, upper])
+
+
+def _columns(cursor, table) -> str:
+    """Columnas que se pueden copiar con INSERT (sin las generadas)"""
+    cursor.execute(
+        """
+        SELECT attname FROM pg_attribute
+        WHERE attrelid = to_regclass(%s) AND attnum > 0
+          AND NOT attisdropped AND attgenerated = ''
+        ORDER BY attnum
+        """,
+        [table],
+    )
+    return ", ".join(row[0] for row in cursor.fetchall())
+
+
+def _copy_exclusion_constraints(cursor, name):
+    """
+    PostgreSQL no hereda las restricciones de exclusión a las particiones: la
+    nueva recibe las mismas que la partición DEFAULT
+    """
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype = 'x'
+        """,
+        [DEFAULT_PARTITION],
+    )
+    for constraint, definition in cursor.fetchall():
+        cursor.execute(
+            f"ALTER TABLE {name} ADD CONSTRAINT "
+            f"{constraint.replace(DEFAULT_PARTITION, name, 1)} {definition}"
+        )
+
+
+def create_partition(month: date, using=DEFAULT_DB_ALIAS) -> bool:
+    """
+    Crea la partición de un mes si no existe, moviendo a ella las marcas de ese
+    mes que hayan caído en la partición DEFAULT.
+
+    Returns:
+        True si se creó
+    """
+    connection = connections[using]
+    name = partition_name(month)
+    lower, upper = month_bounds(month)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE timestamp_in >= %s AND timestamp_in < %s)",
+            [lower, upper],
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF {TABLE} "
+                f"FOR VALUES {_bounds_sql(connection, month)}"
+            )
+            _copy_exclusion_constraints(cursor, name)
+            return True
+
+        # PostgreSQL no deja crear la partición si DEFAULT tiene filas de su rango
+        cursor.execute(
+            f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+            "INCLUDING GENERATED)"
+        )
+        _copy_exclusion_constraints(cursor, name)
+        columns = _columns(cursor, TABLE)
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE timestamp_in >= %s AND timestamp_in < %s
+                RETURNING *
+            )
+            INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+            """,
+            [lower, upper],
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES {_bounds_sql(connection, month)}"
+        )
+    return True
+
+
+def ensure_partitions(
+    months_ahead=None, today: Optional[date] = None, using=DEFAULT_DB_ALIAS
+) -> List[str]:
+    """
+    Crea las particiones desde el mes actual hasta months_ahead meses después.
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    if months_ahead is None:
+        months_ahead = getattr(settings, "ATTENDANCE_PARTITIONS_AHEAD", 3)
+    current = month_start(today or timezone.localdate())
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    return [partition_name(month) for month in months if create_partition(month, using)]
+
+
+def add_brin_indexes(
+    after_months=None, today: Optional[date] = None, using=DEFAULT_DB_ALIAS
+) -> List[str]:
+    """
+    Agrega un índice BRIN sobre timestamp_in a las particiones de hace más de
+    after_months meses, que ya no reciben marcas nuevas.
+
+    Returns:
+        Nombres de las particiones indexadas
+    """
+    if after_months is None:
+        after_months = getattr(settings, "ATTENDANCE_BRIN_AFTER_MONTHS", 2)
+    limit = add_months(month_start(today or timezone.localdate()), -after_months)
+
+    indexed = []
+    with connections[using].cursor() as cursor:
+        for partition in list_partitions(using):
+            if partition["month"] < limit and not partition["has_brin"]:
+                cursor.execute(
+                    f"CREATE INDEX {partition['name']}_brin ON {partition['name']} "
+                    "USING brin (timestamp_in)"
+                )
+                indexed.append(partition["name"])
+    return indexed
+
+
+def detach_partition(month: date, using=DEFAULT_DB_ALIAS) -> str:
+    """
+    Separa la partición de un mes para archivarla. Sus marcas dejan de verse en
+    AttendanceRegister y quedan en una tabla independiente con el mismo nombre.
+
+    Returns:
+        Nombre de la tabla separada
+
+    Raises:
+        ValueError: Si la partición no existe o tiene marcas sin pagar
+    """
+    name = partition_name(month)
+    if name not in {partition["name"] for partition in list_partitions(using)}:
+        raise ValueError(f"No existe la partición {name}")
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {name} WHERE NOT paid)")
+        if cursor.fetchone()[0]:
+            raise ValueError(f"La partición {name} tiene marcas sin pagar")
+        # Con una partición DEFAULT PostgreSQL no permite DETACH CONCURRENTLY;
+        # el bloqueo es breve porque la partición ya no recibe escrituras
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        # La tabla archivada no recibe marcas: no debe depender de la secuencia
+        cursor.execute(f"ALTER TABLE {name} ALTER COLUMN id DROP DEFAULT")
+    return name
+
+
+def _index_and_fk_definitions(cursor, table):
+    """Índices (menos la llave primaria) y llaves foráneas de una tabla"""
+    cursor.execute(
+        """
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = to_regclass(%s) AND NOT i.indisprimary
+        """,
+        [table],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype = 'f'
+        """,
+        [table],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _restore_indexes_and_fks(cursor, indexes, foreign_keys):
+    for definition in indexes:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+def partition_table(connection, months_ahead=None, today: Optional[date] = None):
+    """
+    Convierte la tabla de marcas existente en una tabla particionada por mes,
+    copiando las marcas mes por mes. Se usa desde la migración.
+    """
+    if connection.vendor != "postgresql" or is_partitioned(connection.alias):
+        return
+    if months_ahead is None:
+        months_ahead = getattr(settings, "ATTENDANCE_PARTITIONS_AHEAD", 3)
+
+    legacy = f"{TABLE}_legacy"
+    with connection.cursor() as cursor:
+        indexes, foreign_keys = _index_and_fk_definitions(cursor, TABLE)
+        cursor.execute(
+            f"SELECT min(timestamp_in), max(timestamp_in), COALESCE(max(id), 0) FROM {TABLE}"
+        )
+        first, last, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {legacy}")
+        cursor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {legacy}_pkey")
+        # La secuencia del id (identity) conserva su nombre al renombrar la tabla
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [legacy])
+        legacy_sequence = cursor.fetchone()[0]
+        if legacy_sequence:
+            cursor.execute(f"ALTER SEQUENCE {legacy_sequence} RENAME TO {legacy}_id_seq")
+
+        # Las columnas identity no se copian con LIKE: el id pasa a una secuencia
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            "PARTITION BY RANGE (timestamp_in)"
+        )
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute("SELECT setval(%s, %s, %s)", [SEQUENCE, max(max_id, 1), max_id > 0])
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+        columns = _columns(cursor, TABLE)
+        current = month_start(today or timezone.localdate())
+        month = month_start(timezone.localtime(first).date()) if first else current
+        end = add_months(current, months_ahead)
+        if last:
+            end = max(end, month_start(timezone.localtime(last).date()))
+        while month <= end:
+            create_partition(month, connection.alias)
+            lower, upper = month_bounds(month)
+            cursor.execute(
+                f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {legacy} "
+                "WHERE timestamp_in >= %s AND timestamp_in < %s",
+                [lower, upper],
+            )
+            month = add_months(month, 1)
+
+        cursor.execute(f"DROP TABLE {legacy}")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, timestamp_in)")
+        _restore_indexes_and_fks(cursor, indexes, foreign_keys)
+
+
+def unpartition_table(connection):
+    """Vuelve a una tabla normal con llave primaria id (reverso de la migración)"""
+    if connection.vendor != "postgresql" or not is_partitioned(connection.alias):
+        return
+
+    partitioned = f"{TABLE}_partitioned"
+    with connection.cursor() as cursor:
+        indexes, foreign_keys = _index_and_fk_definitions(cursor, TABLE)
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {partitioned}")
+        cursor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {partitioned}_pkey")
+
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        columns = _columns(cursor, TABLE)
+        cursor.execute(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {partitioned}")
+        cursor.execute(f"DROP TABLE {partitioned} CASCADE")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)")
+        _restore_indexes_and_fks(cursor, indexes, foreign_keys)
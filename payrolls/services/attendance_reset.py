@@ -0,0 +1,168 @@
+"""
+Servicio para resetear el estado 'paid' de asistencias de un período.
+
+Compartido por ResetAttendancePaidStatusView y el comando
+reset_attendance_paid_status. Los conteos por empleado se obtienen con un
+solo agregado agrupado por tabla y los cambios se aplican con tres
+sentencias masivas dentro de una única transacción.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count
+
+from attendance.models import AttendanceDetail, AttendanceRegister
+from core.report_cache import invalidate_period
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.services.payroll_run import lock_employees_period
+from payrolls.services.period_snapshot import discard_period_snapshot
+
+
+def _count_by_employee(queryset) -> Dict[int, int]:
+    """Cuenta filas por empleado con un único GROUP BY"""
+    return {
+        row["employee_id"]: row["count"]
+        for row in queryset.values("employee_id").annotate(count=Count("id"))
+    }
+
+
+def _salary_info_by_employee(queryset) -> Dict[int, Dict[str, Any]]:
+    """
+    Obtiene en una sola consulta el conteo de registros de salario por empleado
+    y los datos del primero de ellos (el que mostraba el flujo anterior).
+    """
+    salary_info: Dict[int, Dict[str, Any]] = {}
+    rows = queryset.order_by("id").values(
+        "employee_id", "salary_to_pay", "total_hours", "paid_at"
+    )
+    for row in rows:
+        info = salary_info.get(row["employee_id"])
+        if info is None:
+            salary_info[row["employee_id"]] = {"count": 1, "first": row}
+        else:
+            info["count"] += 1
+    return salary_info
+
+
+def reset_attendance_paid_status(
+    pay_period: PayPeriod,
+    employee_ids: Optional[Iterable[int]] = None,
+    delete_salary_records: bool = False,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Resetea las asistencias pagadas de un período para poder recalcular.
+
+    Args:
+        pay_period: Período de pago a resetear
+        employee_ids: IDs de empleados a procesar. Si es None se procesan todos
+            los empleados con asistencias en el período
+        delete_salary_records: Si se deben eliminar los SalaryRecord existentes
+        dry_run: Si es True solo se calcula el reporte, sin hacer cambios
+
+    Returns:
+        Dict con el reporte por empleado y el resumen. Cada empleado incluye
+        "current_salary_records" (sus SalaryRecord del período, se borren o no),
+        que usa el comando y la vista no expone:
+        {
+            "employees": List[Dict],
+            "summary": {
+                "employees_processed": int,
+                "attendance_reset": int,
+                "details_deleted": int,
+                "salary_records_deleted": int,
+            }
+        }
+    """
+    if employee_ids is None:
+        employees = Employee.objects.filter(
+            id__in=AttendanceRegister.objects.filter(
+                pay_period=pay_period
+            ).values("employee_id")
+        )
+    else:
+        employees = Employee.objects.filter(id__in=list(employee_ids))
+
+    with transaction.atomic():
+        employee_rows = list(employees.order_by("id").values("id", "username"))
+        ids = [row["id"] for row in employee_rows]
+
+        if not dry_run:
+            # Mismo bloqueo que el cálculo de planilla: los conteos del reporte
+            # son los que se resetean aunque otra ejecución esté pagando marcas
+            lock_employees_period(ids, pay_period.id)
+
+        paid_attendance = AttendanceRegister.objects.filter(
+            employee_id__in=ids, pay_period=pay_period, paid=True
+        )
+        attendance_details = AttendanceDetail.objects.filter(
+            employee_id__in=ids, pay_period=pay_period
+        )
+        salary_records = SalaryRecord.objects.filter(
+            employee_id__in=ids, pay_period=pay_period
+        )
+
+        # Un agregado agrupado por tabla en lugar de tres COUNT por empleado
+        paid_counts = _count_by_employee(paid_attendance)
+        detail_counts = _count_by_employee(attendance_details)
+        salary_info = _salary_info_by_employee(salary_records)
+
+        employees_data: List[Dict[str, Any]] = []
+        for row in employee_rows:
+            employee_id = row["id"]
+            count_paid = paid_counts.get(employee_id, 0)
+            count_details = detail_counts.get(employee_id, 0)
+            salary = salary_info.get(employee_id)
+            count_salary = salary["count"] if salary else 0
+
+            employee_info: Dict[str, Any] = {
+                "employee_id": employee_id,
+                "employee_username": row["username"],
+                "attendance_to_reset": count_paid,
+                "details_to_delete": count_details,
+                "salary_records_to_delete": count_salary if delete_salary_records else 0,
+                "current_salary_records": count_salary,
+            }
+
+            if salary:
+                first = salary["first"]
+                employee_info["current_salary_info"] = {
+                    "salary_to_pay": str(first["salary_to_pay"]),
+                    "total_hours": str(first["total_hours"]),
+                    "calculated_at": first["paid_at"].isoformat(),
+                }
+
+            if not dry_run:
+                if count_paid > 0:
+                    employee_info["attendance_reset"] = count_paid
+                if count_details > 0:
+                    employee_info["details_deleted"] = count_details
+                if delete_salary_records and count_salary > 0:
+                    employee_info["salary_records_deleted"] = count_salary
+
+            employees_data.append(employee_info)
+
+        total_attendance_reset = 0
+        total_details_deleted = 0
+        total_salary_deleted = 0
+
+        if not dry_run and ids:
+            # Tres sentencias masivas para todos los empleados
+            total_attendance_reset = paid_attendance.update(paid=False)
+            total_details_deleted = attendance_details.delete()[0]
+            if delete_salary_records:
+                total_salary_deleted = salary_records.delete()[0]
+            # La foto del período ya no refleja sus datos
+            discard_period_snapshot(pay_period.id)
+            invalidate_period(pay_period.id)
+
+    return {
+        "employees": employees_data,
+        "summary": {
+            "employees_processed": len(employees_data),
+            "attendance_reset": total_attendance_reset,
+            "details_deleted": total_details_deleted,
+            "salary_records_deleted": total_salary_deleted,
+        },
+    }
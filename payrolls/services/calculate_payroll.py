@@ -1,10 +1,14 @@
+import time as clock
 from datetime import datetime, time, timedelta
 from decimal import ROUND_DOWN, Decimal
 
+from django.db.models import Prefetch
 from django.utils import timezone
 from django.utils.timezone import localtime
 
 from attendance.models import AttendanceRegister
+from core.metrics import observe_rows
+from core.report_cache import invalidate_period
 from payrolls.models import PayPeriod
 from timers.models import Timer
 
@@ -126,165 +130,258 @@ def is_night_shift(start_time, end_time):
     return False
 
 
-def calculate_pay_to_go(
-    employee,
-    apply_night_factor=False,
-    period_id=None,
-    other_deductions=0,
-    other_deductions_description="",
-):
+MINIMUM_HOURS_FOR_LUNCH_DEDUCTION = 7
+
+
+def get_active_timers_by_day(employee):
     """
-    Calcula el pago para un empleado basado en las marcas registradas en la quincena actual o especificada
+    Obtiene los horarios activos del empleado indexados por día de la semana.
+    Evita consultar Timer por cada turno procesado.
+    """
+    return index_timers_by_day(
+        Timer.objects.filter(employee=employee, is_active=True).order_by("id")
+    )
 
-    Args:
-        employee: Objeto Employee
-        apply_night_factor: Booleano que indica si se debe aplicar el factor de pago nocturno
-        period_id: ID opcional del período de pago a calcular (si es None, usa el período activo)
-        other_deductions: Otras deducciones monetarias
-        other_deductions_description: Descripción de las otras deducciones
 
-    Returns:
-        Diccionario con las horas calculadas y salario a pagar
+def active_timers_prefetch():
+    """
+    Prefetch de los horarios activos en `employee.active_timers`: una sola
+    consulta para todos los empleados de un reporte
+    """
+    return Prefetch(
+        "timer_set",
+        queryset=Timer.objects.filter(is_active=True).order_by("id"),
+        to_attr="active_timers",
+    )
 
-    Note:
-        Las horas de almuerzo se calculan automáticamente como 1 hora por cada día trabajado
+
+def index_timers_by_day(timers):
+    """Horarios indexados por día de la semana; gana el primero de cada día"""
+    timers_by_day = {}
+    for timer in timers:
+        timers_by_day.setdefault(timer.day, timer)
+    return timers_by_day
+
+
+def compute_shift_hours(record, timers_by_day):
     """
-    if period_id:
-        try:
-            pay_period = PayPeriod.objects.get(id=period_id)
-        except PayPeriod.DoesNotExist:
-            return {"error": f"No existe un período de pago con ID {period_id}"}
-    else:
-        # Usar el período activo (no cerrado)
-        today = timezone.now().date()
-        pay_period = PayPeriod.objects.filter(
-            start_date__lte=today, end_date__gte=today, is_closed=False
-        ).first()
+    Calcula las horas trabajadas, nocturnas y regulares de un turno.
 
-        if not pay_period:
-            return {"error": "No hay quincena activa"}
+    Args:
+        record: AttendanceRegister con marca de salida
+        timers_by_day: Horarios activos del empleado por día de la semana
 
-    records = AttendanceRegister.objects.filter(
-        employee=employee,
-        timestamp_in__date__gte=pay_period.start_date,
-        timestamp_in__date__lte=pay_period.end_date,
-        paid=False,
-    ).order_by("timestamp_in")
+    Returns:
+        Diccionario con los datos del turno, o None si el turno no es válido
+    """
+    # Omitir registros sin marca de salida
+    if not record.timestamp_out:
+        return None
 
-    if not records.exists():
-        return {
-            "error": f"No hay registros sin pagar para el empleado en el período {pay_period.description}"
-        }
+    timestamp_in_local = localtime(record.timestamp_in)
+    timestamp_out_local = localtime(record.timestamp_out)
 
-    total_worked_hours = timedelta()
-    total_night_hours = timedelta()
+    # Truncar segundos y microsegundos (solo contar horas y minutos)
+    timestamp_in_local = truncate_seconds(timestamp_in_local)
+    timestamp_out_local = truncate_seconds(timestamp_out_local)
 
-    # Diccionario para almacenar detalles diarios de asistencia
-    attendance_details = {}
+    # Redondear entradas tempranas (7:XX AM -> 8:00 AM)
+    timestamp_in_local = round_early_entry(timestamp_in_local)
 
-    # Procesar cada registro de asistencia
-    for record in records:
-        # Omitir registros sin marca de salida
-        if not record.timestamp_out:
-            continue
+    # Validar orden correcto de tiempos
+    if timestamp_out_local <= timestamp_in_local:
+        return None
 
-        timestamp_in_local = localtime(record.timestamp_in)
-        timestamp_out_local = localtime(record.timestamp_out)
+    worked_hours = timestamp_out_local - timestamp_in_local
+    # Truncar el timedelta resultante también (por seguridad)
+    worked_hours = truncate_timedelta_to_minutes(worked_hours)
 
-        # CAMBIO 1: Truncar segundos y microsegundos (solo contar horas y minutos)
-        timestamp_in_local = truncate_seconds(timestamp_in_local)
-        timestamp_out_local = truncate_seconds(timestamp_out_local)
+    # Verificar si el turno es nocturno según Timer
+    timer = timers_by_day.get(timestamp_in_local.weekday())
 
-        # CAMBIO 2: Redondear entradas tempranas (7:XX AM -> 8:00 AM)
-        timestamp_in_local = round_early_entry(timestamp_in_local)
+    # Calcular horas nocturnas REALES (no binario)
+    # Si el timer está marcado como nocturno, todas las horas cuentan como nocturnas
+    if timer and timer.is_night_shift:
+        night_hours = worked_hours
+        regular_hours = timedelta(0)
+    else:
+        # Calcular solo las horas que realmente cayeron en horario nocturno
+        night_hours = calculate_night_hours(timestamp_in_local, timestamp_out_local)
+        regular_hours = worked_hours - night_hours
 
-        # Validar orden correcto de tiempos
-        if timestamp_out_local <= timestamp_in_local:
-            continue
+    return {
+        "work_date": timestamp_in_local.date(),
+        "time_in": timestamp_in_local.time(),
+        "time_out": timestamp_out_local.time(),
+        "worked_hours": worked_hours,
+        "night_hours": night_hours,
+        "regular_hours": regular_hours,
+    }
 
-        worked_hours = timestamp_out_local - timestamp_in_local
-        # Truncar el timedelta resultante también (por seguridad)
-        worked_hours = truncate_timedelta_to_minutes(worked_hours)
-        work_date = timestamp_in_local.date()
 
-        # Verificar si el turno es nocturno según Timer
-        day_of_week = timestamp_in_local.weekday()
-        timer = Timer.objects.filter(
-            employee=employee, day=day_of_week, is_active=True
-        ).first()
+def build_attendance_details(records, timers_by_day):
+    """
+    Agrupa los turnos por día de trabajo.
 
-        # Calcular horas nocturnas REALES (no binario)
-        # Si el timer está marcado como nocturno, todas las horas cuentan como nocturnas
-        if timer and timer.is_night_shift:
-            night_hours_for_day = worked_hours
-            regular_hours_for_day = timedelta(0)
-        else:
-            # Calcular solo las horas que realmente cayeron en horario nocturno
-            night_hours_for_day = calculate_night_hours(
-                timestamp_in_local, timestamp_out_local
-            )
-            regular_hours_for_day = worked_hours - night_hours_for_day
+    Returns:
+        Tupla (attendance_details, total_worked_hours, total_night_hours)
+    """
+    total_worked_hours = timedelta()
+    total_night_hours = timedelta()
+    attendance_details = {}
+
+    for record in records:
+        shift = compute_shift_hours(record, timers_by_day)
+        if shift is None:
+            continue
 
-        total_night_hours += night_hours_for_day
-        total_worked_hours += worked_hours
+        total_night_hours += shift["night_hours"]
+        total_worked_hours += shift["worked_hours"]
+        work_date = shift["work_date"]
 
         # Guardar detalles de este día
         if work_date not in attendance_details:
             attendance_details[work_date] = {
-                "time_in": timestamp_in_local.time(),
-                "time_out": timestamp_out_local.time(),
-                "regular_hours": regular_hours_for_day,
-                "night_hours": night_hours_for_day,
+                "time_in": shift["time_in"],
+                "time_out": shift["time_out"],
+                "regular_hours": shift["regular_hours"],
+                "night_hours": shift["night_hours"],
                 "extra_hours": timedelta(0),  # Se calculará después
                 "lunch_deduction": timedelta(0),  # Se aplicará proporcionalmente
             }
         else:
             # Si ya hay un registro para este día, actualizar las horas
-            attendance_details[work_date]["regular_hours"] += regular_hours_for_day
-            attendance_details[work_date]["night_hours"] += night_hours_for_day
+            details = attendance_details[work_date]
+            details["regular_hours"] += shift["regular_hours"]
+            details["night_hours"] += shift["night_hours"]
 
             # Actualizar hora de entrada/salida si es necesario
-            if timestamp_in_local.time() < attendance_details[work_date]["time_in"]:
-                attendance_details[work_date]["time_in"] = timestamp_in_local.time()
-            if timestamp_out_local.time() > attendance_details[work_date]["time_out"]:
-                attendance_details[work_date]["time_out"] = timestamp_out_local.time()
+            if shift["time_in"] < details["time_in"]:
+                details["time_in"] = shift["time_in"]
+            if shift["time_out"] > details["time_out"]:
+                details["time_out"] = shift["time_out"]
 
-    # Convertir a decimal para cálculos precisos
-    total_seconds = Decimal(total_worked_hours.total_seconds())
-    night_seconds = Decimal(total_night_hours.total_seconds())
+    return attendance_details, total_worked_hours, total_night_hours
 
-    # Convertir a horas
-    total_hours = total_seconds / Decimal(3600)
-    night_hours = night_seconds / Decimal(3600)
-
-    # Calcular horas regulares (limitadas al máximo biweekly) y extra
-    biweekly_limit = Decimal(employee.biweekly_hours)
-    regular_hours = min(total_hours, biweekly_limit)
-    extra_hours = max(Decimal("0"), total_hours - biweekly_limit)
 
-    # Limitar horas nocturnas al máximo de horas regulares
-    night_hours = min(night_hours, regular_hours)
+def apply_daily_lunch_deduction(attendance_details):
+    """
+    Marca la deducción de almuerzo de cada día: 1 hora por cada día donde
+    se trabajó >= 7 horas. Si el turno es menor a 7 horas, NO se rebaja almuerzo.
 
-    # CAMBIO 3: Calcular deducción de almuerzo automáticamente:
-    # Solo 1 hora por cada día donde se trabajó >= 7 horas
-    # Si el turno es menor a 7 horas, NO se rebaja almuerzo ese día
-    MINIMUM_HOURS_FOR_LUNCH_DEDUCTION = 7
+    Returns:
+        Número de días con deducción de almuerzo
+    """
     days_with_lunch_deduction = 0
 
-    for work_date, details in attendance_details.items():
-        # Calcular horas totales trabajadas ese día
+    for details in attendance_details.values():
         daily_worked_hours = (
             details["regular_hours"] + details["night_hours"]
         ).total_seconds() / 3600
 
         if daily_worked_hours >= MINIMUM_HOURS_FOR_LUNCH_DEDUCTION:
             days_with_lunch_deduction += 1
-            # Marcar que este día tiene deducción de almuerzo
             details["applies_lunch_deduction"] = True
+            details["lunch_deduction"] = timedelta(hours=1)
         else:
             details["applies_lunch_deduction"] = False
+            details["lunch_deduction"] = timedelta(0)
+
+    return days_with_lunch_deduction
+
+
+def split_period_hours(total_hours, night_hours, biweekly_hours):
+    """
+    Separa las horas del período en regulares (limitadas al máximo quincenal)
+    y extra, limitando las nocturnas al máximo de horas regulares.
+
+    Returns:
+        Tupla (regular_hours, night_hours, extra_hours)
+    """
+    biweekly_limit = Decimal(biweekly_hours)
+    regular_hours = min(total_hours, biweekly_limit)
+    extra_hours = max(Decimal("0"), total_hours - biweekly_limit)
+    night_hours = min(night_hours, regular_hours)
+    return regular_hours, night_hours, extra_hours
+
+
+def compute_pay(
+    salary_hour,
+    regular_hours,
+    night_hours,
+    extra_hours,
+    lunch_deduction_hours,
+    night_factor,
+    other_deductions,
+):
+    """
+    Calcula el salario bruto y el total a pagar.
+
+    Returns:
+        Tupla (gross_salary, salary_to_pay)
+    """
+    regular_pay = regular_hours * salary_hour
+
+    # Pago adicional por nocturnidad (si aplica)
+    night_premium = night_hours * salary_hour * (night_factor - Decimal("1.0"))
+
+    # Pago por horas extra (siempre 1.5x)
+    extra_pay = extra_hours * salary_hour * Decimal("1.5")
+
+    lunch_deduction = lunch_deduction_hours * salary_hour
+
+    gross_salary = regular_pay + night_premium + extra_pay
+    return gross_salary, gross_salary - lunch_deduction - other_deductions
+
+
+def detail_hours_to_decimal(details):
+    """Convierte los timedeltas de un día a horas decimales para AttendanceDetail"""
+    return {
+        field: Decimal(details[field].total_seconds()) / Decimal(3600)
+        for field in ("regular_hours", "night_hours", "extra_hours", "lunch_deduction")
+    }
+
+
+def compute_employee_pay(
+    employee,
+    records,
+    timers_by_day,
+    apply_night_factor=False,
+    other_deductions=0,
+    other_deductions_description="",
+):
+    """
+    Calcula horas y salario de un empleado a partir de sus marcas, sin escribir
+    nada en la base de datos.
+
+    Args:
+        employee: Objeto Employee
+        records: Marcas de asistencia ordenadas por timestamp_in
+        timers_by_day: Horarios activos del empleado por día de la semana
+        apply_night_factor: Si se aplica el factor de pago nocturno
+        other_deductions: Otras deducciones monetarias
+        other_deductions_description: Descripción de las otras deducciones
+
+    Returns:
+        Tupla (resultado, attendance_details) donde attendance_details contiene
+        los detalles diarios como timedeltas
+    """
+    # Procesar cada registro de asistencia agrupando los detalles por día
+    attendance_details, total_worked_hours, total_night_hours = (
+        build_attendance_details(records, timers_by_day)
+    )
 
-    lunch_deduction_hours = Decimal(days_with_lunch_deduction)
+    # Convertir a horas decimales para cálculos precisos
+    total_hours = Decimal(total_worked_hours.total_seconds()) / Decimal(3600)
+    night_hours = Decimal(total_night_hours.total_seconds()) / Decimal(3600)
+
+    # Calcular horas regulares (limitadas al máximo biweekly) y extra
+    regular_hours, night_hours, extra_hours = split_period_hours(
+        total_hours, night_hours, employee.biweekly_hours
+    )
+
+    # Deducción de almuerzo: 1 hora por cada día con >= 7 horas trabajadas
+    lunch_deduction_hours = Decimal(apply_daily_lunch_deduction(attendance_details))
 
     # Distribuir las horas extra a los detalles diarios si hay horas extra
     if extra_hours > 0:
@@ -310,80 +407,150 @@ def calculate_pay_to_go(
                 seconds=int(extra_seconds_for_day)
             )
 
-    # Aplicar deducción de almuerzo solo a los días que califican (>= 7 horas trabajadas)
-    if lunch_deduction_hours > 0:
-        # 1 hora de deducción por día que califica
-        for date, details in attendance_details.items():
-            if details.get("applies_lunch_deduction", False):
-                attendance_details[date]["lunch_deduction"] = timedelta(hours=1)
-            else:
-                attendance_details[date]["lunch_deduction"] = timedelta(0)
-
     # Calcular salario
-    regular_pay = regular_hours * employee.salary_hour
-
-    # Calcular pago adicional por nocturnidad (si aplica)
     night_factor = employee.night_shift_factor if apply_night_factor else Decimal("1.0")
-    night_premium = night_hours * employee.salary_hour * (night_factor - Decimal("1.0"))
+    other_deductions = Decimal(other_deductions)
+    gross_salary, total_pay = compute_pay(
+        employee.salary_hour,
+        regular_hours,
+        night_hours,
+        extra_hours,
+        lunch_deduction_hours,
+        night_factor,
+        other_deductions,
+    )
+
+    result = {
+        "total_hours": total_hours,
+        "regular_hours": regular_hours,
+        "night_hours": night_hours,
+        "extra_hours": extra_hours,
+        "night_shift_factor_applied": night_factor,
+        "gross_salary": gross_salary,
+        "lunch_deduction_hours": lunch_deduction_hours,
+        "other_deductions": other_deductions,
+        "other_deductions_description": other_deductions_description,
+        "salary_to_pay": total_pay,
+    }
+    return result, attendance_details
 
-    # Calcular pago por horas extra (siempre 1.5x)
-    extra_pay = extra_hours * employee.salary_hour * Decimal("1.5")
 
-    # Calcular deducciones
-    lunch_deduction = lunch_deduction_hours * employee.salary_hour
-    other_deductions = Decimal(other_deductions)
+def calculate_pay_to_go(
+    employee,
+    apply_night_factor=False,
+    period_id=None,
+    other_deductions=0,
+    other_deductions_description="",
+):
+    """
+    Calcula el pago para un empleado basado en las marcas registradas en la quincena actual o especificada
 
-    # Salario bruto antes de deducciones
-    gross_salary = regular_pay + night_premium + extra_pay
+    Args:
+        employee: Objeto Employee
+        apply_night_factor: Booleano que indica si se debe aplicar el factor de pago nocturno
+        period_id: ID opcional del período de pago a calcular (si es None, usa el período activo)
+        other_deductions: Otras deducciones monetarias
+        other_deductions_description: Descripción de las otras deducciones
+
+    Returns:
+        Diccionario con las horas calculadas y salario a pagar
+
+    Note:
+        Las horas de almuerzo se calculan automáticamente como 1 hora por cada día trabajado
+    """
+    if period_id:
+        try:
+            pay_period = PayPeriod.objects.get(id=period_id)
+        except PayPeriod.DoesNotExist:
+            return {"error": f"No existe un período de pago con ID {period_id}"}
+    else:
+        # Usar el período activo (no cerrado)
+        today = timezone.now().date()
+        pay_period = PayPeriod.objects.filter(
+            start_date__lte=today, end_date__gte=today, is_closed=False
+        ).first()
+
+        if not pay_period:
+            return {"error": "No hay quincena activa"}
 
-    # Total a pagar después de deducciones
-    total_pay = gross_salary - lunch_deduction - other_deductions
+    records = AttendanceRegister.objects.filter(
+        employee=employee,
+        **pay_period.register_filter(),
+        paid=False,
+    ).order_by("timestamp_in")
+
+    if not records.exists():
+        return {
+            "error": f"No hay registros sin pagar para el empleado en el período {pay_period.description}"
+        }
+
+    started = clock.perf_counter()
+    result, attendance_details = compute_employee_pay(
+        employee,
+        records,
+        get_active_timers_by_day(employee),
+        apply_night_factor=apply_night_factor,
+        other_deductions=other_deductions,
+        other_deductions_description=other_deductions_description,
+    )
+    # compute_employee_pay ya recorrió el queryset: len() no hace otra consulta
+    observe_rows(len(records), clock.perf_counter() - started)
 
     # Marcar los registros como pagados
     records.update(paid=True, pay_period=pay_period)
+    invalidate_period(pay_period.id)
 
     # Guardar los detalles de asistencia
-    from attendance.models import AttendanceDetail
+    save_attendance_details(employee, pay_period, attendance_details)
 
-    for work_date, details in attendance_details.items():
-        # Convertir timedeltas a decimal para guardar en el modelo
-        regular_hours_decimal = Decimal(
-            details["regular_hours"].total_seconds()
-        ) / Decimal(3600)
-        night_hours_decimal = Decimal(details["night_hours"].total_seconds()) / Decimal(
-            3600
-        )
-        extra_hours_decimal = Decimal(details["extra_hours"].total_seconds()) / Decimal(
-            3600
-        )
-        lunch_deduction_decimal = Decimal(
-            details["lunch_deduction"].total_seconds()
-        ) / Decimal(3600)
+    return result
+
+
+def save_attendance_details(employee, pay_period, attendance_details):
+    """
+    Crea o actualiza los AttendanceDetail del empleado en el período, uno por
+    día, con un número fijo de consultas sin importar cuántos días haya.
+
+    Args:
+        employee: Empleado
+        pay_period: Período de pago
+        attendance_details: Detalles por fecha (ver build_attendance_details)
+    """
+    from attendance.models import AttendanceDetail
 
-        # Crear o actualizar el detalle de asistencia
-        AttendanceDetail.objects.update_or_create(
+    existing = {
+        detail.work_date: detail
+        for detail in AttendanceDetail.objects.filter(
             employee=employee,
             pay_period=pay_period,
-            work_date=work_date,
-            defaults={
-                "time_in": details["time_in"],
-                "time_out": details["time_out"],
-                "regular_hours": regular_hours_decimal,
-                "night_hours": night_hours_decimal,
-                "extra_hours": extra_hours_decimal,
-                "lunch_deduction": lunch_deduction_decimal,
-            },
+            work_date__in=list(attendance_details),
         )
-
-    return {
-        "total_hours": total_hours,
-        "regular_hours": regular_hours,
-        "night_hours": night_hours,
-        "extra_hours": extra_hours,
-        "night_shift_factor_applied": night_factor,
-        "gross_salary": gross_salary,
-        "lunch_deduction_hours": lunch_deduction_hours,
-        "other_deductions": other_deductions,
-        "other_deductions_description": other_deductions_description,
-        "salary_to_pay": total_pay,
     }
+
+    to_update, to_create = [], []
+    for work_date, details in attendance_details.items():
+        # Convertir timedeltas a decimal para guardar en el modelo
+        values = {
+            "time_in": details["time_in"],
+            "time_out": details["time_out"],
+            **detail_hours_to_decimal(details),
+        }
+        detail = existing.get(work_date)
+        if detail is None:
+            to_create.append(
+                AttendanceDetail(
+                    employee=employee, pay_period=pay_period, work_date=work_date, **values
+                )
+            )
+            continue
+        for field, value in values.items():
+            setattr(detail, field, value)
+        to_update.append(detail)
+
+    if to_update:
+        AttendanceDetail.objects.bulk_update(
+            to_update,
+            ["time_in", "time_out", "regular_hours", "night_hours", "extra_hours", "lunch_deduction"],
+        )
+    if to_create:
+        AttendanceDetail.objects.bulk_create(to_create)
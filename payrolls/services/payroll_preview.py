@@ -0,0 +1,242 @@
+"""
+Vista previa del cálculo de planilla sin efectos secundarios.
+
+A diferencia de calculate_pay_to_go, no marca registros como pagados ni escribe
+AttendanceDetail. Se ejecuta dentro de una transacción de solo lectura (apta para
+una réplica) y memoriza los resultados en la caché usando como llave el período,
+el empleado y la versión de sus marcas.
+"""
+import hashlib
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, Max, Sum
+
+from attendance.models import AttendanceRegister
+from core.metrics import count_cache
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from payrolls.services.calculate_payroll import (
+    compute_employee_pay,
+    detail_hours_to_decimal,
+)
+from timers.models import Timer
+
+PREVIEW_CACHE_PREFIX = "payroll-preview"
+TWO_PLACES = Decimal("0.01")
+
+
+@contextmanager
+def read_only_transaction(using=DEFAULT_DB_ALIAS):
+    """
+    Abre una transacción de solo lectura. En PostgreSQL cualquier escritura
+    accidental falla y la consulta puede atenderse desde una réplica.
+    """
+    connection = connections[using]
+    starts_transaction = not connection.in_atomic_block
+
+    with transaction.atomic(using=using):
+        if starts_transaction and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+        yield
+
+
+def _unpaid_records(pay_period: PayPeriod, using):
+    return AttendanceRegister.objects.using(using).filter(
+        **pay_period.register_filter(),
+        paid=False,
+    )
+
+
+def _register_versions(records) -> Dict[int, tuple]:
+    """
+    Versión de las marcas de cada empleado en un solo agregado agrupado.
+    Cambia al crear, corregir o marcar salida en cualquiera de ellas.
+    """
+    return {
+        row["employee_id"]: (row["count"], row["last_id"], row["version_sum"])
+        for row in records.values("employee_id").annotate(
+            count=Count("id"),
+            last_id=Max("id"),
+            version_sum=Sum("version"),
+        )
+    }
+
+
+def _cache_key(pay_period, employee, register_version, timers, params) -> str:
+    timers_stamp = sorted(
+        (timer.day, timer.is_night_shift) for timer in timers.values()
+    )
+    raw = repr(
+        (
+            register_version,
+            employee.salary_hour,
+            employee.biweekly_hours,
+            employee.night_shift_factor,
+            timers_stamp,
+            params,
+        )
+    )
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"{PREVIEW_CACHE_PREFIX}:{pay_period.id}:{employee.id}:{digest}"
+
+
+def _serialize_preview(employee, result, attendance_details) -> Dict[str, Any]:
+    daily_details = []
+    for work_date in sorted(attendance_details):
+        details = attendance_details[work_date]
+        hours = detail_hours_to_decimal(details)
+        daily_details.append(
+            {
+                "work_date": work_date.isoformat(),
+                "time_in": details["time_in"].isoformat(),
+                "time_out": details["time_out"].isoformat(),
+                **{
+                    field: str(value.quantize(TWO_PLACES))
+                    for field, value in hours.items()
+                },
+            }
+        )
+
+    return {
+        "employee_id": employee.id,
+        "employee_username": employee.username,
+        "employee_full_name": f"{employee.first_name} {employee.last_name}",
+        **{
+            field: str(value.quantize(TWO_PLACES))
+            for field, value in result.items()
+            if isinstance(value, Decimal)
+        },
+        "other_deductions_description": result["other_deductions_description"],
+        "daily_details": daily_details,
+    }
+
+
+def preview_period_pay(
+    pay_period: PayPeriod,
+    employee_ids: Optional[List[int]] = None,
+    apply_night_factor=False,
+    other_deductions=0,
+    other_deductions_description="",
+    using=DEFAULT_DB_ALIAS,
+) -> List[Dict[str, Any]]:
+    """
+    Calcula la planilla de un período (o de algunos empleados) sin escribir nada.
+
+    Args:
+        pay_period: Período de pago a previsualizar
+        employee_ids: IDs de empleados a incluir. Si es None se incluyen todos
+            los que tienen marcas sin pagar en el período
+        apply_night_factor: Si se aplica el factor de pago nocturno
+        other_deductions: Otras deducciones monetarias
+        other_deductions_description: Descripción de las otras deducciones
+        using: Alias de base de datos a consultar
+
+    Returns:
+        Lista con el desglose por empleado, incluyendo los detalles diarios
+    """
+    params = (bool(apply_night_factor), str(other_deductions), other_deductions_description)
+    timeout = getattr(settings, "PAYROLL_PREVIEW_CACHE_TIMEOUT", 300)
+
+    with read_only_transaction(using):
+        records = _unpaid_records(pay_period, using)
+        if employee_ids is not None:
+            records = records.filter(employee_id__in=employee_ids)
+
+        versions = _register_versions(records)
+        if not versions:
+            return []
+
+        employees = {
+            employee.id: employee
+            for employee in Employee.objects.using(using).filter(id__in=versions)
+        }
+        timers_by_employee: Dict[int, Dict[int, Timer]] = {
+            employee_id: {} for employee_id in employees
+        }
+        for timer in (
+            Timer.objects.using(using)
+            .filter(employee_id__in=employees, is_active=True)
+            .order_by("id")
+        ):
+            timers_by_employee[timer.employee_id].setdefault(timer.day, timer)
+
+        keys = {
+            employee_id: _cache_key(
+                pay_period,
+                employee,
+                versions[employee_id],
+                timers_by_employee[employee_id],
+                params,
+            )
+            for employee_id, employee in employees.items()
+        }
+        cached = cache.get_many(list(keys.values()))
+
+        # Solo se leen las marcas de los empleados que no están en caché
+        missing = [
+            employee_id for employee_id, key in keys.items() if key not in cached
+        ]
+        count_cache("preview", hits=len(keys) - len(missing), misses=len(missing))
+        records_by_employee: Dict[int, list] = {employee_id: [] for employee_id in missing}
+        if missing:
+            for record in records.filter(employee_id__in=missing).order_by(
+                "employee_id", "timestamp_in"
+            ):
+                records_by_employee[record.employee_id].append(record)
+
+    previews = []
+    to_cache = {}
+    for employee_id in sorted(employees):
+        key = keys[employee_id]
+        preview = cached.get(key)
+        if preview is None:
+            employee = employees[employee_id]
+            result, attendance_details = compute_employee_pay(
+                employee,
+                records_by_employee[employee_id],
+                timers_by_employee[employee_id],
+                apply_night_factor=apply_night_factor,
+                other_deductions=other_deductions,
+                other_deductions_description=other_deductions_description,
+            )
+            preview = _serialize_preview(employee, result, attendance_details)
+            to_cache[key] = preview
+        previews.append(preview)
+
+    if to_cache:
+        cache.set_many(to_cache, timeout)
+
+    return previews
+
+
+def preview_employee_pay(
+    employee,
+    pay_period: PayPeriod,
+    apply_night_factor=False,
+    other_deductions=0,
+    other_deductions_description="",
+    using=DEFAULT_DB_ALIAS,
+) -> Dict[str, Any]:
+    """
+    Calcula el pago de un empleado sin escribir nada.
+    Devuelve {"error": ...} si no tiene marcas sin pagar en el período.
+    """
+    previews = preview_period_pay(
+        pay_period,
+        employee_ids=[employee.id],
+        apply_night_factor=apply_night_factor,
+        other_deductions=other_deductions,
+        other_deductions_description=other_deductions_description,
+        using=using,
+    )
+    if not previews:
+        return {
+            "error": f"No hay registros sin pagar para el empleado en el período {pay_period.description}"
+        }
+    return previews[0]
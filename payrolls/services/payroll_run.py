@@ -0,0 +1,145 @@
+"""
+Ejecución del cálculo de planilla con bloqueo por (empleado, período).
+
+Permite que varias peticiones o workers calculen empleados distintos en
+paralelo: las ejecuciones que se cruzan sobre el mismo empleado y período
+esperan a que la otra termine o lo omiten, en lugar de leer dos veces las
+mismas marcas sin pagar y competir por el SalaryRecord.
+"""
+from typing import Any, Dict
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from core.metrics import EMPLOYEE_CALCULATION_SECONDS
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.services.calculate_payroll import calculate_pay_to_go
+
+SALARY_RECORD_FIELDS = (
+    "total_hours",
+    "regular_hours",
+    "night_hours",
+    "extra_hours",
+    "night_shift_factor_applied",
+    "gross_salary",
+    "lunch_deduction_hours",
+    "other_deductions",
+    "other_deductions_description",
+    "salary_to_pay",
+)
+
+
+def lock_employee_period(employee_id, period_id, wait=True, using=DEFAULT_DB_ALIAS) -> bool:
+    """
+    Toma el bloqueo de (empleado, período) hasta el fin de la transacción actual.
+
+    En PostgreSQL usa un advisory lock de transacción; en otros motores bloquea
+    la fila del empleado. Debe llamarse dentro de transaction.atomic().
+
+    Args:
+        employee_id: ID del empleado
+        period_id: ID del período de pago
+        wait: Si es True espera a que se libere; si es False no espera
+
+    Returns:
+        True si se obtuvo el bloqueo, False si estaba tomado y wait=False
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        function = "pg_advisory_xact_lock" if wait else "pg_try_advisory_xact_lock"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {function}(%s, %s)", [employee_id, period_id])
+            return wait or bool(cursor.fetchone()[0])
+
+    locked = (
+        Employee.objects.using(using)
+        .select_for_update(skip_locked=not wait)
+        .filter(id=employee_id)
+        .values_list("id", flat=True)
+    )
+    return bool(list(locked))
+
+
+def lock_employees_period(employee_ids, period_id, using=DEFAULT_DB_ALIAS):
+    """
+    Toma en una sola consulta el bloqueo de (empleado, período) de varios
+    empleados, esperando a que se liberen. En orden de id para que dos
+    llamadas con empleados en común no se bloqueen entre sí.
+
+    Args:
+        employee_ids: IDs de los empleados
+        period_id: ID del período de pago
+    """
+    employee_ids = sorted(employee_ids)
+    if not employee_ids:
+        return
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(employee_id, %s) FROM "
+                "(SELECT unnest(%s::int[]) AS employee_id ORDER BY 1) AS ids",
+                [period_id, employee_ids],
+            )
+        return
+
+    list(
+        Employee.objects.using(using)
+        .select_for_update()
+        .filter(id__in=employee_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+@EMPLOYEE_CALCULATION_SECONDS.time()
+def calculate_and_save_salary(
+    employee,
+    pay_period: PayPeriod,
+    apply_night_factor=False,
+    other_deductions=0,
+    other_deductions_description="",
+    wait=True,
+) -> Dict[str, Any]:
+    """
+    Calcula el salario del empleado y crea o actualiza su SalaryRecord dentro de
+    una transacción que mantiene el bloqueo de (empleado, período).
+
+    Returns:
+        {"salary_record": SalaryRecord, "salary_data": Dict} si se calculó, o
+        {"error": str} si no había marcas sin pagar. Si wait=False y otra
+        ejecución tiene el bloqueo devuelve {"error": str, "locked": True}
+    """
+    with transaction.atomic():
+        if not lock_employee_period(employee.id, pay_period.id, wait=wait):
+            return {
+                "error": f"El empleado {employee.username} se está calculando en otra ejecución",
+                "locked": True,
+            }
+
+        salary_data = calculate_pay_to_go(
+            employee,
+            apply_night_factor=apply_night_factor,
+            period_id=pay_period.id,
+            other_deductions=other_deductions,
+            other_deductions_description=other_deductions_description,
+        )
+        if "error" in salary_data:
+            return salary_data
+
+        values = {field: salary_data[field] for field in SALARY_RECORD_FIELDS}
+        salary_record = SalaryRecord.objects.filter(
+            employee=employee, pay_period=pay_period
+        ).first()
+
+        if salary_record:
+            # Si ya existe, actualizamos los campos
+            for field, value in values.items():
+                setattr(salary_record, field, value)
+            salary_record.save()
+        else:
+            salary_record = SalaryRecord.objects.create(
+                employee=employee, pay_period=pay_period, **values
+            )
+
+    return {"salary_record": salary_record, "salary_data": salary_data}
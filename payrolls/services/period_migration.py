@@ -42,7 +42,7 @@ def migrate_current_shifts_to_new_period(
         timestamp_in__date=today,  # Solo de HOY
         timestamp_out__isnull=True,  # Sin salida (aún trabajando)
         paid=False,  # No pagados
-    )
+    ).select_related("employee", "nfc_token")
 
     migrated_records = []
 
@@ -54,7 +54,7 @@ def migrate_current_shifts_to_new_period(
             "employee_username": shift.employee.username,
             "timestamp_in": shift.timestamp_in.isoformat(),
             "method": shift.method,
-            "nfc_token": shift.nfc_token,
+            "nfc_token": shift.raw_nfc_token,
         }
 
         # Crear copia en el nuevo período
@@ -64,6 +64,7 @@ def migrate_current_shifts_to_new_period(
             timestamp_out=None,  # Sin salida
             method=shift.method,
             nfc_token=shift.nfc_token,
+            legacy_nfc_token=shift.legacy_nfc_token,
             paid=False,
             pay_period=new_period,  # Asignar al nuevo período
             sync=False,
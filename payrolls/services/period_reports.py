@@ -0,0 +1,267 @@
+"""
+Reportes de horas de un período: estadísticas del dashboard y resumen en
+tiempo real.
+
+Compartidos por AttendanceStatsView, LiveAttendanceSummaryView y la foto
+congelada que se guarda al cerrar un período.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List
+
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils.timezone import localtime
+
+from attendance.models import AttendanceRegister
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from payrolls.services.calculate_payroll import (
+    MINIMUM_HOURS_FOR_LUNCH_DEDUCTION,
+    active_timers_prefetch,
+    calculate_night_hours,
+    index_timers_by_day,
+    round_early_entry,
+    truncate_seconds,
+)
+
+
+def period_employees(pay_period: PayPeriod):
+    """Empleados con registros de asistencia dentro de las fechas del período"""
+    return Employee.objects.filter(
+        **pay_period.register_filter("attendanceregister__"),
+    ).distinct()
+
+
+def period_registers_prefetch(pay_period: PayPeriod, **filters) -> Prefetch:
+    """
+    Prefetch de las marcas del período en `employee.period_registers`,
+    ordenadas por entrada: una sola consulta para todos los empleados.
+
+    Args:
+        pay_period: Período de pago
+        **filters: Filtros adicionales sobre AttendanceRegister
+    """
+    return Prefetch(
+        "attendanceregister_set",
+        queryset=AttendanceRegister.objects.filter(
+            **pay_period.register_filter(), **filters
+        ).order_by("timestamp_in"),
+        to_attr="period_registers",
+    )
+
+
+def attendance_stats(pay_period: PayPeriod) -> Dict[str, Any]:
+    """
+    Calcula las estadísticas de horas trabajadas por empleado en el período.
+
+    Returns:
+        Dict con "pay_period" y "stats" (ordenadas por total de horas
+        descendente), listo para AttendanceStatsResponseSerializer
+    """
+    stats = []
+
+    for employee in period_employees(pay_period).prefetch_related(
+        active_timers_prefetch(),
+        # Registros completos (con entrada y salida)
+        period_registers_prefetch(pay_period, timestamp_out__isnull=False),
+    ):
+        timers_by_day = index_timers_by_day(employee.active_timers)
+        registers = employee.period_registers
+
+        total_worked_seconds = 0
+        regular_hours_seconds = 0
+        night_hours_seconds = 0
+        days_worked = 0
+        # Diccionario para acumular horas por día (para calcular deducción de almuerzo)
+        daily_hours = {}
+
+        for register in registers:
+            timestamp_in_local = localtime(register.timestamp_in)
+            timestamp_out_local = localtime(register.timestamp_out)
+
+            # Truncar segundos (solo contar horas y minutos)
+            timestamp_in_local = truncate_seconds(timestamp_in_local)
+            timestamp_out_local = truncate_seconds(timestamp_out_local)
+
+            # Redondear entradas tempranas (7:XX AM -> 8:00 AM)
+            timestamp_in_local = round_early_entry(timestamp_in_local)
+
+            # Verificar si es un día nuevo
+            day_date = timestamp_in_local.date()
+            if day_date not in daily_hours:
+                daily_hours[day_date] = 0
+                days_worked += 1
+
+            # Calcular tiempo trabajado en segundos (ya sin segundos/microsegundos)
+            worked_time = timestamp_out_local - timestamp_in_local
+            # Truncar a minutos completos
+            worked_seconds = int(worked_time.total_seconds() // 60) * 60
+            total_worked_seconds += worked_seconds
+            daily_hours[day_date] += worked_seconds
+
+            # Verificar si es turno nocturno o diurno
+            is_night = False
+
+            # Verificar si tiene un timer asignado para ese día
+            timer = timers_by_day.get(timestamp_in_local.weekday())
+
+            if timer and timer.is_night_shift:
+                is_night = True
+            # Verificar por rango de horas (noche: 10pm a 6am)
+            elif timestamp_in_local.hour >= 22 or timestamp_in_local.hour < 6:
+                is_night = True
+
+            # Determinar tipo de horas (regulares o nocturnas)
+            if is_night:
+                night_hours_seconds += worked_seconds
+            else:
+                regular_hours_seconds += worked_seconds
+
+        # Calcular deducción de almuerzo: 1 hora por cada día con >= 7 horas trabajadas
+        lunch_deduction_hours = 0
+        for day_date, seconds in daily_hours.items():
+            hours_worked_that_day = seconds / 3600
+            if hours_worked_that_day >= MINIMUM_HOURS_FOR_LUNCH_DEDUCTION:
+                lunch_deduction_hours += 1
+
+        # Convertir segundos a horas
+        total_hours = round(total_worked_seconds / 3600, 2)
+        regular_hours = round(regular_hours_seconds / 3600, 2)
+        night_hours = round(night_hours_seconds / 3600, 2)
+        # Horas netas = total - deducción de almuerzo
+        net_hours = round(total_hours - lunch_deduction_hours, 2)
+
+        stats.append(
+            {
+                "employee_id": employee.id,  # type: ignore
+                "employee_name": employee.get_full_name(),
+                "username": employee.username,
+                "days_worked": days_worked,
+                "total_hours": total_hours,
+                "regular_hours": regular_hours,
+                "night_hours": night_hours,
+                "lunch_deduction_hours": float(lunch_deduction_hours),
+                "net_hours": net_hours,
+                "target_biweekly_hours": float(employee.biweekly_hours),
+                "hourly_rate": float(employee.salary_hour),
+            }
+        )
+
+    # Ordenar por total de horas trabajadas (descendente)
+    stats = sorted(stats, key=lambda x: x["total_hours"], reverse=True)
+
+    return {
+        "pay_period": {
+            "id": pay_period.id,  # type: ignore
+            "description": pay_period.description,
+            "start_date": pay_period.start_date,
+            "end_date": pay_period.end_date,
+            "is_closed": pay_period.is_closed,
+        },
+        "stats": stats,
+    }
+
+
+def live_attendance_summary(
+    pay_period: PayPeriod, employees: Iterable[Employee]
+) -> List[Dict[str, Any]]:
+    """
+    Resume las horas acumuladas (pagadas y sin pagar) de cada empleado en el
+    período, sin calcular el salario final ni marcar registros.
+
+    Returns:
+        Lista con un dict por empleado que tiene registros en el período
+    """
+    employees_summary = []
+    employees = list(employees)
+    prefetch_related_objects(
+        employees,
+        active_timers_prefetch(),
+        # Todos los registros (pagados y no pagados) para ver el total real
+        period_registers_prefetch(pay_period),
+    )
+
+    for employee in employees:
+        timers_by_day = index_timers_by_day(employee.active_timers)
+        records = employee.period_registers
+
+        if not records:
+            continue
+
+        total_worked_hours = timedelta()
+        total_night_hours = timedelta()
+        pending_checkout = 0
+        days_worked = set()
+
+        for record in records:
+            if not record.timestamp_out:
+                pending_checkout += 1
+                continue
+
+            timestamp_in_local = localtime(record.timestamp_in)
+            timestamp_out_local = localtime(record.timestamp_out)
+
+            if timestamp_out_local <= timestamp_in_local:
+                continue
+
+            worked_hours = timestamp_out_local - timestamp_in_local
+            days_worked.add(timestamp_in_local.date())
+
+            # Calcular horas nocturnas
+            timer = timers_by_day.get(timestamp_in_local.weekday())
+
+            if timer and timer.is_night_shift:
+                night_hours_for_shift = worked_hours
+            else:
+                night_hours_for_shift = calculate_night_hours(
+                    timestamp_in_local, timestamp_out_local
+                )
+
+            total_night_hours += night_hours_for_shift
+            total_worked_hours += worked_hours
+
+        # Convertir a decimal
+        total_hours = Decimal(total_worked_hours.total_seconds()) / Decimal(3600)
+        night_hours = Decimal(total_night_hours.total_seconds()) / Decimal(3600)
+
+        # Calcular horas regulares y extra
+        biweekly_limit = Decimal(employee.biweekly_hours)
+        regular_hours = min(total_hours, biweekly_limit)
+        extra_hours = max(Decimal("0"), total_hours - biweekly_limit)
+        night_hours = min(night_hours, regular_hours)
+
+        # Estimar salario (sin deducciones)
+        regular_pay = regular_hours * employee.salary_hour
+        night_premium = (
+            night_hours * employee.salary_hour * (employee.night_shift_factor - Decimal("1.0"))
+        )
+        extra_pay = extra_hours * employee.salary_hour * Decimal("1.5")
+        estimated_salary = regular_pay + night_premium + extra_pay
+
+        employees_summary.append(
+            {
+                "employee_id": employee.id,
+                "employee_username": employee.username,
+                "employee_full_name": f"{employee.first_name} {employee.last_name}",
+                "total_hours": str(total_hours.quantize(Decimal("0.01"))),
+                "regular_hours": str(regular_hours.quantize(Decimal("0.01"))),
+                "night_hours": str(night_hours.quantize(Decimal("0.01"))),
+                "extra_hours": str(extra_hours.quantize(Decimal("0.01"))),
+                "estimated_salary": str(estimated_salary.quantize(Decimal("0.01"))),
+                "days_worked": len(days_worked),
+                "pending_checkout": pending_checkout,
+            }
+        )
+
+    return employees_summary
+
+
+def period_summary_header(pay_period: PayPeriod) -> Dict[str, Any]:
+    """Datos del período tal como los devuelve el resumen en tiempo real"""
+    return {
+        "id": pay_period.id,
+        "description": pay_period.description,
+        "start_date": pay_period.start_date.isoformat(),
+        "end_date": pay_period.end_date.isoformat(),
+        "is_closed": pay_period.is_closed,
+    }
@@ -0,0 +1,183 @@
+"""
+Fotos congeladas de los reportes de períodos cerrados.
+
+Al cerrar un período se guardan una sola vez los registros de salario, los
+detalles diarios por empleado, las estadísticas y el resumen de horas tal como
+los devuelven sus endpoints. Las consultas posteriores de ese período se
+responden con una lectura de una sola fila, sin recalcular ni serializar nada.
+
+Un período cerrado todavía puede cambiar: el reseteo de asistencias descarta
+la foto y snapshot_closed_periods la vuelve a generar. Por eso la respuesta
+no se marca immutable; el cliente revalida con el ETag, que cambia con cada
+foto. Las correcciones de marcas de períodos cerrados se rechazan.
+"""
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from django.db import transaction
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from attendance.models import AttendanceDetail
+from attendance.serializers import (
+    AttendanceDetailSerializer,
+    AttendanceStatsResponseSerializer,
+)
+from payrolls.models import PayPeriod, PayPeriodSnapshot, SalaryRecord
+from payrolls.serializers import SalaryRecordSerializer
+from payrolls.services.period_reports import (
+    attendance_stats,
+    live_attendance_summary,
+    period_employees,
+    period_summary_header,
+)
+
+# El cliente guarda la respuesta pero la revalida siempre; mientras la foto
+# no cambie la revalidación es un 304 sin cuerpo
+SNAPSHOT_CACHE_CONTROL = "private, no-cache"
+
+
+def build_period_snapshot(pay_period: PayPeriod) -> PayPeriodSnapshot:
+    """
+    Genera (o regenera) la foto de los reportes del período.
+
+    Args:
+        pay_period: Período de pago, normalmente recién cerrado
+
+    Returns:
+        PayPeriodSnapshot guardado
+    """
+    salary_records = SalaryRecordSerializer(
+        SalaryRecord.objects.filter(pay_period=pay_period)
+        .select_related("employee", "pay_period")
+        .order_by("id"),
+        many=True,
+    ).data
+
+    attendance_details = {}
+    details = (
+        AttendanceDetail.objects.filter(pay_period=pay_period)
+        .select_related("employee")
+        .order_by("employee_id", "work_date")
+    )
+    for detail in AttendanceDetailSerializer(details, many=True).data:
+        attendance_details.setdefault(str(detail["employee"]), []).append(detail)
+
+    stats = AttendanceStatsResponseSerializer(data=attendance_stats(pay_period))
+    stats.is_valid(raise_exception=True)
+
+    employees_summary = live_attendance_summary(
+        pay_period, period_employees(pay_period)
+    )
+
+    with transaction.atomic():
+        snapshot, _ = PayPeriodSnapshot.objects.update_or_create(
+            pay_period=pay_period,
+            defaults={
+                "salary_records": salary_records,
+                "attendance_details": attendance_details,
+                "stats": stats.validated_data,
+                "live_summary": {
+                    "period": period_summary_header(pay_period),
+                    "employees": employees_summary,
+                    "total_employees": len(employees_summary),
+                },
+            },
+        )
+    return snapshot
+
+
+def discard_period_snapshot(period_id) -> None:
+    """Elimina la foto del período para que sus reportes se vuelvan a calcular"""
+    PayPeriodSnapshot.objects.filter(pay_period_id=period_id).delete()
+
+
+def employee_attendance_details(details, request) -> list:
+    """Detalles diarios del empleado pedido dentro de la foto"""
+    return details.get(request.query_params.get("employee_id", ""), [])
+
+
+def employee_live_summary(summary, request) -> Optional[dict]:
+    """
+    Resumen de la foto filtrado por employee_id. Si el empleado no aparece se
+    devuelve None para que la vista responda como siempre (404 si no existe).
+    """
+    employee_id = request.query_params.get("employee_id")
+    if not employee_id:
+        return summary
+
+    employees = [
+        employee
+        for employee in summary["employees"]
+        if str(employee["employee_id"]) == employee_id
+    ]
+    if not employees:
+        return None
+    return {**summary, "employees": employees, "total_employees": len(employees)}
+
+
+def serve_period_snapshot(
+    field: str,
+    select: Optional[Callable[[Any, Any], Any]] = None,
+    when: Optional[Callable[[Any], bool]] = None,
+):
+    """
+    Decorador para el método get de una vista de reportes: si la petición trae
+    el period_id de un período con foto, responde desde la foto con su ETag;
+    si no, delega en la vista.
+
+    Args:
+        field: Campo de PayPeriodSnapshot con la respuesta
+        select: Función opcional (valor, request) -> datos a responder. Si
+            devuelve None la petición la atiende la vista
+        when: Función opcional (request) -> bool. Si devuelve False la foto
+            no se consulta (por ejemplo, listados paginados)
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            period_id = request.query_params.get("period_id", "")
+            row = None
+            if period_id.isdigit() and (when is None or when(request)):
+                # Una sola fila y solo la columna que se necesita
+                row = (
+                    PayPeriodSnapshot.objects.filter(pay_period_id=period_id)
+                    .values_list("id", "generated_at", field)
+                    .first()
+                )
+            if row is None:
+                return view_method(self, request, *args, **kwargs)
+
+            snapshot_id, generated_at, value = row
+            data = select(value, request) if select else value
+            if data is None:
+                return view_method(self, request, *args, **kwargs)
+
+            params = sorted(
+                (key, tuple(values)) for key, values in request.query_params.lists()
+            )
+            etag = quote_etag(
+                hashlib.md5(
+                    repr((snapshot_id, generated_at.isoformat(), field, params)).encode(
+                        "utf-8"
+                    )
+                ).hexdigest()
+            )
+
+            if_none_match = request.headers.get("If-None-Match")
+            if if_none_match and etag in parse_etags(if_none_match):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(data)
+
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(generated_at.timestamp())
+            response["Cache-Control"] = SNAPSHOT_CACHE_CONTROL
+            return response
+
+        return wrapper
+
+    return decorator
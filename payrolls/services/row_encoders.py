@@ -0,0 +1,131 @@
+"""
+Lectura rápida de listados sin serializers de DRF.
+
+Los campos calculados que SalaryRecordSerializer y AttendanceDetailSerializer
+obtienen fila por fila (nombre del empleado, nombre del período, horas netas,
+si hay horas nocturnas) se resuelven como anotaciones en la misma consulta y
+las filas de values() se codifican con funciones simples que producen
+exactamente la misma salida. Así un listado cuesta una consulta sin importar
+cuántas filas tenga y se evita la maquinaria de campos de DRF por fila.
+"""
+from typing import Any, Dict
+
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Coalesce, Concat, Trim
+from rest_framework import serializers
+
+# Mismo orden y nombres que SalaryRecordSerializer
+SALARY_RECORD_FIELDS = (
+    "id",
+    "employee",
+    "employee_name",
+    "total_hours",
+    "regular_hours",
+    "night_hours",
+    "extra_hours",
+    "net_hours",
+    "night_shift_factor_applied",
+    "gross_salary",
+    "lunch_deduction_hours",
+    "other_deductions",
+    "other_deductions_description",
+    "salary_to_pay",
+    "paid_at",
+    "sync",
+    "pay_period",
+    "period_name",
+    "has_night_hours",
+)
+
+SALARY_DECIMAL_FIELDS = (
+    "total_hours",
+    "regular_hours",
+    "night_hours",
+    "extra_hours",
+    "night_shift_factor_applied",
+    "gross_salary",
+    "lunch_deduction_hours",
+    "other_deductions",
+    "salary_to_pay",
+)
+
+# Mismo orden y nombres que AttendanceDetailSerializer
+ATTENDANCE_DETAIL_FIELDS = (
+    "id",
+    "employee",
+    "employee_name",
+    "pay_period",
+    "work_date",
+    "formatted_date",
+    "time_in",
+    "time_out",
+    "regular_hours",
+    "night_hours",
+    "extra_hours",
+    "lunch_deduction",
+)
+
+DETAIL_DECIMAL_FIELDS = ("regular_hours", "night_hours", "extra_hours", "lunch_deduction")
+
+_datetime_field = serializers.DateTimeField()
+
+
+def salary_record_values(queryset):
+    """Registros de salario como diccionarios con los campos calculados anotados"""
+    return queryset.annotate(
+        employee_name=Concat(
+            "employee__first_name", Value(" "), "employee__last_name"
+        ),
+        period_name=Coalesce(F("pay_period__description"), Value("")),
+        net_hours=F("total_hours") - F("lunch_deduction_hours"),
+        has_night_hours=ExpressionWrapper(
+            Q(night_hours__gt=0), output_field=BooleanField()
+        ),
+    ).values(*SALARY_RECORD_FIELDS)
+
+
+def encode_salary_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte una fila de salary_record_values al formato de
+    SalaryRecordSerializer.
+    """
+    for field in SALARY_DECIMAL_FIELDS:
+        row[field] = str(row[field])
+    row["net_hours"] = float(row["net_hours"])
+    row["paid_at"] = _datetime_field.to_representation(row["paid_at"])
+    row["has_night_hours"] = bool(row["has_night_hours"])
+    return row
+
+
+def attendance_detail_values(queryset):
+    """Detalles de asistencia como diccionarios con el nombre del empleado anotado"""
+    return queryset.annotate(
+        # Igual que Employee.get_full_name()
+        employee_name=Trim(
+            Concat("employee__first_name", Value(" "), "employee__last_name")
+        ),
+    ).values(*(field for field in ATTENDANCE_DETAIL_FIELDS if field != "formatted_date"))
+
+
+def encode_attendance_detail_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte una fila de attendance_detail_values al formato de
+    AttendanceDetailSerializer.
+    """
+    work_date = row["work_date"]
+    for field in DETAIL_DECIMAL_FIELDS:
+        row[field] = str(row[field])
+    return {
+        "id": row["id"],
+        "employee": row["employee"],
+        "employee_name": row["employee_name"],
+        "pay_period": row["pay_period"],
+        "work_date": work_date.isoformat(),
+        "formatted_date": work_date.strftime("%d/%m/%Y"),
+        "time_in": row["time_in"].isoformat(),
+        "time_out": row["time_out"].isoformat(),
+        "regular_hours": row["regular_hours"],
+        "night_hours": row["night_hours"],
+        "extra_hours": row["extra_hours"],
+        "lunch_deduction": row["lunch_deduction"],
+    }
@@ -0,0 +1,52 @@
+"""
+Exportación en streaming de los registros de salario de un período.
+
+Las filas se leen con values() en bloques (iterator con chunk_size) y se
+codifican una por una, así que la memoria no crece con el tamaño del período
+y el primer byte sale en cuanto llega el primer bloque. Las filas usan los
+mismos codificadores que el listado de registros (row_encoders).
+"""
+import csv
+import json
+from typing import Any, Dict, Iterator
+
+from payrolls.models import SalaryRecord
+from payrolls.services.row_encoders import (
+    SALARY_RECORD_FIELDS as SALARY_EXPORT_FIELDS,
+    encode_salary_row,
+    salary_record_values,
+)
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_salary_rows(period_id, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Filas codificadas de los registros de salario del período, por bloques"""
+    queryset = salary_record_values(
+        SalaryRecord.objects.filter(pay_period_id=period_id).order_by("id")
+    )
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield encode_salary_row(row)
+
+
+class _Echo:
+    """Buffer de escritura que devuelve lo escrito, para csv.writer en streaming"""
+
+    def write(self, value):
+        return value
+
+
+def stream_salary_csv(period_id, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Líneas CSV (con encabezado) de los registros de salario del período"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(SALARY_EXPORT_FIELDS)
+    for row in iter_salary_rows(period_id, chunk_size):
+        yield writer.writerow([row[field] for field in SALARY_EXPORT_FIELDS])
+
+
+def stream_salary_ndjson(period_id, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Un objeto JSON por línea por cada registro de salario del período"""
+    for row in iter_salary_rows(period_id, chunk_size):
+        yield json.dumps(
+            {field: row[field] for field in SALARY_EXPORT_FIELDS}, ensure_ascii=False
+        ) + "\n"
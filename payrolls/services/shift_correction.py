@@ -0,0 +1,212 @@
+"""
+Servicio para corregir marcas de asistencia ya registradas.
+
+En lugar del flujo resetear + recalcular todo el período, solo se recalculan
+los AttendanceDetail de los días afectados y el SalaryRecord del empleado se
+ajusta a partir de los valores diarios ya almacenados.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.timezone import localtime
+
+from attendance.models import AttendanceDetail, AttendanceRegister
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.signals import invalidate_attendance_dates
+from payrolls.services.shift_ranges import OverlappingShift, is_overlap_violation
+from payrolls.services.calculate_payroll import (
+    apply_daily_lunch_deduction,
+    build_attendance_details,
+    compute_pay,
+    detail_hours_to_decimal,
+    get_active_timers_by_day,
+    split_period_hours,
+)
+
+
+class RegisterVersionConflict(Exception):
+    """La marca fue modificada por otra petición desde que se leyó"""
+
+
+def recalculate_work_dates(employee, pay_period: PayPeriod, work_dates: Iterable) -> None:
+    """
+    Recalcula los AttendanceDetail de los días indicados a partir de las marcas
+    pagadas del empleado en esos días. Los días sin turnos válidos se eliminan.
+    """
+    work_dates = set(work_dates)
+    records = AttendanceRegister.objects.filter(
+        employee=employee,
+        pay_period=pay_period,
+        paid=True,
+        timestamp_in__date__in=work_dates,
+    ).order_by("timestamp_in")
+
+    attendance_details, _, _ = build_attendance_details(
+        records, get_active_timers_by_day(employee)
+    )
+    apply_daily_lunch_deduction(attendance_details)
+
+    AttendanceDetail.objects.filter(
+        employee=employee,
+        pay_period=pay_period,
+        work_date__in=work_dates - set(attendance_details),
+    ).delete()
+
+    for work_date, details in attendance_details.items():
+        hours = detail_hours_to_decimal(details)
+        # Las horas extra se redistribuyen luego en refresh_salary_record
+        hours.pop("extra_hours")
+        AttendanceDetail.objects.update_or_create(
+            employee=employee,
+            pay_period=pay_period,
+            work_date=work_date,
+            defaults={
+                "time_in": details["time_in"],
+                "time_out": details["time_out"],
+                **hours,
+            },
+        )
+
+
+def refresh_salary_record(employee, pay_period: PayPeriod):
+    """
+    Ajusta el SalaryRecord del empleado usando los AttendanceDetail guardados,
+    sin volver a recorrer las marcas del período.
+
+    Las horas extra se redistribuyen proporcionalmente entre los días y se
+    conservan el factor nocturno y las otras deducciones ya aplicadas.
+
+    Returns:
+        El SalaryRecord actualizado, o None si el empleado no tiene uno
+    """
+    details = list(
+        AttendanceDetail.objects.filter(employee=employee, pay_period=pay_period)
+    )
+
+    daily_totals = {
+        detail.pk: detail.regular_hours + detail.night_hours for detail in details
+    }
+    total_hours = sum(daily_totals.values(), Decimal("0"))
+    night_hours = sum((detail.night_hours for detail in details), Decimal("0"))
+    lunch_deduction_hours = sum(
+        (detail.lunch_deduction for detail in details), Decimal("0")
+    )
+
+    regular_hours, night_hours, extra_hours = split_period_hours(
+        total_hours, night_hours, employee.biweekly_hours
+    )
+
+    for detail in details:
+        if extra_hours > 0:
+            proportion = daily_totals[detail.pk] / total_hours
+            detail.extra_hours = (proportion * extra_hours).quantize(Decimal("0.01"))
+        else:
+            detail.extra_hours = Decimal("0")
+    AttendanceDetail.objects.bulk_update(details, ["extra_hours"])
+
+    salary_record = SalaryRecord.objects.filter(
+        employee=employee, pay_period=pay_period
+    ).first()
+    if not salary_record:
+        return None
+
+    gross_salary, salary_to_pay = compute_pay(
+        employee.salary_hour,
+        regular_hours,
+        night_hours,
+        extra_hours,
+        lunch_deduction_hours,
+        salary_record.night_shift_factor_applied,
+        salary_record.other_deductions,
+    )
+
+    salary_record.total_hours = total_hours
+    salary_record.regular_hours = regular_hours
+    salary_record.night_hours = night_hours
+    salary_record.extra_hours = extra_hours
+    salary_record.lunch_deduction_hours = lunch_deduction_hours
+    salary_record.gross_salary = gross_salary
+    salary_record.salary_to_pay = salary_to_pay
+    salary_record.save()
+    return salary_record
+
+
+def correct_attendance_register(
+    register: AttendanceRegister,
+    timestamp_in,
+    timestamp_out,
+    expected_version: int,
+) -> Dict[str, Any]:
+    """
+    Corrige las marcas de entrada/salida de un registro con control de
+    concurrencia optimista.
+
+    Si el registro ya fue pagado, recalcula únicamente los días afectados
+    (el día original y el nuevo) y ajusta el SalaryRecord del empleado.
+
+    Args:
+        register: Registro de asistencia a corregir
+        timestamp_in: Nueva marca de entrada
+        timestamp_out: Nueva marca de salida (puede ser None)
+        expected_version: Versión del registro que leyó el cliente
+
+    Returns:
+        Dict con el registro actualizado y los días recalculados:
+        {
+            "register": AttendanceRegister,
+            "recalculated_dates": List[date],
+            "salary_record": SalaryRecord | None
+        }
+
+    Raises:
+        RegisterVersionConflict: Si el registro cambió desde expected_version
+        OverlappingShift: Si el turno corregido se cruza con otro turno cerrado
+    """
+    previous_date = localtime(register.timestamp_in).date()
+
+    with transaction.atomic():
+        try:
+            updated = AttendanceRegister.objects.filter(
+                pk=register.pk, version=expected_version
+            ).update(
+                timestamp_in=timestamp_in,
+                timestamp_out=timestamp_out,
+                version=F("version") + 1,
+            )
+        except IntegrityError as e:
+            if is_overlap_violation(e):
+                raise OverlappingShift(
+                    f"El registro {register.pk} se cruzaría con otro turno del empleado"
+                )
+            raise
+        if not updated:
+            raise RegisterVersionConflict(
+                f"El registro {register.pk} fue modificado por otra petición"
+            )
+
+        register.refresh_from_db()
+        invalidate_attendance_dates(
+            [previous_date, localtime(register.timestamp_in).date()],
+            register.pay_period_id,
+        )
+
+        recalculated_dates = []
+        salary_record = None
+        if register.paid and register.pay_period_id:
+            recalculated_dates = sorted(
+                {previous_date, localtime(register.timestamp_in).date()}
+            )
+            recalculate_work_dates(
+                register.employee, register.pay_period, recalculated_dates
+            )
+            salary_record = refresh_salary_record(
+                register.employee, register.pay_period
+            )
+
+    return {
+        "register": register,
+        "recalculated_dates": recalculated_dates,
+        "salary_record": salary_record,
+    }
@@ -0,0 +1,246 @@
+"""
+Turnos de AttendanceRegister como rangos de tiempo en PostgreSQL.
+
+La columna generada shift_range = tstzrange(timestamp_in, timestamp_out, '[)')
+tiene un índice GiST, así que "quién estaba en turno a las 02:15" y "qué
+turnos se cruzan con este intervalo" son búsquedas en el índice en lugar de
+recorrer la tabla. Un turno abierto (sin salida) es un rango sin límite
+superior; una marca con la salida antes de la entrada no tiene rango.
+
+Una restricción de exclusión impide que un empleado tenga dos turnos cerrados
+que se cruzan. Los turnos abiertos quedan fuera: una salida olvidada no debe
+bloquear las marcas siguientes del kiosco (find_overlapping_shifts los
+reporta). Con la tabla particionada PostgreSQL no admite la restricción en la
+tabla padre, así que cada partición tiene la suya: un cruce entre dos turnos
+de meses distintos solo lo detecta la auditoría.
+
+En otros motores no hay columna ni restricción y los helpers filtran por
+timestamp_in/timestamp_out con el mismo resultado.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections
+from django.db.models import BooleanField, F, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from attendance.models import AttendanceRegister
+from payrolls.models import PayPeriod
+
+TABLE = AttendanceRegister._meta.db_table
+COLUMN = "shift_range"
+INDEX = f"{TABLE}_{COLUMN}_gist"
+CONSTRAINT_SUFFIX = "no_overlap"
+
+# SQLSTATE de PostgreSQL para exclusion_violation
+EXCLUSION_VIOLATION = "23P01"
+
+# employee_id como rango de un solo valor: el operador = de GiST sobre rangos
+# evita depender de la extensión btree_gist
+EXCLUSION_DEFINITION = (
+    f"EXCLUDE USING gist (int8range(employee_id, employee_id, '[]') WITH =, {COLUMN} WITH &&) "
+    "WHERE (timestamp_out IS NOT NULL)"
+)
+
+
+class OverlappingShift(Exception):
+    """El turno se cruza con otro turno cerrado del mismo empleado"""
+
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    """True si el error viene de la restricción de exclusión de turnos"""
+    return getattr(error.__cause__, "sqlstate", None) == EXCLUSION_VIOLATION
+
+
+def _uses_ranges(queryset: QuerySet) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def _range_condition(sql, params) -> RawSQL:
+    quote = connections[DEFAULT_DB_ALIAS].ops.quote_name
+    return RawSQL(
+        sql.format(column=f"{quote(TABLE)}.{quote(COLUMN)}"),
+        params,
+        output_field=BooleanField(),
+    )
+
+
+def on_shift_at(instant: datetime, queryset: Optional[QuerySet] = None) -> QuerySet:
+    """
+    Marcas cuyo turno incluye el instante (entrada <= instante < salida).
+    Los turnos abiertos cuentan desde su entrada.
+
+    Args:
+        instant: Instante con zona horaria
+        queryset: Marcas de partida (default todas)
+    """
+    queryset = AttendanceRegister.objects.all() if queryset is None else queryset
+    if _uses_ranges(queryset):
+        # La condición sobre timestamp_in descarta las particiones posteriores
+        return queryset.filter(
+            _range_condition("{column} @> %s::timestamptz", (instant,)),
+            timestamp_in__lte=instant,
+        )
+    return queryset.filter(
+        Q(timestamp_out__isnull=True) | Q(timestamp_out__gt=instant),
+        timestamp_in__lte=instant,
+    )
+
+
+def overlapping(
+    start: datetime, end: datetime, queryset: Optional[QuerySet] = None
+) -> QuerySet:
+    """
+    Marcas cuyo turno se cruza con el intervalo [start, end).
+
+    Args:
+        start: Inicio del intervalo
+        end: Fin del intervalo (excluido)
+        queryset: Marcas de partida (default todas)
+    """
+    queryset = AttendanceRegister.objects.all() if queryset is None else queryset
+    if _uses_ranges(queryset):
+        return queryset.filter(
+            _range_condition("{column} && tstzrange(%s, %s, '[)')", (start, end)),
+            timestamp_in__lt=end,
+        )
+    return queryset.filter(
+        Q(timestamp_out__isnull=True) | Q(timestamp_out__gt=start),
+        Q(timestamp_out__isnull=True) | Q(timestamp_out__gte=F("timestamp_in")),
+        timestamp_in__lt=end,
+    )
+
+
+def headcount_at(instant: datetime, queryset: Optional[QuerySet] = None) -> int:
+    """Cantidad de empleados en turno en el instante"""
+    return on_shift_at(instant, queryset).values("employee").distinct().count()
+
+
+def find_overlapping_shifts(
+    pay_period: Optional[PayPeriod] = None,
+    include_open=True,
+    using=DEFAULT_DB_ALIAS,
+) -> List[Tuple[int, int, int]]:
+    """
+    Auditoría de turnos que se cruzan, por empleado.
+
+    Args:
+        pay_period: Solo turnos que empiezan en el período (default todos)
+        include_open: Si se incluyen los turnos sin salida
+        using: Alias de base de datos
+
+    Returns:
+        Lista de (id del primer turno, id del segundo, employee_id), ordenada
+    """
+    queryset = AttendanceRegister.objects.using(using)
+    if pay_period:
+        queryset = queryset.filter(**pay_period.register_filter())
+    if not include_open:
+        queryset = queryset.filter(timestamp_out__isnull=False)
+
+    if not _uses_ranges(queryset):
+        return _find_overlaps_in_python(queryset)
+
+    sql, params = queryset.values("id").query.sql_with_params()
+    quote = connections[using].ops.quote_name
+    table = quote(TABLE)
+    open_filter = "" if include_open else "AND b.timestamp_out IS NOT NULL"
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT a.id, b.id, a.employee_id
+            FROM {table} a
+            JOIN {table} b
+              ON int8range(b.employee_id, b.employee_id, '[]')
+                 = int8range(a.employee_id, a.employee_id, '[]')
+             AND b.{COLUMN} && a.{COLUMN}
+             AND b.id <> a.id
+             {open_filter}
+            WHERE a.id IN ({sql})
+            """,
+            params,
+        )
+        # Si ambos turnos están en el filtro el par aparece dos veces
+        return sorted({(min(a, b), max(a, b), employee) for a, b, employee in cursor.fetchall()})
+
+
+def _find_overlaps_in_python(queryset: QuerySet) -> List[Tuple[int, int, int]]:
+    by_employee = defaultdict(list)
+    for register in queryset.order_by("timestamp_in").only(
+        "id", "employee_id", "timestamp_in", "timestamp_out"
+    ):
+        if register.timestamp_out is None or register.timestamp_out >= register.timestamp_in:
+            by_employee[register.employee_id].append(register)
+
+    pairs = []
+    for employee_id, registers in by_employee.items():
+        for index, first in enumerate(registers):
+            for second in registers[index + 1 :]:
+                if first.timestamp_out is not None and second.timestamp_in >= first.timestamp_out:
+                    break
+                pairs.append((*sorted((first.id, second.id)), employee_id))
+    return sorted(pairs)
+
+
+def _constrained_tables(cursor) -> List[str]:
+    """Tablas que llevan la restricción: cada partición, o la tabla si no está particionada"""
+    cursor.execute(
+        """
+        SELECT c.relname FROM pg_inherits inh
+        JOIN pg_class c ON c.oid = inh.inhrelid
+        WHERE inh.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+        """,
+        [TABLE],
+    )
+    return [row[0] for row in cursor.fetchall()] or [TABLE]
+
+
+def install_shift_range(connection):
+    """
+    Agrega la columna generada, el índice GiST y las restricciones de
+    exclusión. Se usa desde la migración.
+
+    Raises:
+        RuntimeError: Si ya hay turnos cerrados que se cruzan; hay que
+            corregirlos antes de migrar
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        # Una salida anterior a la entrada no es un rango válido: queda sin rango
+        cursor.execute(
+            f"""
+            ALTER TABLE {TABLE} ADD COLUMN {COLUMN} tstzrange GENERATED ALWAYS AS (
+                CASE WHEN timestamp_out IS NULL OR timestamp_out >= timestamp_in
+                THEN tstzrange(timestamp_in, timestamp_out, '[)') END
+            ) STORED
+            """
+        )
+        cursor.execute(f"CREATE INDEX {INDEX} ON {TABLE} USING gist ({COLUMN})")
+
+        overlaps = find_overlapping_shifts(include_open=False, using=connection.alias)
+        if overlaps:
+            sample = ", ".join(f"{first}/{second}" for first, second, _ in overlaps[:10])
+            raise RuntimeError(
+                f"Hay {len(overlaps)} pares de turnos cerrados que se cruzan "
+                f"(ids {sample}). Corrígelos antes de migrar."
+            )
+
+        for table in _constrained_tables(cursor):
+            cursor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_{CONSTRAINT_SUFFIX} "
+                f"{EXCLUSION_DEFINITION}"
+            )
+
+
+def remove_shift_range(connection):
+    """Reverso de install_shift_range"""
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        # Borrar la columna borra también el índice y las restricciones que la usan
+        cursor.execute(f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS {COLUMN}")
@@ -0,0 +1,63 @@
+"""
+Invalidación de la caché de reportes cuando cambian los datos de origen
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.timezone import localtime
+
+from attendance.models import AttendanceRegister
+from core.report_cache import (
+    ACTIVE_PERIOD_TAG,
+    employee_tag,
+    invalidate_tags,
+    period_tag,
+)
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from timers.models import Timer
+
+
+def invalidate_attendance_dates(work_dates, pay_period_id=None):
+    """
+    Invalida los reportes de los períodos que cubren las fechas indicadas.
+    Los reportes filtran las marcas por fecha de entrada, no por pay_period.
+    """
+    periods = set()
+    for work_date in set(work_dates):
+        periods.update(
+            PayPeriod.objects.filter(
+                start_date__lte=work_date, end_date__gte=work_date
+            ).values_list("id", "is_closed")
+        )
+
+    tags = {period_tag(period_id) for period_id, _ in periods}
+    # Cualquier marca puede cambiar quién está trabajando en este momento
+    tags.add("attendance")
+    if pay_period_id:
+        tags.add(period_tag(pay_period_id))
+    if not periods or any(not is_closed for _, is_closed in periods):
+        tags.add(ACTIVE_PERIOD_TAG)
+
+    invalidate_tags(*tags)
+
+
+@receiver([post_save, post_delete], sender=AttendanceRegister)
+def invalidate_attendance_reports(sender, instance, **kwargs):
+    invalidate_attendance_dates(
+        [localtime(instance.timestamp_in).date()], instance.pay_period_id
+    )
+
+
+@receiver([post_save, post_delete], sender=Timer)
+def invalidate_timer_reports(sender, instance, **kwargs):
+    invalidate_tags("timers", employee_tag(instance.employee_id))
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_employee_reports(sender, instance, **kwargs):
+    invalidate_tags("employees", employee_tag(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=PayPeriod)
+def invalidate_period_reports(sender, instance, **kwargs):
+    invalidate_tags(period_tag(instance.pk), ACTIVE_PERIOD_TAG)
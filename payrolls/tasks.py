@@ -6,6 +6,7 @@ from timers.models import Timer
 from employee.models import Employee
 from twilio.rest import Client
 from core import settings
+from core.metrics import TASK_SECONDS
 import logging
 import json
 
@@ -14,6 +15,7 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task
+@TASK_SECONDS.labels("remind_pay_period_to_admin").time()
 def remind_pay_period_to_admin():
     today = date.today()
     if today.day == 28 or today.day == 14:
@@ -39,6 +41,7 @@ def remind_pay_period_to_admin():
 
 
 @shared_task
+@TASK_SECONDS.labels("check_attendance").time()
 def check_attendance():
     now = timezone.localtime()
     today = now.date()
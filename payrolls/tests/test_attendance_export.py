@@ -0,0 +1,80 @@
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import datetime, date, time
+from decimal import Decimal
+import csv
+import gzip
+import io
+from employee.models import Employee
+from attendance.models import AttendanceRegister
+from django.utils import timezone
+
+
+class AttendanceExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.employees = []
+        for index in range(2):
+            employee = Employee.objects.create(
+                username=f"employee{index}",
+                first_name="Empleado",
+                last_name=str(index),
+                salary_hour=Decimal("20.00"),
+            )
+            self.employees.append(employee)
+            for day in (1, 2, 3):
+                day_date = date(2025, 1, day)
+                AttendanceRegister.objects.create(
+                    employee=employee,
+                    timestamp_in=timezone.make_aware(datetime.combine(day_date, time(22, 0))),
+                    timestamp_out=timezone.make_aware(
+                        datetime.combine(date(2025, 1, day + 1), time(6, 0))
+                    ),
+                    method="nfc",
+                )
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=self.employees[0])
+        response = self.client.get(
+            reverse("attendance-export"),
+            {"start_date": "2025-01-01", "end_date": "2025-01-31"},
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_rejects_inverted_range(self):
+        response = self.client.get(
+            reverse("attendance-export"),
+            {"start_date": "2025-02-01", "end_date": "2025-01-01"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY requiere PostgreSQL")
+    def test_exports_local_times_for_selected_employees(self):
+        """El CSV trae horas locales, nombre del empleado y respeta el rango"""
+        response = self.client.get(
+            reverse("attendance-export"),
+            {
+                "start_date": "2025-01-02",
+                "end_date": "2025-01-03",
+                "employee_ids": [self.employees[1].id],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        content = gzip.decompress(b"".join(response.streaming_content)).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["employee_name"], "Empleado 1")
+        self.assertEqual(rows[0]["timestamp_in"], "2025-01-02 22:00:00")
+        self.assertEqual(rows[0]["timestamp_out"], "2025-01-03 06:00:00")
@@ -0,0 +1,125 @@
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from datetime import datetime, date, time
+from decimal import Decimal
+import csv
+import io
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from attendance.models import AttendanceRegister
+from payrolls.services.attendance_import import (
+    REJECT_CLOSED_PERIOD,
+    REJECT_DUPLICATE,
+    REJECT_INVALID_TIMESTAMP,
+    REJECT_OUT_BEFORE_IN,
+    REJECT_OVERLAP,
+    REJECT_UNKNOWN_EMPLOYEE,
+    import_time_clock_csv,
+    normalize_rows,
+)
+from django.utils import timezone
+
+CSV_DATA = """empleado,entrada,salida
+juan,2025-01-02 08:00,2025-01-02 16:00
+1234,02/01/2025 22:00,03/01/2025 06:00
+juan,2025-01-03 08:00,
+nadie,2025-01-03 08:00,2025-01-03 16:00
+juan,2025-01-04 16:00,2025-01-04 08:00
+juan,ayer,2025-01-04 08:00
+juan,2024-12-20 08:00,2024-12-20 16:00
+juan,2025-01-02 08:00,2025-01-02 17:00
+"""
+
+
+class NormalizeRowsTest(TestCase):
+    def test_normalizes_local_times_and_rejects_invalid_rows(self):
+        rejects = []
+        rows = list(
+            normalize_rows(csv.reader(io.StringIO(CSV_DATA).readlines()[1:]), rejects, 2)
+        )
+
+        self.assertEqual([row[0] for row in rows], [2, 3, 4, 5, 8, 9])
+        self.assertEqual(
+            rows[1][2], timezone.make_aware(datetime(2025, 1, 2, 22, 0))
+        )
+        self.assertIsNone(rows[2][3])
+        self.assertEqual(
+            [(reject["line"], reject["reason"]) for reject in rejects],
+            [(6, REJECT_OUT_BEFORE_IN), (7, REJECT_INVALID_TIMESTAMP)],
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY requiere PostgreSQL")
+class TimeClockImportTest(TestCase):
+    def setUp(self):
+        self.juan = Employee.objects.create(
+            username="juan", salary_hour=Decimal("20.00")
+        )
+        self.ana = Employee.objects.create(
+            username="ana", unique_pin="1234", salary_hour=Decimal("20.00")
+        )
+        self.closed = PayPeriod.objects.create(
+            start_date=date(2024, 12, 16), end_date=date(2024, 12, 31), is_closed=True
+        )
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 15), is_closed=False
+        )
+        # Marca ya existente e igual a la del archivo: queda sin cambios
+        AttendanceRegister.objects.create(
+            employee=self.juan,
+            timestamp_in=timezone.make_aware(datetime.combine(date(2025, 1, 3), time(8, 0))),
+            method="nfc",
+        )
+
+    def test_import_upserts_and_reports_rejects(self):
+        result = import_time_clock_csv(io.StringIO(CSV_DATA))
+
+        self.assertEqual(result["inserted"], 2)
+        self.assertEqual(result["updated"], 0)
+        self.assertEqual(result["unchanged"], 1)
+        self.assertEqual(
+            [(reject["line"], reject["reason"]) for reject in result["rejected"]],
+            [
+                (2, REJECT_DUPLICATE),
+                (5, REJECT_UNKNOWN_EMPLOYEE),
+                (6, REJECT_OUT_BEFORE_IN),
+                (7, REJECT_INVALID_TIMESTAMP),
+                (8, REJECT_CLOSED_PERIOD),
+            ],
+        )
+
+        night = AttendanceRegister.objects.get(employee=self.ana)
+        self.assertEqual(night.pay_period, self.period)
+        first_day = AttendanceRegister.objects.get(
+            employee=self.juan, timestamp_in__date=date(2025, 1, 2)
+        )
+        self.assertEqual(timezone.localtime(first_day.timestamp_out).hour, 17)
+
+    def test_dry_run_does_not_write(self):
+        result = import_time_clock_csv(io.StringIO(CSV_DATA), dry_run=True)
+
+        self.assertEqual(result["inserted"], 2)
+        self.assertEqual(AttendanceRegister.objects.count(), 1)
+
+    def test_overlapping_shifts_are_rejected(self):
+        AttendanceRegister.objects.create(
+            employee=self.ana,
+            timestamp_in=timezone.make_aware(datetime(2025, 1, 5, 8, 0)),
+            timestamp_out=timezone.make_aware(datetime(2025, 1, 5, 16, 0)),
+            method="nfc",
+        )
+        data = """empleado,entrada,salida
+1234,2025-01-05 15:00,2025-01-05 20:00
+juan,2025-01-06 08:00,2025-01-06 16:00
+juan,2025-01-06 12:00,2025-01-06 18:00
+juan,2025-01-07 08:00,2025-01-07 16:00
+"""
+        result = import_time_clock_csv(io.StringIO(data))
+
+        # Las líneas del archivo que se cruzan entre sí se rechazan las dos
+        self.assertEqual(result["inserted"], 1)
+        self.assertEqual(
+            [(reject["line"], reject["reason"]) for reject in result["rejected"]],
+            [(2, REJECT_OVERLAP), (3, REJECT_OVERLAP), (4, REJECT_OVERLAP)],
+        )
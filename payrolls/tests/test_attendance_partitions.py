@@ -0,0 +1,225 @@
+"""
+Particiones mensuales de AttendanceRegister.
+
+Las pruebas de particiones solo corren en PostgreSQL:
+    DATABASE_URL=postgresql://... python manage.py test payrolls.tests.test_attendance_partitions
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attendance.models import AttendanceRegister
+from authentication.models import NFCToken
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from payrolls.services.attendance_partitions import (
+    DEFAULT_PARTITION,
+    add_brin_indexes,
+    create_partition,
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_name,
+)
+
+IS_POSTGRES = connection.vendor == "postgresql"
+
+
+def local(day, hour=0, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+class RegisterFilterTest(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            username="employee", salary_hour=Decimal("20.00")
+        )
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 3, 1), end_date=date(2025, 3, 15)
+        )
+
+    def test_range_matches_local_dates_of_the_period(self):
+        inside = [local(date(2025, 3, 1)), local(date(2025, 3, 15), 23, 59)]
+        outside = [local(date(2025, 2, 28), 23, 59), local(date(2025, 3, 16))]
+        for timestamp in inside + outside:
+            AttendanceRegister.objects.create(
+                employee=self.employee, timestamp_in=timestamp, method="nfc"
+            )
+
+        by_range = AttendanceRegister.objects.filter(**self.period.register_filter())
+        by_date = AttendanceRegister.objects.filter(
+            timestamp_in__date__gte=self.period.start_date,
+            timestamp_in__date__lte=self.period.end_date,
+        )
+        self.assertEqual(
+            sorted(by_range.values_list("timestamp_in", flat=True)), inside
+        )
+        self.assertEqual(set(by_range), set(by_date))
+
+    def test_prefix_for_related_lookups(self):
+        AttendanceRegister.objects.create(
+            employee=self.employee, timestamp_in=local(date(2025, 3, 5), 8), method="nfc"
+        )
+        employees = Employee.objects.filter(
+            **self.period.register_filter("attendanceregister__")
+        )
+        self.assertEqual(list(employees), [self.employee])
+
+
+class MarkOutLookupTest(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            username="employee", salary_hour=Decimal("20.00")
+        )
+        nfc = NFCToken(employee=self.employee, tag_id="tag")
+        nfc.generate_token()
+        nfc.save()
+        self.token = nfc.token
+
+    def mark_out(self, now):
+        with mock.patch.object(Employee, "get_current_timestamp", return_value=now):
+            with CaptureQueriesContext(connection) as queries:
+                response = APIClient().post(
+                    "/v1/attendance/out/", {"token": self.token}, format="json"
+                )
+        return response, queries.captured_queries
+
+    def test_lookup_is_bounded_to_previous_month(self):
+        forgotten = AttendanceRegister.objects.create(
+            employee=self.employee, timestamp_in=local(date(2025, 2, 27), 8), method="nfc"
+        )
+
+        response, _ = self.mark_out(local(date(2025, 4, 2), 17))
+        self.assertEqual(response.status_code, 400)
+
+        response, _ = self.mark_out(local(date(2025, 3, 31), 17))
+        self.assertEqual(response.status_code, 201)
+        forgotten.refresh_from_db()
+        self.assertEqual(forgotten.timestamp_out, local(date(2025, 3, 31), 17))
+        self.assertEqual(forgotten.version, 1)
+
+    @skipUnless(IS_POSTGRES, "Requiere PostgreSQL")
+    def test_mark_out_reads_only_recent_partitions(self):
+        for month in (date(2035, 1, 1), date(2035, 5, 1), date(2035, 6, 1)):
+            create_partition(month)
+        AttendanceRegister.objects.create(
+            employee=self.employee, timestamp_in=local(date(2035, 6, 3), 8), method="nfc"
+        )
+
+        response, queries = self.mark_out(local(date(2035, 6, 3), 17))
+        self.assertEqual(response.status_code, 201)
+
+        table = AttendanceRegister._meta.db_table
+        statements = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(("SELECT", "UPDATE")) and f'"{table}"' in query["sql"]
+        ]
+        self.assertEqual(len(statements), 2)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(f"EXPLAIN {sql}")
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+                self.assertNotIn(partition_name(date(2035, 1, 1)), plan)
+                self.assertNotIn(DEFAULT_PARTITION, plan)
+
+
+@skipUnless(IS_POSTGRES, "Requiere PostgreSQL")
+class AttendancePartitionsTest(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            username="employee", salary_hour=Decimal("20.00")
+        )
+
+    def mark(self, timestamp, paid=False):
+        return AttendanceRegister.objects.create(
+            employee=self.employee, timestamp_in=timestamp, method="nfc", paid=paid
+        )
+
+    def partition_of(self, register):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {AttendanceRegister._meta.db_table} "
+                "WHERE id = %s",
+                [register.id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_migration_partitions_the_table(self):
+        self.assertTrue(is_partitioned())
+        current = timezone.localdate().replace(day=1)
+        self.assertIn(current, [partition["month"] for partition in list_partitions()])
+
+    def test_period_query_reads_only_its_partitions(self):
+        create_partition(date(2030, 1, 1))
+        create_partition(date(2030, 2, 1))
+        period = PayPeriod.objects.create(
+            start_date=date(2030, 1, 1), end_date=date(2030, 1, 15)
+        )
+
+        plan = AttendanceRegister.objects.filter(**period.register_filter()).explain()
+        self.assertIn(partition_name(date(2030, 1, 1)), plan)
+        self.assertNotIn(partition_name(date(2030, 2, 1)), plan)
+        self.assertNotIn(DEFAULT_PARTITION, plan)
+
+    def test_marks_without_partition_move_when_it_is_created(self):
+        register = self.mark(local(date(2031, 5, 3), 8))
+        self.assertEqual(self.partition_of(register), DEFAULT_PARTITION)
+
+        self.assertTrue(create_partition(date(2031, 5, 1)))
+        self.assertFalse(create_partition(date(2031, 5, 1)))
+        self.assertEqual(self.partition_of(register), partition_name(date(2031, 5, 1)))
+        self.assertEqual(AttendanceRegister.objects.get(pk=register.pk).employee, self.employee)
+
+    def test_ensure_partitions_and_brin(self):
+        created = ensure_partitions(months_ahead=1, today=date(2032, 6, 10))
+        self.assertEqual(
+            created, [partition_name(date(2032, 6, 1)), partition_name(date(2032, 7, 1))]
+        )
+
+        indexed = add_brin_indexes(after_months=0, today=date(2032, 7, 10))
+        self.assertIn(partition_name(date(2032, 6, 1)), indexed)
+        self.assertNotIn(partition_name(date(2032, 7, 1)), indexed)
+        self.assertNotIn(
+            partition_name(date(2032, 6, 1)), add_brin_indexes(after_months=0, today=date(2032, 7, 10))
+        )
+
+    def test_detach_refuses_unpaid_marks(self):
+        create_partition(date(2033, 1, 1))
+        register = self.mark(local(date(2033, 1, 10), 8))
+
+        with self.assertRaises(ValueError):
+            detach_partition(date(2033, 1, 1))
+
+        AttendanceRegister.objects.filter(pk=register.pk).update(paid=True)
+        # Dentro del TestCase las FK diferidas de la marca siguen pendientes
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        self.assertEqual(detach_partition(date(2033, 1, 1)), partition_name(date(2033, 1, 1)))
+        self.assertFalse(AttendanceRegister.objects.filter(pk=register.pk).exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command("attendance_partitions", "--list", stdout=out)
+        self.assertIn(partition_name(timezone.localdate().replace(day=1)), out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("attendance_partitions", "--detach-before=2025/01", stdout=out)
+
+
+@skipUnless(not IS_POSTGRES, "Solo sin PostgreSQL")
+class AttendancePartitionsOtherEnginesTest(TestCase):
+    def test_command_requires_partitioned_table(self):
+        self.assertFalse(is_partitioned())
+        with self.assertRaises(CommandError):
+            call_command("attendance_partitions", stdout=StringIO())
@@ -0,0 +1,112 @@
+from django.test import TestCase
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from attendance.models import AttendanceRegister, AttendanceDetail
+from payrolls.services.attendance_reset import reset_attendance_paid_status
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+class AttendanceResetServiceTest(TestCase):
+    def setUp(self):
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        self.employees = []
+        for index in range(3):
+            employee = Employee.objects.create(
+                username=f"employee{index}",
+                salary_hour=Decimal("20.00"),
+                biweekly_hours=Decimal("96.0"),
+            )
+            self.employees.append(employee)
+
+            for day in range(1, 4):
+                day_date = date(2025, 1, day)
+                AttendanceRegister.objects.create(
+                    employee=employee,
+                    timestamp_in=timezone.make_aware(
+                        datetime.combine(day_date, time(8, 0))
+                    ),
+                    timestamp_out=timezone.make_aware(
+                        datetime.combine(day_date, time(16, 0))
+                    ),
+                    method="nfc",
+                    paid=True,
+                    pay_period=self.period,
+                )
+                AttendanceDetail.objects.create(
+                    employee=employee,
+                    pay_period=self.period,
+                    work_date=day_date,
+                    time_in=time(8, 0),
+                    time_out=time(16, 0),
+                    regular_hours=Decimal("8"),
+                )
+
+            SalaryRecord.objects.create(
+                employee=employee,
+                pay_period=self.period,
+                total_hours=Decimal("24"),
+                extra_hours=Decimal("0"),
+                salary_to_pay=Decimal("480"),
+            )
+
+    def test_dry_run_reports_without_changes(self):
+        """El dry run devuelve el reporte por empleado sin modificar nada"""
+        result = reset_attendance_paid_status(
+            self.period, delete_salary_records=True, dry_run=True
+        )
+
+        self.assertEqual(result["summary"]["employees_processed"], 3)
+        self.assertEqual(result["summary"]["attendance_reset"], 0)
+        for info in result["employees"]:
+            self.assertEqual(info["attendance_to_reset"], 3)
+            self.assertEqual(info["details_to_delete"], 3)
+            self.assertEqual(info["salary_records_to_delete"], 1)
+            self.assertEqual(info["current_salary_info"]["salary_to_pay"], "480.00")
+
+        self.assertEqual(AttendanceRegister.objects.filter(paid=True).count(), 9)
+        self.assertEqual(AttendanceDetail.objects.count(), 9)
+        self.assertEqual(SalaryRecord.objects.count(), 3)
+
+    def test_reset_uses_constant_number_of_queries(self):
+        """El reseteo no depende del número de empleados"""
+        employee_ids = [employee.id for employee in self.employees[:2]]
+
+        # SELECT empleados + bloqueo + 3 agregados + 3 escrituras + foto (+ savepoint)
+        with self.assertNumQueries(11):
+            result = reset_attendance_paid_status(
+                self.period, employee_ids=employee_ids, delete_salary_records=True
+            )
+
+        self.assertEqual(result["summary"]["attendance_reset"], 6)
+        self.assertEqual(result["summary"]["details_deleted"], 6)
+        self.assertEqual(result["summary"]["salary_records_deleted"], 2)
+        self.assertEqual(AttendanceRegister.objects.filter(paid=True).count(), 3)
+        self.assertEqual(AttendanceDetail.objects.count(), 3)
+        self.assertEqual(SalaryRecord.objects.count(), 1)
+
+    def test_view_keeps_response_keys(self):
+        """La vista no expone los campos internos del reporte"""
+        admin = Employee.objects.create(
+            username="admin", is_staff=True, salary_hour=Decimal("40.00")
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.post(
+            "/v1/salary/admin/reset-attendance/",
+            {"period_id": self.period.id, "employee_ids": "all", "dry_run": True},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        for info in response.data["employees"]:
+            self.assertNotIn("current_salary_records", info)
+            self.assertEqual(info["attendance_to_reset"], 3)
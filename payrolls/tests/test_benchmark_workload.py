@@ -0,0 +1,90 @@
+from django.test import TestCase
+from django.utils import timezone
+from datetime import date, datetime, time
+from attendance.models import AttendanceRegister
+from authentication.models import NFCToken
+from timers.models import Timer
+from benchmarks.suite import compare_results, measure
+from benchmarks.workload import generate_workload
+
+
+class BenchmarkWorkloadTest(TestCase):
+    def setUp(self):
+        self.now = timezone.make_aware(datetime(2025, 3, 12, 15, 0))
+
+    def shape(self, prefix, employees=12):
+        workload = generate_workload(
+            employees=employees, periods=3, seed=7, prefix=prefix, now=self.now
+        )
+        registers = AttendanceRegister.objects.filter(
+            employee__username__startswith=f"{prefix}-"
+        ).order_by("employee__username", "timestamp_in")
+        return workload, [
+            (
+                register.employee.username.removeprefix(prefix),
+                register.timestamp_in,
+                register.timestamp_out,
+                register.paid,
+            )
+            for register in registers
+        ]
+
+    def test_same_seed_same_data(self):
+        first, first_rows = self.shape("a")
+        second, second_rows = self.shape("b")
+
+        self.assertEqual(first["registers"], second["registers"])
+        self.assertEqual(first_rows, second_rows)
+
+    def test_larger_scale_keeps_existing_employees(self):
+        _, small_rows = self.shape("a", employees=4)
+        _, large_rows = self.shape("b", employees=8)
+
+        first_four = {f"-7-{index}" for index in range(4)}
+        self.assertEqual(
+            small_rows, [row for row in large_rows if row[0] in first_four]
+        )
+
+    def test_realistic_shifts(self):
+        workload, _ = self.shape("a")
+        registers = AttendanceRegister.objects.all()
+
+        # El último período es el activo y contiene la fecha de referencia
+        active = workload["active_period"]
+        self.assertFalse(active.is_closed)
+        self.assertTrue(active.start_date <= self.now.date() <= active.end_date)
+        self.assertTrue(all(period.is_closed for period in workload["periods"][:-1]))
+        self.assertFalse(registers.filter(timestamp_in__gt=self.now).exists())
+
+        # Solo los períodos cerrados quedan pagados
+        self.assertFalse(registers.filter(paid=True, pay_period__is_closed=False).exists())
+        self.assertTrue(registers.filter(paid=False).exists())
+
+        self.assertTrue(Timer.objects.filter(is_night_shift=True).exists())
+        self.assertTrue(registers.filter(timestamp_out__isnull=True).exists())
+        early = [
+            register
+            for register in registers
+            if time(7, 0) <= timezone.localtime(register.timestamp_in).time() < time(8, 0)
+        ]
+        self.assertTrue(early)
+        self.assertEqual(NFCToken.objects.count(), 12)
+
+    def test_elapsed_days_of_active_period(self):
+        workload = generate_workload(
+            employees=2, periods=1, seed=7, prefix="a", now=self.now, elapsed_days=2
+        )
+        self.assertEqual(workload["active_period"].start_date, date(2025, 3, 10))
+        with self.assertRaises(ValueError):
+            generate_workload(employees=1, prefix="b", now=self.now, elapsed_days=15)
+
+    def test_measure_and_compare(self):
+        scenario = {"name": "noop", "run": lambda: 200, "writes": False}
+        result = measure(scenario, repeat=2)
+        self.assertEqual(result["scenario"], "noop")
+        self.assertEqual(result["status"], 200)
+        self.assertEqual(result["queries"], 0)
+
+        baseline = {"results": [{**result, "scale": "small", "best_ms": 2.0}]}
+        current = {"results": [{**result, "scale": "small", "best_ms": 3.0}]}
+        self.assertEqual(compare_results(baseline, current)[0]["ratio"], 1.5)
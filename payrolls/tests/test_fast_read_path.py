@@ -0,0 +1,114 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import date, time, timedelta
+from decimal import Decimal
+import json
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.serializers import SalaryRecordSerializer
+from attendance.models import AttendanceDetail
+from attendance.serializers import AttendanceDetailSerializer
+
+
+class FastReadPathTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+        self.employee = self.create_rows(0, days=3)
+
+    def create_rows(self, index, days):
+        employee = Employee.objects.create(
+            username=f"employee{index}",
+            first_name="" if index % 2 else "Empleado",
+            last_name=str(index),
+            salary_hour=Decimal("20.00"),
+        )
+        SalaryRecord.objects.create(
+            employee=employee,
+            pay_period=self.period,
+            total_hours=Decimal("50.25"),
+            regular_hours=Decimal("40.00"),
+            night_hours=Decimal(index % 2),
+            extra_hours=Decimal("10.25"),
+            lunch_deduction_hours=Decimal("2.00"),
+            salary_to_pay=Decimal("1000.00"),
+            other_deductions_description="Adelanto" if index % 2 else None,
+        )
+        for day in range(days):
+            AttendanceDetail.objects.create(
+                employee=employee,
+                pay_period=self.period,
+                work_date=date(2025, 1, 1) + timedelta(days=day),
+                time_in=time(8, 0),
+                time_out=time(16, 30),
+                regular_hours=Decimal("7.50"),
+                night_hours=Decimal("0"),
+                lunch_deduction=Decimal("1.00"),
+            )
+        return employee
+
+    def as_json(self, data):
+        return json.loads(json.dumps(data))
+
+    def test_salary_records_match_serializer(self):
+        for index in range(1, 4):
+            self.create_rows(index, days=0)
+
+        response = self.client.get(
+            reverse("list-salary-records"),
+            {"period_id": self.period.id, "paginate": "false"},
+        )
+        expected = SalaryRecordSerializer(
+            SalaryRecord.objects.filter(pay_period=self.period).order_by("id"), many=True
+        ).data
+        self.assertEqual(self.as_json(response.data), self.as_json(expected))
+
+    def test_attendance_details_match_serializer(self):
+        response = self.client.get(
+            reverse("employee-attendance-details"),
+            {
+                "period_id": self.period.id,
+                "employee_id": self.employee.id,
+                "paginate": "false",
+            },
+        )
+        expected = AttendanceDetailSerializer(
+            AttendanceDetail.objects.filter(employee=self.employee).order_by("work_date"),
+            many=True,
+        ).data
+        self.assertEqual(self.as_json(response.data), self.as_json(expected))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Un listado es una sola consulta con 1 o con 40 registros"""
+        url = reverse("list-salary-records")
+        params = {"period_id": self.period.id, "page_size": 50}
+
+        with self.assertNumQueries(1):
+            self.client.get(url, params)
+
+        for index in range(1, 40):
+            self.create_rows(index, days=0)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params)
+        self.assertEqual(len(response.data["results"]), 40)
+
+        detail_url = reverse("employee-attendance-details")
+        with self.assertNumQueries(1):
+            self.client.get(
+                detail_url,
+                {"period_id": self.period.id, "employee_id": self.employee.id},
+            )
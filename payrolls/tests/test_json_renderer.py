@@ -0,0 +1,88 @@
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from uuid import UUID
+from zoneinfo import ZoneInfo
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.serializers import SalaryRecordSerializer
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTest(TestCase):
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_scalar_types_match_drf(self):
+        self.assertSameOutput(
+            {
+                "decimal": Decimal("1855.10"),
+                "zero": Decimal("0.00"),
+                "date": date(2025, 1, 15),
+                "time": time(8, 30),
+                "time_micro": time(8, 30, 0, 1500),
+                "utc": datetime(2025, 1, 15, 14, 0, tzinfo=dt_timezone.utc),
+                "utc_micro": datetime(2025, 1, 15, 14, 0, 0, 123456, tzinfo=dt_timezone.utc),
+                "local": datetime(2025, 1, 15, 8, 0, tzinfo=ZoneInfo("America/Costa_Rica")),
+                "naive": datetime(2025, 1, 15, 8, 0),
+                "duration": timedelta(hours=8, minutes=30),
+                "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+                "lazy": gettext_lazy("Empleado"),
+                "text": "José Pérez ñ",
+                "nested": [{"none": None, "flag": True, "float": 0.1}],
+                1: "clave numérica",
+            }
+        )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_indent_falls_back_to_drf(self):
+        data = {"amount": Decimal("10.50")}
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+    def test_salary_records_keep_money_as_strings(self):
+        employee = Employee.objects.create(
+            username="employee",
+            first_name="Ana",
+            last_name="Mora",
+            salary_hour=Decimal("20.00"),
+        )
+        period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 15)
+        )
+        SalaryRecord.objects.create(
+            employee=employee,
+            pay_period=period,
+            total_hours=Decimal("50.25"),
+            regular_hours=Decimal("40.00"),
+            night_hours=Decimal("0"),
+            extra_hours=Decimal("10.25"),
+            lunch_deduction_hours=Decimal("2.00"),
+            gross_salary=Decimal("1005.10"),
+            salary_to_pay=Decimal("1000.00"),
+        )
+        data = SalaryRecordSerializer(SalaryRecord.objects.all(), many=True).data
+
+        output = FastJSONRenderer().render(data)
+        self.assertEqual(output, JSONRenderer().render(data))
+        self.assertIn(b'"gross_salary":"1005.10"', output)
+        self.assertIn(b'"salary_to_pay":"1000.00"', output)
+
+    def test_default_renderer_for_api(self):
+        admin = Employee.objects.create(
+            username="admin", is_admin=True, salary_hour=Decimal("40.00")
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.get(reverse("list-salary-records"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
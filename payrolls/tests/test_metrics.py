@@ -0,0 +1,122 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from prometheus_client import REGISTRY
+from benchmarks.workload import generate_workload
+from employee.models import Employee
+from payrolls.services.payroll_run import calculate_and_save_salary
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "metrics-tests",
+    }
+}
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(METRICS_TOKEN="scrape-secret", CACHES=LOCMEM_CACHES)
+class MetricsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.workload = generate_workload(employees=2, periods=1, seed=3, prefix="metrics")
+        self.admin = Employee.objects.create(
+            username="metrics-admin",
+            is_admin=True,
+            salary_hour=self.workload["employees"][0].salary_hour,
+        )
+
+    def test_endpoint_requires_token(self):
+        response = self.client.get("/v1/metrics/")
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.get("/v1/metrics/", HTTP_AUTHORIZATION="Bearer otro")
+        self.assertEqual(response.status_code, 401)
+
+        with override_settings(METRICS_TOKEN=""):
+            response = self.client.get(
+                "/v1/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret"
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_exposition_format(self):
+        response = self.client.get("/v1/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        for name in (
+            "payroll_kiosk_tap_seconds",
+            "payroll_employee_calculation_seconds",
+            "payroll_run_seconds",
+            "payroll_rows_per_second",
+            "payroll_cache_requests_total",
+            "payroll_task_seconds",
+        ):
+            self.assertIn(f"# TYPE {name.removesuffix('_total')}", body)
+
+    def test_kiosk_taps(self):
+        token = self.workload["nfc_tokens"][0].token
+        before = {
+            endpoint: sample("payroll_kiosk_tap_seconds_count", endpoint=endpoint)
+            for endpoint in ("mark_in", "mark_out", "nfc_validate")
+        }
+
+        self.client.post("/v1/attendance/in/", {"token": token}, format="json")
+        self.client.post("/v1/attendance/out/", {"token": token}, format="json")
+        self.client.post("/v1/auth/nfc/validate/", {"token": token}, format="json")
+
+        for endpoint, count in before.items():
+            self.assertEqual(
+                sample("payroll_kiosk_tap_seconds_count", endpoint=endpoint), count + 1
+            )
+
+    def test_payroll_calculation(self):
+        calculations = sample("payroll_employee_calculation_seconds_count")
+        throughput = sample("payroll_rows_per_second_count")
+
+        result = calculate_and_save_salary(
+            self.workload["employees"][0], self.workload["active_period"]
+        )
+
+        self.assertNotIn("error", result)
+        self.assertEqual(
+            sample("payroll_employee_calculation_seconds_count"), calculations + 1
+        )
+        self.assertEqual(sample("payroll_rows_per_second_count"), throughput + 1)
+
+    def test_calculate_all_run(self):
+        runs = sample("payroll_run_seconds_count")
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(
+            reverse("calculate-all-salaries"),
+            {"period_id": self.workload["active_period"].id},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sample("payroll_run_seconds_count"), runs + 1)
+
+    def test_preview_cache_hits(self):
+        hits = sample("payroll_cache_requests_total", cache="preview", result="hit")
+        misses = sample("payroll_cache_requests_total", cache="preview", result="miss")
+        self.client.force_authenticate(user=self.admin)
+
+        for _ in range(2):
+            self.client.get(
+                reverse("payroll-preview"),
+                {"period_id": self.workload["active_period"].id},
+            )
+
+        # La primera lectura calcula a los dos empleados y la segunda los encuentra
+        self.assertEqual(
+            sample("payroll_cache_requests_total", cache="preview", result="miss"),
+            misses + 2,
+        )
+        self.assertEqual(
+            sample("payroll_cache_requests_total", cache="preview", result="hit"),
+            hits + 2,
+        )
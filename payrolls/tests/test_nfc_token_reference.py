@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attendance.models import AttendanceRegister
+from authentication.models import NFCToken
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from payrolls.services.period_migration import migrate_current_shifts_to_new_period
+
+token_migration = import_module("attendance.migrations.0006_nfc_token_foreign_key")
+
+
+class NFCTokenReferenceTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.employee = Employee.objects.create(
+            username="employee", salary_hour=Decimal("20.00")
+        )
+        self.nfc = NFCToken(employee=self.employee, tag_id="tag")
+        self.nfc.generate_token()
+        self.nfc.save()
+
+    def register(self, **kwargs):
+        return AttendanceRegister.objects.create(
+            employee=self.employee,
+            timestamp_in=timezone.now() - timedelta(hours=1),
+            method="nfc",
+            **kwargs,
+        )
+
+    def test_mark_in_stores_reference_not_jwt(self):
+        response = self.client.post(
+            "/v1/attendance/in/", {"token": self.nfc.token}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        register = AttendanceRegister.objects.get(employee=self.employee)
+        self.assertEqual(register.nfc_token, self.nfc)
+        self.assertIsNone(register.legacy_nfc_token)
+        self.assertEqual(register.raw_nfc_token, self.nfc.token)
+
+    def test_correction_response_still_exposes_jwt(self):
+        admin = Employee.objects.create(
+            username="admin", is_admin=True, salary_hour=Decimal("40.00")
+        )
+        self.client.force_authenticate(user=admin)
+        linked = self.register(nfc_token=self.nfc)
+        legacy = self.register(legacy_nfc_token="jwt.anterior")
+
+        for register, expected in ((linked, self.nfc.token), (legacy, "jwt.anterior")):
+            response = self.client.patch(
+                f"/v1/attendance/{register.pk}/",
+                {"timestamp_in": register.timestamp_in.isoformat(), "version": 0},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["register"]["nfc_token"], expected)
+
+    def test_backfill_links_known_tokens(self):
+        known = self.register(legacy_nfc_token=self.nfc.token)
+        orphan = self.register(legacy_nfc_token="jwt.de.token.borrado")
+        schema_editor = SimpleNamespace(connection=connection)
+
+        token_migration.link_tokens(apps, schema_editor)
+
+        known.refresh_from_db()
+        orphan.refresh_from_db()
+        self.assertEqual(known.nfc_token, self.nfc)
+        self.assertIsNone(known.legacy_nfc_token)
+        self.assertIsNone(orphan.nfc_token)
+        self.assertEqual(orphan.legacy_nfc_token, "jwt.de.token.borrado")
+
+        token_migration.restore_tokens(apps, schema_editor)
+        known.refresh_from_db()
+        self.assertEqual(known.legacy_nfc_token, self.nfc.token)
+
+    def test_period_migration_keeps_reference(self):
+        # Mediodía: la fecha de hoy es la misma en UTC y en hora local
+        now = timezone.make_aware(datetime(2025, 1, 15, 12, 0))
+        today = now.date()
+        closing = PayPeriod.objects.create(
+            start_date=today - timedelta(days=14), end_date=today
+        )
+        new_period = PayPeriod.objects.create(
+            start_date=today + timedelta(days=1), end_date=today + timedelta(days=15)
+        )
+        AttendanceRegister.objects.create(
+            employee=self.employee,
+            timestamp_in=now - timedelta(hours=2),
+            method="nfc",
+            nfc_token=self.nfc,
+            pay_period=closing,
+        )
+
+        with mock.patch("payrolls.services.period_migration.timezone.now", return_value=now):
+            result = migrate_current_shifts_to_new_period(closing, new_period)
+
+        self.assertEqual(result["migrated_records"][0]["nfc_token"], self.nfc.token)
+        migrated = AttendanceRegister.objects.get(pay_period=new_period)
+        self.assertEqual(migrated.nfc_token, self.nfc)
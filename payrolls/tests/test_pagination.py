@@ -0,0 +1,105 @@
+from unittest.mock import patch
+from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import date, time, timedelta
+from decimal import Decimal
+from core.pagination import KeysetPagination
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from timers.models import Timer
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.periods = [
+            PayPeriod.objects.create(
+                start_date=date(2025, 1, 1) + timedelta(days=15 * index),
+                end_date=date(2025, 1, 15) + timedelta(days=15 * index),
+                is_closed=True,
+            )
+            for index in range(5)
+        ]
+
+        self.employees = []
+        for index in range(5):
+            employee = Employee.objects.create(
+                username=f"employee{index}",
+                salary_hour=Decimal("20.00"),
+            )
+            self.employees.append(employee)
+            SalaryRecord.objects.create(
+                employee=employee,
+                pay_period=self.periods[0],
+                total_hours=Decimal("40.00"),
+                extra_hours=Decimal("0"),
+                salary_to_pay=Decimal("800.00"),
+            )
+            for day in (0, 1):
+                Timer.objects.create(
+                    employee=employee, day=day, timeIn=time(8, 0), timeOut=time(16, 0)
+                )
+
+    def collect_pages(self, url, params):
+        """Recorre todas las páginas siguiendo el cursor 'next'"""
+        results = []
+        response = self.client.get(url, {**params, "page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            results.extend(response.data["results"])
+            if not response.data["next"]:
+                return results
+            response = self.client.get(response.data["next"])
+
+    def test_salary_records_pages_follow_cursor(self):
+        url = reverse("list-salary-records")
+        params = {"period_id": self.periods[0].id}
+
+        paged = self.collect_pages(url, params)
+        full = self.client.get(url, {**params, "paginate": "false"}).data
+
+        self.assertEqual([row["id"] for row in paged], [row["id"] for row in full])
+        self.assertEqual(len(full), 5)
+
+    def test_periods_are_paginated_newest_first(self):
+        url = reverse("manage-pay-period")
+
+        paged = self.collect_pages(url, {})
+        self.assertEqual(
+            [period["id"] for period in paged],
+            [period.id for period in reversed(self.periods)],
+        )
+
+        full = self.client.get(url, {"paginate": "false"})
+        self.assertIsInstance(full.data, list)
+        self.assertEqual(len(full.data), 5)
+
+    def test_employees_default_page_size(self):
+        """Sin page_size se usa el tamaño global configurado en PAGE_SIZE"""
+        with patch.object(KeysetPagination, "page_size", 4):
+            response = self.client.get(reverse("Crear y listar empleados"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_timers_paginated_by_employee(self):
+        """Los horarios de un empleado nunca quedan partidos entre páginas"""
+        paged = self.collect_pages(reverse("Crear y listar horarios"), {})
+
+        self.assertEqual(
+            [group["employee"] for group in paged],
+            [employee.id for employee in self.employees],
+        )
+        self.assertTrue(all(len(group["timers"]) == 2 for group in paged))
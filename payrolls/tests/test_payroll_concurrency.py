@@ -0,0 +1,65 @@
+from unittest import skipUnless
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import TransactionTestCase
+from datetime import datetime, date, time
+from decimal import Decimal
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from attendance.models import AttendanceRegister
+from payrolls.services.payroll_run import calculate_and_save_salary
+from django.utils import timezone
+
+
+@skipUnless(connection.vendor == "postgresql", "Requiere bloqueos reales de PostgreSQL")
+class ConcurrentPayrollRunTest(TransactionTestCase):
+    def setUp(self):
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        self.employees = []
+        for index in range(4):
+            employee = Employee.objects.create(
+                username=f"employee{index}",
+                salary_hour=Decimal("10.00"),
+                biweekly_hours=Decimal("96.0"),
+            )
+            self.employees.append(employee)
+
+            for day in range(1, 11):
+                day_date = date(2025, 1, day)
+                AttendanceRegister.objects.create(
+                    employee=employee,
+                    timestamp_in=timezone.make_aware(datetime.combine(day_date, time(8, 0))),
+                    timestamp_out=timezone.make_aware(datetime.combine(day_date, time(14, 0))),
+                    method="nfc",
+                )
+
+    def run_all(self, wait):
+        """Simula una ejecución de calculate-all sobre todos los empleados"""
+        try:
+            return [
+                calculate_and_save_salary(employee, self.period, wait=wait)
+                for employee in Employee.objects.filter(id__in=[e.id for e in self.employees])
+            ]
+        finally:
+            connection.close()
+
+    def test_parallel_runs_do_not_double_count(self):
+        """Ejecuciones simultáneas calculan cada empleado una sola vez"""
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            futures = [executor.submit(self.run_all, index % 2 == 0) for index in range(6)]
+            results = [result for future in futures for result in future.result()]
+
+        calculated = [result for result in results if "salary_record" in result]
+        self.assertEqual(len(calculated), len(self.employees))
+
+        for employee in self.employees:
+            record = SalaryRecord.objects.get(employee=employee, pay_period=self.period)
+            self.assertEqual(record.total_hours, Decimal("60.00"))
+            self.assertEqual(record.salary_to_pay, Decimal("600.00"))
+
+        self.assertFalse(AttendanceRegister.objects.filter(paid=False).exists())
@@ -0,0 +1,75 @@
+from django.test import TestCase
+from django.core.cache import cache
+from datetime import datetime, date, time
+from decimal import Decimal
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from attendance.models import AttendanceRegister, AttendanceDetail
+from payrolls.services.calculate_payroll import calculate_pay_to_go
+from payrolls.services.payroll_preview import preview_employee_pay, preview_period_pay
+from django.utils import timezone
+
+
+class PayrollPreviewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.employee = Employee.objects.create(
+            username="employee",
+            salary_hour=Decimal("20.00"),
+            biweekly_hours=Decimal("40.0"),
+            night_shift_factor=Decimal("1.2"),
+        )
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        for day in range(1, 7):
+            day_date = date(2025, 1, day)
+            AttendanceRegister.objects.create(
+                employee=self.employee,
+                timestamp_in=timezone.make_aware(datetime.combine(day_date, time(14, 0))),
+                timestamp_out=timezone.make_aware(datetime.combine(day_date, time(22, 30))),
+                method="nfc",
+            )
+
+    def test_preview_does_not_write(self):
+        """La vista previa no marca registros ni guarda detalles"""
+        preview = preview_employee_pay(
+            self.employee, self.period, apply_night_factor=True
+        )
+
+        self.assertEqual(len(preview["daily_details"]), 6)
+        self.assertFalse(AttendanceRegister.objects.filter(paid=True).exists())
+        self.assertFalse(AttendanceDetail.objects.exists())
+
+        result = calculate_pay_to_go(
+            self.employee, apply_night_factor=True, period_id=self.period.id
+        )
+        self.assertEqual(
+            preview["salary_to_pay"], str(result["salary_to_pay"].quantize(Decimal("0.01")))
+        )
+        self.assertEqual(
+            preview["extra_hours"], str(result["extra_hours"].quantize(Decimal("0.01")))
+        )
+
+    def test_preview_is_memoized_until_registers_change(self):
+        """Una segunda vista previa no vuelve a leer las marcas"""
+        first = preview_period_pay(self.period)
+
+        # Savepoint + agregado de versiones + empleados + horarios, sin leer las marcas
+        with self.assertNumQueries(5):
+            second = preview_period_pay(self.period)
+        self.assertEqual(first, second)
+
+        register = AttendanceRegister.objects.order_by("timestamp_in").first()
+        register.timestamp_out = timezone.make_aware(datetime(2025, 1, 1, 23, 30))
+        register.version += 1
+        register.save()
+
+        with self.assertNumQueries(6):
+            third = preview_period_pay(self.period)
+        self.assertNotEqual(first[0]["total_hours"], third[0]["total_hours"])
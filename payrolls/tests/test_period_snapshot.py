@@ -0,0 +1,105 @@
+from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import datetime, date, time
+from decimal import Decimal
+from employee.models import Employee
+from payrolls.models import PayPeriod, PayPeriodSnapshot
+from payrolls.services.payroll_run import calculate_and_save_salary
+from payrolls.services.period_snapshot import (
+    SNAPSHOT_CACHE_CONTROL,
+    discard_period_snapshot,
+)
+from attendance.models import AttendanceRegister
+from django.utils import timezone
+
+
+class PeriodSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.employee = Employee.objects.create(
+            username="employee",
+            first_name="Test",
+            last_name="User",
+            salary_hour=Decimal("20.00"),
+            biweekly_hours=Decimal("40.0"),
+        )
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        for day in range(1, 6):
+            day_date = date(2025, 1, day)
+            AttendanceRegister.objects.create(
+                employee=self.employee,
+                timestamp_in=timezone.make_aware(datetime.combine(day_date, time(14, 0))),
+                timestamp_out=timezone.make_aware(datetime.combine(day_date, time(23, 0))),
+                method="nfc",
+            )
+
+        calculate_and_save_salary(self.employee, self.period)
+
+    def report_requests(self):
+        params = {"period_id": self.period.id}
+        employee_params = {**params, "employee_id": self.employee.id}
+        # La foto guarda los listados completos, sin paginar
+        full_list = {**params, "paginate": "false"}
+        return [
+            (reverse("list-salary-records"), full_list),
+            (reverse("employee-attendance-details"), {**employee_params, "paginate": "false"}),
+            ("/v1/attendance/stats/", params),
+            (reverse("live-attendance-summary"), params),
+            (reverse("live-attendance-summary"), employee_params),
+        ]
+
+    def test_closing_period_freezes_reports(self):
+        """Los reportes de un período cerrado salen de la foto con una sola lectura"""
+        response = self.client.post(
+            reverse("manage-pay-period"), {"action": "close_current"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(PayPeriodSnapshot.objects.filter(pay_period=self.period).exists())
+
+        frozen = []
+        for url, params in self.report_requests():
+            with self.assertNumQueries(1):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Cache-Control"], SNAPSHOT_CACHE_CONTROL)
+            frozen.append(response.json())
+
+            revalidated = self.client.get(
+                url, params, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+            self.assertEqual(revalidated.status_code, 304)
+
+        # Sin foto, las vistas calculan exactamente la misma respuesta
+        discard_period_snapshot(self.period.id)
+        cache.clear()
+        live = [
+            self.client.get(url, params).json() for url, params in self.report_requests()
+        ]
+        self.assertEqual(frozen, live)
+        self.assertEqual(len(frozen[0]), 1)
+        self.assertEqual(len(frozen[1]), 5)
+
+    def test_open_period_is_not_frozen(self):
+        """Los períodos abiertos se siguen calculando y revalidando"""
+        response = self.client.get(
+            reverse("list-salary-records"), {"period_id": self.period.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Cache-Control", response)
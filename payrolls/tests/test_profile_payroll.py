@@ -0,0 +1,50 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from attendance.models import AttendanceRegister
+from benchmarks.profiling import profile_engine
+from benchmarks.workload import generate_workload
+from payrolls.models import SalaryRecord
+
+
+class ProfilePayrollTest(TestCase):
+    def setUp(self):
+        self.workload = generate_workload(employees=3, periods=1, seed=5, prefix="prof")
+        self.period = self.workload["active_period"]
+
+    def test_profile_engine(self):
+        result = profile_engine("calculate", self.period, top=5, include="*payrolls/*")
+
+        self.assertEqual(result["engine"], "calculate")
+        self.assertGreater(result["queries"], 0)
+        self.assertGreater(result["peak_kib"], 0)
+        self.assertLessEqual(len(result["hot_functions"]), 5)
+        self.assertTrue(
+            all("payrolls" in site["site"] for site in result["allocation_sites"])
+        )
+        # Los cálculos se revierten
+        self.assertFalse(SalaryRecord.objects.exists())
+        self.assertTrue(AttendanceRegister.objects.filter(paid=False).exists())
+
+    def test_compare_engines(self):
+        out = StringIO()
+        call_command(
+            "profile_payroll",
+            period_id=self.period.id,
+            compare="preview",
+            top=3,
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("RESUMEN", output)
+        self.assertIn("MOTOR calculate", output)
+        self.assertIn("MOTOR preview", output)
+        self.assertIn("tiempo: preview = x", output)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(CommandError):
+            call_command("profile_payroll", period_id=self.period.id, engine="nope")
+        with self.assertRaises(CommandError):
+            call_command("profile_payroll", period_id=0)
@@ -0,0 +1,329 @@
+"""
+Presupuesto de consultas SQL por endpoint.
+
+Cada URL de core/urls.py declara cuántas consultas puede hacer: una parte
+fija y, solo para los endpoints que escriben por empleado (cálculo de toda
+la planilla), una parte por empleado. Los reportes leen las marcas de todos
+los empleados con un número fijo de consultas. Se mide con la
+misma carga sintética a dos tamaños, con una fecha fija; el tamaño grande
+tiene más empleados y más turnos por empleado, así que una consulta por turno
+también rompe el presupuesto. Si un endpoint de presupuesto fijo hace más
+consultas con más datos, o uno se pasa de su presupuesto, el test falla
+mostrando la diferencia entre las consultas capturadas en cada tamaño.
+
+Un endpoint nuevo sin presupuesto también hace fallar los tests.
+"""
+import difflib
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attendance.models import AttendanceRegister
+from benchmarks.workload import generate_workload
+from employee.models import Employee
+from payrolls.services.payroll_run import calculate_and_save_salary
+from payrolls.models import SalaryRecord
+
+# (empleados, días transcurridos del período activo)
+SIZES = ((3, 3), (9, 12))
+PERIODS = 2
+NOW = timezone.make_aware(datetime(2025, 3, 12, 12, 0))
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+def url_routes(patterns=None, prefix=""):
+    """Rutas completas de core/urls.py ("v1/salary/records/<int:pk>/")"""
+    routes = []
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            routes.extend(url_routes(pattern.url_patterns, route))
+        elif isinstance(pattern, URLPattern):
+            routes.append(route)
+    return routes
+
+
+def normalize_sql(sql):
+    """Quita los valores de una consulta para agrupar las que son iguales"""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\((?:\s*\?\s*,?)+\)", "(...)", sql)
+    sql = re.sub(r"(\(\.\.\.\)(?:,\s*)?)+", "(...)", sql)
+    return sql
+
+
+def query_summary(queries):
+    counts = Counter(normalize_sql(query["sql"]) for query in queries)
+    return [f"{count:4d}x {sql}" for sql, count in sorted(counts.items())]
+
+
+def calculate_active_period(ctx):
+    for employee in ctx["employees"]:
+        calculate_and_save_salary(employee, ctx["period"])
+
+
+def open_register(ctx):
+    return AttendanceRegister.objects.create(
+        employee=ctx["employee"], timestamp_in=timezone.now(), method="nfc"
+    )
+
+
+def salary_record_detail(ctx):
+    calculate_active_period(ctx)
+    return {"pk": SalaryRecord.objects.filter(pay_period=ctx["period"]).first().pk}, None
+
+
+def correct_register(ctx):
+    register = (
+        AttendanceRegister.objects.filter(
+            employee=ctx["employee"], paid=False, timestamp_out__isnull=False
+        )
+        .order_by("timestamp_in")
+        .first()
+    )
+    timestamp_in = register.timestamp_in - timedelta(minutes=5)
+    return {"pk": register.pk}, {
+        "timestamp_in": timestamp_in.isoformat(),
+        "timestamp_out": register.timestamp_out.isoformat(),
+        "version": register.version,
+    }
+
+
+def mark_out(ctx):
+    open_register(ctx)
+    return {}, {"token": ctx["token"]}
+
+
+def period_params(ctx):
+    return {}, {"period_id": ctx["period"].id}
+
+
+def calculated_period_params(ctx):
+    calculate_active_period(ctx)
+    return period_params(ctx)
+
+
+def reset_period_params(ctx):
+    calculate_active_period(ctx)
+    return {}, {"period_id": ctx["period"].id, "employee_ids": "all"}
+
+
+def employee_details_params(ctx):
+    calculate_active_period(ctx)
+    return {}, {"period_id": ctx["period"].id, "employee_id": ctx["employee"].pk}
+
+
+# (método, ruta, preparar -> (kwargs de la ruta, datos), estado, fijo, por empleado)
+BUDGETS = [
+    ("get", "v1/employee/", lambda ctx: ({}, None), 200, 1, 0),
+    (
+        "post",
+        "v1/employee/",
+        lambda ctx: ({}, {"username": "nuevo", "salary_hour": "10.00"}),
+        201,
+        2,
+        0,
+    ),
+    ("get", "v1/employee/<int:pk>/", lambda ctx: ({"pk": ctx["employee"].pk}, None), 200, 1, 0),
+    ("get", "v1/employee/active/", lambda ctx: ({}, None), 200, 2, 0),
+    ("get", "v1/timer/", lambda ctx: ({}, None), 200, 2, 0),
+    ("get", "v1/timer/<int:pk>/", lambda ctx: ({"pk": ctx["timer"].pk}, None), 200, 1, 0),
+    (
+        "get",
+        "v1/timer/<int:employee_id>/timers/",
+        lambda ctx: ({"employee_id": ctx["employee"].pk}, None),
+        200,
+        1,
+        0,
+    ),
+    ("get", "v1/docs/", lambda ctx: ({}, None), 200, 0, 0),
+    ("get", "v1/docs/swagger/", lambda ctx: ({}, None), 200, 0, 0),
+    ("get", "v1/docs/redoc/", lambda ctx: ({}, None), 200, 0, 0),
+    ("post", "v1/attendance/in/", lambda ctx: ({}, {"token": ctx["token"]}), 201, 4, 0),
+    ("post", "v1/attendance/out/", mark_out, 201, 7, 0),
+    ("get", "v1/attendance/stats/", period_params, 200, 5, 0),
+    (
+        "get",
+        "v1/attendance/export/",
+        lambda ctx: ({}, {"start_date": "2000-01-01", "end_date": "2100-01-01"}),
+        200 if connection.vendor == "postgresql" else 400,
+        1,
+        0,
+    ),
+    ("patch", "v1/attendance/<int:pk>/", correct_register, 200, 8, 0),
+    ("post", "v1/auth/", lambda ctx: ({}, {"unique_pin": "9999"}), 200, 1, 0),
+    (
+        "post",
+        "v1/auth/nfc/create/",
+        lambda ctx: ({}, {"employee_id": ctx["employee"].pk, "tag_id": "nuevo"}),
+        201,
+        4,
+        0,
+    ),
+    ("post", "v1/auth/nfc/validate/", lambda ctx: ({}, {"token": ctx["token"]}), 200, 1, 0),
+    (
+        "post",
+        "v1/auth/nfc/revoke/<int:pk>/",
+        lambda ctx: ({"pk": ctx["nfc_token"].pk}, None),
+        200,
+        2,
+        0,
+    ),
+    (
+        "post",
+        "v1/salary/calculate/",
+        lambda ctx: ({}, {"employee_id": ctx["employee"].pk, "period_id": ctx["period"].id}),
+        201,
+        15,
+        0,
+    ),
+    ("get", "v1/salary/period/", lambda ctx: ({}, None), 200, 1, 0),
+    (
+        "post",
+        "v1/salary/period/",
+        lambda ctx: ({}, {"action": "close_current"}),
+        200,
+        18,
+        0,
+    ),
+    ("get", "v1/salary/night-hours/", period_params, 200, 4, 0),
+    # Calcula y guarda el salario de cada empleado en su propia transacción con
+    # su bloqueo (payroll_run): las escrituras son por empleado por diseño
+    ("get", "v1/salary/calculate-all/", period_params, 200, 3, 12),
+    ("get", "v1/salary/records/", calculated_period_params, 200, 1, 0),
+    ("get", "v1/salary/records/export/", calculated_period_params, 200, 2, 0),
+    ("get", "v1/salary/records/<int:pk>/", salary_record_detail, 200, 3, 0),
+    (
+        "get",
+        "v1/salary/attendance-details/",
+        employee_details_params,
+        200,
+        1,
+        0,
+    ),
+    ("get", "v1/salary/live-summary/", period_params, 200, 5, 0),
+    ("get", "v1/salary/preview/", period_params, 200, 7, 0),
+    (
+        "post",
+        "v1/salary/admin/reset-attendance/",
+        reset_period_params,
+        200,
+        11,
+        0,
+    ),
+    ("get", "v1/salary/admin/slow-queries/", lambda ctx: ({}, None), 200, 0, 0),
+    # Sin METRICS_TOKEN el endpoint de métricas no se expone
+    ("get", "v1/metrics/", lambda ctx: ({}, None), 404, 0, 0),
+]
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class QueryBudgetTest(TestCase):
+    def test_every_url_has_a_budget(self):
+        budgeted = {route for _, route, *_ in BUDGETS}
+        missing = [route for route in url_routes() if route not in budgeted]
+        self.assertEqual(
+            missing, [], "Endpoints sin presupuesto de consultas en BUDGETS"
+        )
+
+    def seed(self, employees, elapsed_days):
+        workload = generate_workload(
+            employees,
+            PERIODS,
+            seed=1,
+            prefix=f"budget{employees}",
+            now=NOW,
+            elapsed_days=elapsed_days,
+        )
+        employee = workload["employees"][0]
+        admin = Employee.objects.create(
+            username=f"budget-admin-{employees}",
+            is_admin=True,
+            is_staff=True,
+            salary_hour=employee.salary_hour,
+            unique_pin="9999",
+        )
+        return {
+            "employees": workload["employees"],
+            "employee": employee,
+            "timer": workload["timers"][0],
+            "period": workload["active_period"],
+            "nfc_token": workload["nfc_tokens"][0],
+            "token": workload["nfc_tokens"][0].token,
+            "admin": admin,
+        }
+
+    def request(self, client, method, route, prepare, ctx):
+        kwargs, data = prepare(ctx)
+        path = "/" + re.sub(
+            r"<(?:\w+:)?(\w+)>", lambda match: str(kwargs[match.group(1)]), route
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, method)(
+                path, data, **({} if method == "get" else {"format": "json"})
+            )
+            if response.streaming:
+                b"".join(response.streaming_content)
+        return response.status_code, queries.captured_queries
+
+    def measure(self, employees, elapsed_days):
+        """Consultas de cada endpoint con la carga del tamaño indicado"""
+        measured = {}
+        with transaction.atomic():
+            ctx = self.seed(employees, elapsed_days)
+            client = APIClient()
+            client.force_authenticate(user=ctx["admin"])
+            for method, route, prepare, *_ in BUDGETS:
+                # Cada endpoint parte de los mismos datos
+                with transaction.atomic():
+                    measured[(method, route)] = self.request(
+                        client, method, route, prepare, ctx
+                    )
+                    transaction.set_rollback(True)
+            transaction.set_rollback(True)
+        return measured
+
+    def test_query_budgets(self):
+        small, large = (self.measure(*size) for size in SIZES)
+
+        for method, route, _, expected_status, fixed, per_employee in BUDGETS:
+            with self.subTest(endpoint=f"{method.upper()} /{route}"):
+                small_status, small_queries = small[(method, route)]
+                large_status, large_queries = large[(method, route)]
+                self.assertEqual(small_status, expected_status)
+                self.assertEqual(large_status, expected_status)
+
+                diff = "\n".join(
+                    difflib.unified_diff(
+                        query_summary(small_queries),
+                        query_summary(large_queries),
+                        f"{SIZES[0][0]} empleados: {len(small_queries)} consultas",
+                        f"{SIZES[1][0]} empleados: {len(large_queries)} consultas",
+                        lineterm="",
+                    )
+                )
+                # Si no cambian entre tamaños se muestran las del tamaño grande
+                diff = diff or "\n".join(query_summary(large_queries))
+
+                if per_employee == 0:
+                    self.assertEqual(
+                        len(large_queries),
+                        len(small_queries),
+                        f"Las consultas crecen con los datos:\n{diff}",
+                    )
+                for (size, _), queries in zip(SIZES, (small_queries, large_queries)):
+                    budget = fixed + per_employee * size
+                    self.assertLessEqual(
+                        len(queries),
+                        budget,
+                        f"{len(queries)} consultas con {size} empleados, "
+                        f"presupuesto {budget}:\n{diff}",
+                    )
@@ -0,0 +1,198 @@
+"""
+Router de réplica de lectura.
+
+Los tests que leen de la réplica necesitan el alias configurado:
+    REPLICA_DATABASE_URL=sqlite:////tmp/replica.db python manage.py test payrolls.tests.test_read_replica
+En los tests la réplica es un espejo (TEST MIRROR) de la base de pruebas, una
+conexión distinta a la misma base: solo ve datos confirmados, por eso usan
+TransactionTestCase. Los TestCase corren dentro de una transacción y leen de
+la principal, así que el resto de la suite también pasa con la réplica
+configurada.
+"""
+from unittest import mock, skipUnless
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.claims import tokens_for_employee
+from core.db_router import (
+    REPLICA_ALIAS,
+    ReplicaRouter,
+    read_alias,
+    read_from_replica,
+    reset_replica_check,
+)
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+HAS_REPLICA = REPLICA_ALIAS in settings.DATABASES
+
+
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        reset_replica_check()
+
+    def test_writes_always_go_to_primary(self):
+        router = ReplicaRouter()
+        employee = Employee(username="leido")
+        employee._state.db = REPLICA_ALIAS
+
+        self.assertEqual(router.db_for_write(Employee, instance=employee), DEFAULT_DB_ALIAS)
+        self.assertFalse(router.allow_migrate(REPLICA_ALIAS, "employee"))
+        self.assertTrue(router.allow_migrate(DEFAULT_DB_ALIAS, "employee"))
+
+    def test_reads_outside_opt_in_use_default_routing(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(Employee))
+        self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+
+    def test_open_transaction_reads_primary(self):
+        """Dentro de la transacción del TestCase la réplica no vería los datos"""
+        with mock.patch("core.db_router.replica_available", return_value=True):
+            with read_from_replica() as alias:
+                self.assertEqual(alias, DEFAULT_DB_ALIAS)
+
+    @skipUnless(not HAS_REPLICA, "Con réplica configurada")
+    def test_without_replica_reads_primary(self):
+        with read_from_replica() as alias:
+            self.assertEqual(alias, DEFAULT_DB_ALIAS)
+            self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+
+
+@skipUnless(HAS_REPLICA, "Requiere REPLICA_DATABASE_URL")
+@override_settings(CACHES=DUMMY_CACHES, REPLICA_LAG_CHECK_INTERVAL=0)
+class ReadReplicaViewsTest(TransactionTestCase):
+    # El runner prepara las bases de todas las clases, aunque se omitan
+    databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS} if HAS_REPLICA else {DEFAULT_DB_ALIAS}
+
+    def setUp(self):
+        reset_replica_check()
+        self.client = APIClient()
+        self.admin = Employee.objects.create(
+            username="admin", is_admin=True, salary_hour=Decimal("40.00")
+        )
+        self.employee = Employee.objects.create(
+            username="employee", salary_hour=Decimal("20.00")
+        )
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 15)
+        )
+        SalaryRecord.objects.create(
+            employee=self.employee,
+            pay_period=self.period,
+            total_hours=Decimal("10.00"),
+            extra_hours=Decimal("0"),
+            salary_to_pay=Decimal("200.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def get_records(self):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, CaptureQueriesContext(
+            connections[REPLICA_ALIAS]
+        ) as replica:
+            response = self.client.get(
+                reverse("list-salary-records"),
+                {"period_id": self.period.id, "paginate": "false"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        return primary.captured_queries, replica.captured_queries
+
+    def test_report_reads_from_replica(self):
+        primary, replica = self.get_records()
+        self.assertEqual(primary, [])
+        self.assertTrue(replica)
+
+    def test_preview_reads_from_replica(self):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary:
+            response = self.client.get(
+                reverse("payroll-preview"), {"period_id": self.period.id}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(primary.captured_queries, [])
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        with override_settings(REPLICA_MAX_LAG_SECONDS=5), mock.patch(
+            "core.db_router.replication_lag", return_value=60.0
+        ):
+            primary, replica = self.get_records()
+        self.assertTrue(primary)
+        self.assertEqual(replica, [])
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        with mock.patch(
+            "core.db_router.replication_lag", side_effect=OperationalError("sin conexión")
+        ):
+            primary, replica = self.get_records()
+        self.assertTrue(primary)
+        self.assertEqual(replica, [])
+
+    def get_live_summary(self):
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica:
+            response = self.client.get(
+                reverse("live-attendance-summary"), {"period_id": self.period.id}
+            )
+        self.assertEqual(response.status_code, 200)
+        return response, replica.captured_queries
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_replica_responses_cached_without_validators(self):
+        """La respuesta de la réplica se reutiliza, pero no se ofrece para GET condicionales"""
+        first, replica = self.get_live_summary()
+        self.assertTrue(replica)
+        self.assertNotIn("ETag", first)
+
+        # Solo queda la búsqueda del snapshot del período; el reporte no se recalcula
+        second, replica = self.get_live_summary()
+        self.assertFalse(
+            any("attendanceregister" in query["sql"] for query in replica)
+        )
+        self.assertEqual(second.json(), first.json())
+        self.assertNotIn("ETag", second)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+        REPLICA_MAX_LAG_SECONDS=0,
+    )
+    def test_replica_responses_bounded_by_max_lag(self):
+        """Sin retraso tolerado la respuesta de la réplica no se guarda"""
+        for _ in range(2):
+            response, replica = self.get_live_summary()
+            self.assertTrue(
+                any("attendanceregister" in query["sql"] for query in replica)
+            )
+            self.assertNotIn("ETag", response)
+
+    def test_token_revocation_read_from_primary(self):
+        """Una revocación recién hecha no depende del retraso de la réplica"""
+        self.client.force_authenticate(user=None)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {tokens_for_employee(self.admin).access_token}"
+        )
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica:
+            response = self.client.get(
+                reverse("list-salary-records"),
+                {"period_id": self.period.id, "paginate": "false"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica.captured_queries)
+        self.assertFalse(
+            any("tokenrevocation" in query["sql"] for query in replica.captured_queries)
+        )
+
+    def test_kiosk_writes_stay_on_primary(self):
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica:
+            response = self.client.post(
+                "/v1/auth/nfc/create/",
+                {"employee_id": self.employee.pk, "tag_id": "tag"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(replica.captured_queries, [])
@@ -0,0 +1,104 @@
+from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import datetime, date, time
+from decimal import Decimal
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from attendance.models import AttendanceRegister
+from timers.models import Timer
+from django.utils import timezone
+
+
+class ReportCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.employee = Employee.objects.create(
+            username="employee",
+            first_name="Test",
+            last_name="User",
+            salary_hour=Decimal("20.00"),
+        )
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        self.create_register(date(2025, 1, 2))
+
+    def create_register(self, day_date):
+        return AttendanceRegister.objects.create(
+            employee=self.employee,
+            timestamp_in=timezone.make_aware(datetime.combine(day_date, time(18, 0))),
+            timestamp_out=timezone.make_aware(datetime.combine(day_date, time(23, 0))),
+            method="nfc",
+        )
+
+    def test_repeated_polls_hit_cache(self):
+        """Las consultas repetidas no tocan la base de datos"""
+        url = reverse("list-night-hours")
+        first = self.client.get(url, {"period_id": self.period.id})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {"period_id": self.period.id})
+        self.assertEqual(first.data, second.data)
+
+    def test_attendance_write_invalidates_period_reports(self):
+        """Una nueva marca en el período invalida sus reportes"""
+        url = reverse("live-attendance-summary")
+        first = self.client.get(url, {"period_id": self.period.id})
+        self.assertEqual(first.data["employees"][0]["total_hours"], "5.00")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_register(date(2025, 1, 3))
+
+        second = self.client.get(url, {"period_id": self.period.id})
+        self.assertEqual(second.data["employees"][0]["total_hours"], "10.00")
+
+    def test_timer_write_invalidates_timer_list(self):
+        """Crear un horario invalida el listado de horarios"""
+        url = reverse("Crear y listar horarios")
+        self.assertEqual(self.client.get(url).data["results"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Timer.objects.create(
+                employee=self.employee, day=1, timeIn=time(8, 0), timeOut=time(16, 0)
+            )
+
+        self.assertEqual(len(self.client.get(url).data["results"]), 1)
+
+    def test_conditional_get_returns_not_modified(self):
+        """Un If-None-Match vigente se responde con 304 sin consultar la base"""
+        url = reverse("Empleados trabajando actualmente")
+        first = self.client.get(url)
+        self.assertIn("ETag", first)
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AttendanceRegister.objects.create(
+                employee=self.employee,
+                timestamp_in=timezone.now(),
+                method="nfc",
+            )
+
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third["ETag"], first["ETag"])
+        self.assertEqual(len(third.data), 1)
@@ -0,0 +1,95 @@
+from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import datetime, date, time
+from decimal import Decimal
+import json
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from attendance.models import AttendanceRegister
+from django.utils import timezone
+
+
+class ReportFormatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        for index in range(3):
+            employee = Employee.objects.create(
+                username=f"employee{index}",
+                first_name="Empleado",
+                last_name=str(index),
+                salary_hour=Decimal("20.00"),
+            )
+            for day in range(1, index + 2):
+                day_date = date(2025, 1, day)
+                AttendanceRegister.objects.create(
+                    employee=employee,
+                    timestamp_in=timezone.make_aware(datetime.combine(day_date, time(8, 0))),
+                    timestamp_out=timezone.make_aware(datetime.combine(day_date, time(16, 0))),
+                    method="nfc",
+                )
+
+    def test_sparse_fieldset(self):
+        """?fields= deja solo los campos pedidos en cada fila"""
+        url = reverse("live-attendance-summary")
+        full = self.client.get(url, {"period_id": self.period.id})
+        sparse = self.client.get(
+            url, {"period_id": self.period.id, "fields": "employee_id,total_hours"}
+        )
+
+        self.assertEqual(sparse.status_code, 200)
+        self.assertEqual(sparse.data["period"], full.data["period"])
+        self.assertEqual(
+            sparse.data["employees"],
+            [
+                {"employee_id": row["employee_id"], "total_hours": row["total_hours"]}
+                for row in full.data["employees"]
+            ],
+        )
+        self.assertLess(len(sparse.content), len(full.content))
+
+    def test_columnar_format(self):
+        """?format=columnar devuelve un arreglo por campo"""
+        response = self.client.get(
+            "/v1/attendance/stats/",
+            {
+                "period_id": self.period.id,
+                "fields": "username,total_hours",
+                "format": "columnar",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        body = json.loads(response.content)
+        self.assertEqual(
+            body["stats"],
+            {
+                "username": ["employee2", "employee1", "employee0"],
+                "total_hours": [24.0, 16.0, 8.0],
+            },
+        )
+        self.assertEqual(body["pay_period"]["id"], self.period.id)
+
+    def test_columnar_paginated_list(self):
+        response = self.client.get(
+            reverse("list-salary-records"),
+            {"period_id": self.period.id, "format": "columnar"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["results"], [])
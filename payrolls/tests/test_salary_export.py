@@ -0,0 +1,97 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import date
+from decimal import Decimal
+import csv
+import io
+import json
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from payrolls.serializers import SalaryRecordSerializer
+from payrolls.services.salary_export import SALARY_EXPORT_FIELDS, stream_salary_ndjson
+
+
+class SalaryExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=True,
+        )
+
+        for index in range(5):
+            employee = Employee.objects.create(
+                username=f"employee{index}",
+                first_name="Empleado",
+                last_name=str(index),
+                salary_hour=Decimal("20.00"),
+            )
+            SalaryRecord.objects.create(
+                employee=employee,
+                pay_period=self.period,
+                total_hours=Decimal("50.50"),
+                regular_hours=Decimal("40.00"),
+                night_hours=Decimal(index),
+                extra_hours=Decimal("10.50"),
+                lunch_deduction_hours=Decimal("3.00"),
+                gross_salary=Decimal("1115.00"),
+                salary_to_pay=Decimal("1055.00"),
+                other_deductions_description="Adelanto" if index % 2 else None,
+            )
+
+    def expected_rows(self):
+        records = SalaryRecord.objects.filter(pay_period=self.period).order_by("id")
+        return json.loads(
+            json.dumps(SalaryRecordSerializer(records, many=True).data)
+        )
+
+    def test_ndjson_matches_serializer(self):
+        """Cada línea tiene el mismo contenido que SalaryRecordSerializer"""
+        response = self.client.get(
+            reverse("export-salary-records"),
+            {"period_id": self.period.id, "output": "ndjson"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        content = b"".join(response.streaming_content).decode("utf-8")
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(rows, self.expected_rows())
+
+    def test_csv_export(self):
+        """El CSV lleva encabezado y una fila por registro"""
+        response = self.client.get(
+            reverse("export-salary-records"), {"period_id": self.period.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+
+        content = b"".join(response.streaming_content).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(list(rows[0].keys()), list(SALARY_EXPORT_FIELDS))
+        self.assertEqual(
+            [row["salary_to_pay"] for row in rows],
+            [row["salary_to_pay"] for row in self.expected_rows()],
+        )
+
+    def test_export_reads_in_chunks(self):
+        """La exportación es una sola consulta por bloques, sin una por fila"""
+        with self.assertNumQueries(1):
+            lines = list(stream_salary_ndjson(self.period.id, chunk_size=2))
+        self.assertEqual(len(lines), 5)
+
+    def test_invalid_period(self):
+        response = self.client.get(
+            reverse("export-salary-records"), {"period_id": 999}
+        )
+        self.assertEqual(response.status_code, 400)
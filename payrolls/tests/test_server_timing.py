@@ -0,0 +1,100 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from django.urls import reverse
+from datetime import date
+from decimal import Decimal
+import json
+import re
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+
+
+@override_settings(SERVER_TIMING_ENABLED=True, SERVER_TIMING_SAMPLE_RATE=1.0)
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.employee = Employee.objects.create(
+            username="employee",
+            first_name="Ana",
+            last_name="Mora",
+            salary_hour=Decimal("20.00"),
+        )
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 15)
+        )
+        SalaryRecord.objects.create(
+            employee=self.employee,
+            pay_period=self.period,
+            total_hours=Decimal("10.00"),
+            extra_hours=Decimal("0"),
+            salary_to_pay=Decimal("200.00"),
+        )
+
+    def timings(self, response):
+        return {
+            match.group(1): match
+            for match in re.finditer(
+                r'(\w+);dur=([\d.]+)(?:;desc="(\d+) consultas")?',
+                response["Server-Timing"],
+            )
+        }
+
+    def test_server_timing_header(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            reverse("salary-record-detail", args=[SalaryRecord.objects.get().pk])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {"sql", "serializer", "total"})
+        # El detalle lee el registro y el serializer el empleado y el período
+        self.assertEqual(timings["sql"].group(3), "3")
+        self.assertGreater(float(timings["serializer"].group(2)), 0)
+        self.assertGreaterEqual(
+            float(timings["total"].group(2)), float(timings["sql"].group(2))
+        )
+        self.assertNotIn("X-Debug-Queries", response)
+
+    def test_slow_queries_report_for_admins(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            reverse("list-salary-records"),
+            {"period_id": self.period.id},
+            HTTP_X_DEBUG_QUERIES="2",
+        )
+
+        report = json.loads(response["X-Debug-Queries"])
+        self.assertEqual(report["view"], "payrolls.views.ListSalaryRecordsByPeriod")
+        self.assertEqual(len(report["queries"]), 1)
+        self.assertIn("payrolls_salaryrecord", report["queries"][0]["sql"])
+        self.assertEqual(report["queries"][0]["db"], "default")
+
+    def test_slow_queries_report_hidden_from_employees(self):
+        self.client.force_authenticate(user=self.employee)
+        response = self.client.get(
+            reverse("list-salary-records"),
+            {"period_id": self.period.id},
+            HTTP_X_DEBUG_QUERIES="5",
+        )
+
+        self.assertIn("Server-Timing", response)
+        self.assertNotIn("X-Debug-Queries", response)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_untouched(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("list-salary-records"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("list-salary-records"))
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,156 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+from datetime import datetime, date, time
+from decimal import Decimal
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+from attendance.models import AttendanceRegister, AttendanceDetail
+from payrolls.services.calculate_payroll import calculate_pay_to_go
+from django.utils import timezone
+
+
+class ShiftCorrectionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        self.employee = Employee.objects.create(
+            username="employee",
+            salary_hour=Decimal("20.00"),
+            biweekly_hours=Decimal("40.0"),
+        )
+
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 15),
+            is_closed=False,
+        )
+
+        for day in range(1, 7):
+            day_date = date(2025, 1, day)
+            AttendanceRegister.objects.create(
+                employee=self.employee,
+                timestamp_in=timezone.make_aware(datetime.combine(day_date, time(8, 0))),
+                timestamp_out=timezone.make_aware(datetime.combine(day_date, time(16, 0))),
+                method="nfc",
+            )
+
+        self.pay_with_record(self.period)
+
+    def pay_with_record(self, period):
+        result = calculate_pay_to_go(self.employee, period_id=period.id)
+        SalaryRecord.objects.update_or_create(
+            employee=self.employee,
+            pay_period=period,
+            defaults={
+                key: result[key]
+                for key in (
+                    "total_hours",
+                    "regular_hours",
+                    "night_hours",
+                    "extra_hours",
+                    "night_shift_factor_applied",
+                    "gross_salary",
+                    "lunch_deduction_hours",
+                    "other_deductions",
+                    "salary_to_pay",
+                )
+            },
+        )
+        return result
+
+    def test_correction_matches_full_recalculation(self):
+        """Corregir un turno pagado da el mismo salario que recalcular todo"""
+        register = AttendanceRegister.objects.get(timestamp_in__date=date(2025, 1, 3))
+        new_out = timezone.make_aware(datetime(2025, 1, 3, 20, 0))
+
+        url = reverse("attendance-register-correction", args=[register.id])
+        response = self.client.patch(
+            url,
+            {
+                "timestamp_in": register.timestamp_in.isoformat(),
+                "timestamp_out": new_out.isoformat(),
+                "version": register.version,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["register"]["version"], 1)
+        self.assertEqual(response.data["recalculated_dates"], ["2025-01-03"])
+
+        corrected = SalaryRecord.objects.get(employee=self.employee)
+        detail = AttendanceDetail.objects.get(work_date=date(2025, 1, 3))
+        self.assertEqual(detail.time_out, time(20, 0))
+
+        # Recalcular todo el período desde cero con el flujo tradicional
+        AttendanceRegister.objects.update(paid=False)
+        AttendanceDetail.objects.all().delete()
+        full = self.pay_with_record(self.period)
+
+        self.assertEqual(corrected.total_hours, full["total_hours"])
+        self.assertEqual(corrected.extra_hours, full["extra_hours"])
+        self.assertEqual(corrected.lunch_deduction_hours, full["lunch_deduction_hours"])
+        self.assertEqual(
+            corrected.salary_to_pay, Decimal(full["salary_to_pay"]).quantize(Decimal("0.01"))
+        )
+
+    def test_stale_version_returns_conflict(self):
+        """Una versión desactualizada responde 409 sin modificar el registro"""
+        register = AttendanceRegister.objects.get(timestamp_in__date=date(2025, 1, 2))
+        AttendanceRegister.objects.filter(pk=register.pk).update(version=3)
+
+        url = reverse("attendance-register-correction", args=[register.id])
+        response = self.client.patch(
+            url,
+            {
+                "timestamp_in": register.timestamp_in.isoformat(),
+                "timestamp_out": timezone.make_aware(datetime(2025, 1, 2, 18, 0)).isoformat(),
+                "version": 0,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["current"]["version"], 3)
+        register.refresh_from_db()
+        self.assertEqual(register.timestamp_out, timezone.make_aware(datetime(2025, 1, 2, 16, 0)))
+
+    def test_closed_period_marks_are_rejected(self):
+        """No se corrigen marcas de un período cerrado, pagadas o no, ni se mueven a uno"""
+        PayPeriod.objects.create(
+            start_date=date(2024, 12, 16),
+            end_date=date(2024, 12, 31),
+            is_closed=True,
+        )
+        unpaid = AttendanceRegister.objects.create(
+            employee=self.employee,
+            timestamp_in=timezone.make_aware(datetime(2024, 12, 20, 8, 0)),
+            timestamp_out=timezone.make_aware(datetime(2024, 12, 20, 16, 0)),
+            method="nfc",
+        )
+        moved = AttendanceRegister.objects.create(
+            employee=self.employee,
+            timestamp_in=timezone.make_aware(datetime(2025, 1, 20, 8, 0)),
+            method="nfc",
+        )
+
+        for register, timestamp_in in (
+            (unpaid, unpaid.timestamp_in),
+            (moved, timezone.make_aware(datetime(2024, 12, 30, 8, 0))),
+        ):
+            response = self.client.patch(
+                reverse("attendance-register-correction", args=[register.id]),
+                {"timestamp_in": timestamp_in.isoformat(), "version": 0},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            register.refresh_from_db()
+            self.assertEqual(register.version, 0)
@@ -0,0 +1,165 @@
+"""
+Turnos como rangos de tiempo.
+
+Los helpers dan el mismo resultado en cualquier motor; la columna, el índice
+GiST y la restricción de exclusión solo existen en PostgreSQL:
+    DATABASE_URL=postgresql://... python manage.py test payrolls.tests.test_shift_ranges
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attendance.models import AttendanceRegister
+from authentication.models import NFCToken
+from employee.models import Employee
+from payrolls.models import PayPeriod
+from payrolls.services.attendance_partitions import create_partition, partition_name
+from payrolls.services.shift_ranges import (
+    CONSTRAINT_SUFFIX,
+    find_overlapping_shifts,
+    headcount_at,
+    is_overlap_violation,
+    on_shift_at,
+    overlapping,
+)
+
+IS_POSTGRES = connection.vendor == "postgresql"
+
+
+def local(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+class ShiftRangeTestMixin:
+    def setUp(self):
+        self.juan = Employee.objects.create(username="juan", salary_hour=Decimal("20.00"))
+        self.ana = Employee.objects.create(username="ana", salary_hour=Decimal("20.00"))
+
+    def shift(self, employee, timestamp_in, timestamp_out=None):
+        return AttendanceRegister.objects.create(
+            employee=employee,
+            timestamp_in=timestamp_in,
+            timestamp_out=timestamp_out,
+            method="nfc",
+        )
+
+
+class ShiftRangeQueriesTest(ShiftRangeTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        day = date(2025, 1, 7)
+        self.night = self.shift(self.juan, local(day, 19), local(day + timedelta(days=1), 6))
+        self.morning = self.shift(self.ana, local(day + timedelta(days=1), 6), local(day + timedelta(days=1), 14))
+        self.open = self.shift(self.ana, local(day + timedelta(days=2), 8))
+
+    def test_on_shift_at(self):
+        self.assertEqual(list(on_shift_at(local(date(2025, 1, 8), 2, 15))), [self.night])
+        # El fin del rango se excluye: a las 06:00 ya cambió el turno
+        self.assertEqual(list(on_shift_at(local(date(2025, 1, 8), 6))), [self.morning])
+        self.assertEqual(list(on_shift_at(local(date(2025, 2, 1), 12))), [self.open])
+        self.assertEqual(headcount_at(local(date(2025, 1, 8), 2, 15)), 1)
+
+    def test_on_shift_at_chains_with_querysets(self):
+        queryset = AttendanceRegister.objects.filter(employee=self.ana)
+        self.assertFalse(on_shift_at(local(date(2025, 1, 8), 2, 15), queryset).exists())
+
+    def test_overlapping(self):
+        registers = overlapping(local(date(2025, 1, 8), 5), local(date(2025, 1, 8), 7))
+        self.assertEqual(set(registers), {self.night, self.morning})
+        self.assertEqual(
+            list(overlapping(local(date(2025, 1, 20), 0), local(date(2025, 1, 21), 0))),
+            [self.open],
+        )
+
+    def test_audit_reports_open_shift_overlaps(self):
+        # Un turno abierto no está cubierto por la restricción
+        forgotten = self.shift(self.juan, local(date(2025, 1, 7), 8))
+
+        self.assertEqual(
+            find_overlapping_shifts(), [(self.night.id, forgotten.id, self.juan.id)]
+        )
+        self.assertEqual(find_overlapping_shifts(include_open=False), [])
+
+        period = PayPeriod.objects.create(start_date=date(2025, 1, 1), end_date=date(2025, 1, 15))
+        self.assertEqual(len(find_overlapping_shifts(pay_period=period)), 1)
+
+
+@skipUnless(IS_POSTGRES, "Requiere PostgreSQL")
+class ShiftExclusionConstraintTest(ShiftRangeTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.existing = self.shift(self.juan, local(date(2025, 1, 7), 8), local(date(2025, 1, 7), 16))
+
+    def test_overlapping_closed_shift_is_rejected(self):
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            self.shift(self.juan, local(date(2025, 1, 7), 15), local(date(2025, 1, 7), 20))
+        self.assertTrue(is_overlap_violation(raised.exception))
+
+        # Turnos contiguos, de otro empleado o abiertos sí se permiten
+        self.shift(self.juan, local(date(2025, 1, 7), 16), local(date(2025, 1, 7), 20))
+        self.shift(self.ana, local(date(2025, 1, 7), 9), local(date(2025, 1, 7), 17))
+        self.shift(self.juan, local(date(2025, 1, 7), 10))
+
+    def test_new_partitions_get_the_constraint(self):
+        create_partition(date(2034, 3, 1))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'x'",
+                [partition_name(date(2034, 3, 1))],
+            )
+            self.assertEqual(
+                [row[0] for row in cursor.fetchall()],
+                [f"{partition_name(date(2034, 3, 1))}_{CONSTRAINT_SUFFIX}"],
+            )
+
+    def test_point_in_time_query_uses_the_gist_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = on_shift_at(local(date(2025, 1, 7), 12)).explain()
+        self.assertIn("shift_range", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_mark_out_overlapping_a_closed_shift(self):
+        # Entrada olvidada antes del turno cerrado: la salida de hoy lo cruzaría
+        self.shift(self.juan, local(date(2025, 1, 6), 8))
+        nfc = NFCToken(employee=self.juan, tag_id="tag")
+        nfc.generate_token()
+        nfc.save()
+
+        with mock.patch.object(
+            Employee, "get_current_timestamp", return_value=local(date(2025, 1, 7), 18)
+        ):
+            response = APIClient().post(
+                "/v1/attendance/out/", {"token": nfc.token}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cruza", response.data["error"])
+
+    def test_correction_overlapping_a_closed_shift(self):
+        other = self.shift(self.juan, local(date(2025, 1, 8), 8), local(date(2025, 1, 8), 16))
+        client = APIClient()
+        client.force_authenticate(
+            user=Employee.objects.create(
+                username="admin", is_admin=True, salary_hour=Decimal("40.00")
+            )
+        )
+
+        response = client.patch(
+            f"/v1/attendance/{other.pk}/",
+            {
+                "timestamp_in": local(date(2025, 1, 7), 12).isoformat(),
+                "timestamp_out": local(date(2025, 1, 7), 18).isoformat(),
+                "version": 0,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        other.refresh_from_db()
+        self.assertEqual(other.version, 0)
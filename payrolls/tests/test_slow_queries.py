@@ -0,0 +1,128 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date
+from decimal import Decimal
+from core.slow_queries import explain_statement, record_capture, recent_captures
+from employee.models import Employee
+from payrolls.models import PayPeriod, SalaryRecord
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "slow-queries-tests",
+    }
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    SLOW_QUERY_CAPTURE_ENABLED=True,
+    SLOW_QUERY_REQUEST_MS=0,
+    SLOW_QUERY_STATEMENT_MS=0,
+    SLOW_QUERY_TOP=2,
+    SLOW_QUERY_BUFFER_SIZE=3,
+)
+class SlowQueryCaptureTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.admin = Employee.objects.create(
+            username="admin",
+            is_admin=True,
+            salary_hour=Decimal("40.00"),
+        )
+        self.employee = Employee.objects.create(
+            username="employee",
+            salary_hour=Decimal("20.00"),
+        )
+        self.period = PayPeriod.objects.create(
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 15)
+        )
+        SalaryRecord.objects.create(
+            employee=self.employee,
+            pay_period=self.period,
+            total_hours=Decimal("10.00"),
+            extra_hours=Decimal("0"),
+            salary_to_pay=Decimal("200.00"),
+        )
+
+    def test_captures_plans_of_slowest_selects(self):
+        self.client.force_authenticate(user=self.admin)
+        self.client.get(reverse("list-salary-records"), {"period_id": self.period.id})
+
+        response = self.client.get(reverse("slow-query-captures"))
+
+        self.assertEqual(response.status_code, 200)
+        capture = response.data["captures"][-1]
+        self.assertEqual(capture["path"], reverse("list-salary-records"))
+        self.assertEqual(capture["view"], "payrolls.views.ListSalaryRecordsByPeriod")
+        self.assertLessEqual(len(capture["statements"]), 2)
+        statement = capture["statements"][0]
+        self.assertTrue(statement["sql"].lstrip().upper().startswith("SELECT"))
+        self.assertEqual(statement["explained_on"], "default")
+        self.assertTrue(statement["plan"])
+        # Los parámetros no se guardan
+        self.assertIn("%s", statement["sql"])
+
+    def test_same_statement_explained_once(self):
+        self.client.force_authenticate(user=self.admin)
+        for _ in range(2):
+            self.client.get(reverse("list-salary-records"), {"period_id": self.period.id})
+
+        paths = [capture["path"] for capture in recent_captures()]
+        self.assertEqual(paths.count(reverse("list-salary-records")), 1)
+
+    def test_writes_are_not_explained(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.patch(
+            f"/v1/employee/{self.employee.pk}/",
+            {"first_name": "Ana"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        for capture in recent_captures():
+            for statement in capture["statements"]:
+                self.assertTrue(statement["sql"].lstrip().upper().startswith(("SELECT", "WITH")))
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).first_name, "Ana")
+
+    def test_locking_statements_not_analyzed(self):
+        """Volver a ejecutar un bloqueo haría esperar a la petición dos veces"""
+        table = Employee._meta.db_table
+        locking = (
+            f"SELECT id FROM {table} WHERE id = %s FOR UPDATE",
+            f"SELECT id FROM {table} WHERE id = %s FOR NO KEY UPDATE",
+            f"SELECT id FROM {table} WHERE id = %s FOR SHARE",
+            "SELECT pg_advisory_xact_lock(%s)",
+        )
+        for sql in locking:
+            with CaptureQueriesContext(connection) as queries:
+                explain_statement("default", sql, [self.employee.pk])
+            self.assertFalse(
+                any("ANALYZE" in query["sql"].upper() for query in queries.captured_queries),
+                sql,
+            )
+
+    def test_ring_buffer_is_bounded(self):
+        for index in range(5):
+            record_capture({"path": f"/{index}/", "statements": []})
+
+        self.assertEqual(
+            [capture["path"] for capture in recent_captures()], ["/4/", "/3/", "/2/"]
+        )
+
+    def test_admins_only(self):
+        self.client.force_authenticate(user=self.employee)
+        response = self.client.get(reverse("slow-query-captures"))
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(user=self.admin)
+        record_capture({"path": "/x/", "statements": []})
+        response = self.client.delete(reverse("slow-query-captures"))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(recent_captures(), [])
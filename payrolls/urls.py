@@ -5,11 +5,13 @@ from payrolls.views import (
     ListEmployeesWithNightHours,
     CalculateAllSalaries,
     ListSalaryRecordsByPeriod,
+    ExportSalaryRecordsView,
     SalaryRecordEmployeeDetail,
     EmployeeAttendanceDetailView,
     LiveAttendanceSummaryView,
+    PayrollPreviewView,
 )
-from payrolls.views_admin import ResetAttendancePaidStatusView
+from payrolls.views_admin import ResetAttendancePaidStatusView, SlowQueryCapturesView
 
 urlpatterns = [
     path("calculate/", CalculateSalary.as_view(), name="calculate-salary"),
@@ -21,6 +23,12 @@ urlpatterns = [
         "calculate-all/", CalculateAllSalaries.as_view(), name="calculate-all-salaries"
     ),
     path("records/", ListSalaryRecordsByPeriod.as_view(), name="list-salary-records"),
+    # Exportación en streaming (CSV o NDJSON) de los registros de un período
+    path(
+        "records/export/",
+        ExportSalaryRecordsView.as_view(),
+        name="export-salary-records",
+    ),
     path(
         "records/<int:pk>/",
         SalaryRecordEmployeeDetail.as_view(),
@@ -37,10 +45,17 @@ urlpatterns = [
         LiveAttendanceSummaryView.as_view(),
         name="live-attendance-summary",
     ),
+    # Vista previa del cálculo de salario (sin marcar registros como pagados)
+    path("preview/", PayrollPreviewView.as_view(), name="payroll-preview"),
     # Endpoints administrativos (solo para staff/superuser)
     path(
         "admin/reset-attendance/",
         ResetAttendancePaidStatusView.as_view(),
         name="reset-attendance-paid-status",
     ),
+    path(
+        "admin/slow-queries/",
+        SlowQueryCapturesView.as_view(),
+        name="slow-query-captures",
+    ),
 ]
@@ -3,8 +3,38 @@ from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
 from rest_framework import status
 from rest_framework.views import APIView
+from core.db_router import ReplicaReadMixin, read_alias
+from core.metrics import RUN_SECONDS
+from core.pagination import KeysetPagination, pagination_disabled
+from core.report_cache import cached_report, period_report_tags
+from core.response_formats import ReportFormatsMixin
 from employee.models import Employee
-from payrolls.services.calculate_payroll import calculate_pay_to_go, calculate_night_hours
+from payrolls.services.calculate_payroll import (
+    active_timers_prefetch,
+    calculate_night_hours,
+    index_timers_by_day,
+)
+from payrolls.services.payroll_preview import preview_period_pay
+from payrolls.services.period_reports import (
+    live_attendance_summary,
+    period_employees,
+    period_registers_prefetch,
+    period_summary_header,
+)
+from payrolls.services.payroll_run import calculate_and_save_salary
+from payrolls.services.row_encoders import (
+    attendance_detail_values,
+    encode_attendance_detail_row,
+    encode_salary_row,
+    salary_record_values,
+)
+from payrolls.services.salary_export import stream_salary_csv, stream_salary_ndjson
+from payrolls.services.period_snapshot import (
+    build_period_snapshot,
+    employee_attendance_details,
+    employee_live_summary,
+    serve_period_snapshot,
+)
 from payrolls.models import SalaryRecord, PayPeriod
 from payrolls.serializers import (
     SalaryRecordSerializer,
@@ -12,13 +42,19 @@ from payrolls.serializers import (
     SalaryCalculationSerializer,
     EmployeeNightHoursSerializer,
     CalculateAllSalariesSerializer,
+    PayrollPreviewSerializer,
 )
 from datetime import date, timedelta
+from django.http import StreamingHttpResponse
 from attendance.models import AttendanceRegister
 from django.utils.timezone import localtime
-from timers.models import Timer
 from decimal import Decimal
 
+EXPORT_FORMATS = {
+    "csv": (stream_salary_csv, "text/csv; charset=utf-8"),
+    "ndjson": (stream_salary_ndjson, "application/x-ndjson; charset=utf-8"),
+}
+
 
 class CalculateSalary(generics.CreateAPIView):
     serializer_class = SalaryCalculationSerializer
@@ -95,57 +131,23 @@ class CalculateSalary(generics.CreateAPIView):
                 "previous_salary": str(salary_record.salary_to_pay),
             })
 
-        # Llamamos a la función que calcula el salario con el period_id si se proporcionó
-        salary_data = calculate_pay_to_go(
+        # Calculamos y guardamos el salario bloqueando (empleado, período) para que
+        # otra ejecución simultánea no procese las mismas marcas
+        result = calculate_and_save_salary(
             employee,
-            apply_night_factor,
-            period_id,
-            other_deductions,
-            other_deductions_description,
+            pay_period,
+            apply_night_factor=apply_night_factor,
+            other_deductions=other_deductions,
+            other_deductions_description=other_deductions_description,
         )
 
-        if "error" in salary_data:
+        if "error" in result:
             return Response(
-                {"error": salary_data["error"]},
+                {"error": result["error"]},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if salary_record:
-            # Si ya existe, actualizamos los campos
-            salary_record.total_hours = salary_data["total_hours"]
-            salary_record.regular_hours = salary_data["regular_hours"]
-            salary_record.night_hours = salary_data["night_hours"]
-            salary_record.extra_hours = salary_data["extra_hours"]
-            salary_record.night_shift_factor_applied = salary_data[
-                "night_shift_factor_applied"
-            ]
-            salary_record.gross_salary = salary_data["gross_salary"]
-            salary_record.lunch_deduction_hours = salary_data["lunch_deduction_hours"]
-            salary_record.other_deductions = salary_data["other_deductions"]
-            salary_record.other_deductions_description = salary_data[
-                "other_deductions_description"
-            ]
-            salary_record.salary_to_pay = salary_data["salary_to_pay"]
-            salary_record.save()
-        else:
-            # Si no existe, lo creamos
-            salary_record = SalaryRecord.objects.create(
-                pay_period=pay_period,
-                employee=employee,
-                total_hours=salary_data["total_hours"],
-                regular_hours=salary_data["regular_hours"],
-                night_hours=salary_data["night_hours"],
-                extra_hours=salary_data["extra_hours"],
-                night_shift_factor_applied=salary_data["night_shift_factor_applied"],
-                gross_salary=salary_data["gross_salary"],
-                lunch_deduction_hours=salary_data["lunch_deduction_hours"],
-                other_deductions=salary_data["other_deductions"],
-                other_deductions_description=salary_data[
-                    "other_deductions_description"
-                ],
-                salary_to_pay=salary_data["salary_to_pay"],
-            )
-
+        salary_record = result["salary_record"]
         serializer = SalaryRecordSerializer(salary_record)
 
         # Construir respuesta con advertencias si existen
@@ -169,13 +171,15 @@ class ManagePayPeriodView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = PayPeriodSerializer
+    keyset_ordering = ("-start_date", "-id")
 
     def get(self, request):
         """
         Obtiene información sobre los períodos de pago:
         - Si se proporciona period_id, devuelve ese período específico
         - Si is_active=true, devuelve solo el período activo (no cerrado)
-        - De lo contrario, devuelve todos los períodos
+        - De lo contrario, devuelve todos los períodos paginados por cursor
+          (?paginate=false devuelve la lista completa)
         """
         period_id = request.query_params.get("period_id", None)
         is_active = request.query_params.get("is_active", "").lower() == "true"
@@ -205,8 +209,14 @@ class ManagePayPeriodView(APIView):
 
         # Obtener todos los períodos
         periods = PayPeriod.objects.all().order_by("-start_date")
-        serializer = self.serializer_class(periods, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(periods, request, view=self)
+        if page is None:
+            serializer = self.serializer_class(periods, many=True)
+            return Response(serializer.data)
+
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         action = request.data.get("action", "")
@@ -229,6 +239,8 @@ class ManagePayPeriodView(APIView):
 
             current_period.is_closed = True
             current_period.save()
+            # Congelar los reportes del período cerrado
+            build_period_snapshot(current_period)
 
             serializer = PayPeriodSerializer(current_period)
             return Response(
@@ -329,6 +341,9 @@ class ManagePayPeriodView(APIView):
                 current_period.is_closed = True
                 current_period.save()
 
+                # 4. Congelar los reportes del período cerrado
+                build_period_snapshot(current_period)
+
             # Preparar respuesta
             closed_period_serializer = PayPeriodSerializer(current_period)
             new_period_serializer = PayPeriodSerializer(new_period)
@@ -355,7 +370,7 @@ class ManagePayPeriodView(APIView):
             )
 
 
-class ListEmployeesWithNightHours(APIView):
+class ListEmployeesWithNightHours(ReplicaReadMixin, APIView):
     """
     Lista los empleados que tienen horas nocturnas en el período actual o en el especificado
     para que el admin pueda decidir a quiénes aplicar el factor de pago nocturno
@@ -364,6 +379,7 @@ class ListEmployeesWithNightHours(APIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = EmployeeNightHoursSerializer
 
+    @cached_report(period_report_tags)
     def get(self, request):
         # Obtener period_id de los parámetros de la consulta
         period_id = request.query_params.get("period_id", None)
@@ -389,19 +405,17 @@ class ListEmployeesWithNightHours(APIView):
 
         # Obtener todos los empleados que tienen registros en el período seleccionado
         employees = Employee.objects.filter(
-            attendanceregister__timestamp_in__date__gte=pay_period.start_date,
-            attendanceregister__timestamp_in__date__lte=pay_period.end_date,
+            **pay_period.register_filter("attendanceregister__"),
             attendanceregister__paid=False,
-        ).distinct()
+        ).distinct().prefetch_related(
+            active_timers_prefetch(),
+            # Registros sin pagar de cada empleado en el período seleccionado
+            period_registers_prefetch(pay_period, paid=False),
+        )
 
         for employee in employees:
-            # Obtener todos los registros del empleado en el período seleccionado
-            registers = AttendanceRegister.objects.filter(
-                employee=employee,
-                timestamp_in__date__gte=pay_period.start_date,
-                timestamp_in__date__lte=pay_period.end_date,
-                paid=False,
-            ).order_by("timestamp_in")
+            timers_by_day = index_timers_by_day(employee.active_timers)
+            registers = employee.period_registers
 
             has_night_hours = False
             total_night_hours = timedelta()
@@ -414,10 +428,7 @@ class ListEmployeesWithNightHours(APIView):
                 timestamp_out_local = localtime(register.timestamp_out)
 
                 # Verificar si el turno es nocturno según Timer
-                day_of_week = timestamp_in_local.weekday()
-                timer = Timer.objects.filter(
-                    employee=employee, day=day_of_week, is_active=True
-                ).first()
+                timer = timers_by_day.get(timestamp_in_local.weekday())
 
                 # Calcular horas nocturnas REALES
                 if timer and timer.is_night_shift:
@@ -499,8 +510,7 @@ class CalculateAllSalaries(APIView):
 
         # Obtener empleados con registros en el período
         employees = Employee.objects.filter(
-            attendanceregister__timestamp_in__date__gte=pay_period.start_date,
-            attendanceregister__timestamp_in__date__lte=pay_period.end_date,
+            **pay_period.register_filter("attendanceregister__"),
             attendanceregister__paid=False,
         ).distinct()
 
@@ -514,68 +524,28 @@ class CalculateAllSalaries(APIView):
 
         # Calcular salarios para cada empleado
         salary_records = []
+        skipped_employees = []
         total_planilla = Decimal("0.0")
 
-        for employee in employees:
-            # Buscar si ya existe un SalaryRecord para este empleado y período
-            salary_record = SalaryRecord.objects.filter(
-                employee=employee, pay_period=pay_period
-            ).first()
-
-            # Calcular salario utilizando apply_night_factor del serializer
-            salary_data = calculate_pay_to_go(
-                employee,
-                apply_night_factor=apply_night_factor,
-                period_id=period_id,
-                other_deductions=other_deductions,
-                other_deductions_description=other_deductions_description,
-            )
-
-            if "error" in salary_data:
-                continue
-
-            if salary_record:
-                # Si ya existe, actualizamos los campos
-                salary_record.total_hours = salary_data["total_hours"]
-                salary_record.regular_hours = salary_data["regular_hours"]
-                salary_record.night_hours = salary_data["night_hours"]
-                salary_record.extra_hours = salary_data["extra_hours"]
-                salary_record.night_shift_factor_applied = salary_data[
-                    "night_shift_factor_applied"
-                ]
-                salary_record.gross_salary = salary_data["gross_salary"]
-                salary_record.lunch_deduction_hours = salary_data[
-                    "lunch_deduction_hours"
-                ]
-                salary_record.other_deductions = salary_data["other_deductions"]
-                salary_record.other_deductions_description = salary_data[
-                    "other_deductions_description"
-                ]
-                salary_record.salary_to_pay = salary_data["salary_to_pay"]
-                salary_record.save()
-            else:
-                # Crear registro de salario
-                salary_record = SalaryRecord.objects.create(
-                    pay_period=pay_period,
-                    employee=employee,
-                    total_hours=salary_data["total_hours"],
-                    regular_hours=salary_data["regular_hours"],
-                    night_hours=salary_data["night_hours"],
-                    extra_hours=salary_data["extra_hours"],
-                    night_shift_factor_applied=salary_data[
-                        "night_shift_factor_applied"
-                    ],
-                    gross_salary=salary_data["gross_salary"],
-                    lunch_deduction_hours=salary_data["lunch_deduction_hours"],
-                    other_deductions=salary_data["other_deductions"],
-                    other_deductions_description=salary_data[
-                        "other_deductions_description"
-                    ],
-                    salary_to_pay=salary_data["salary_to_pay"],
+        with RUN_SECONDS.time():
+            for employee in employees:
+                # Si otra ejecución ya está calculando este empleado, se omite
+                result = calculate_and_save_salary(
+                    employee,
+                    pay_period,
+                    apply_night_factor=apply_night_factor,
+                    other_deductions=other_deductions,
+                    other_deductions_description=other_deductions_description,
+                    wait=False,
                 )
 
-            salary_records.append(salary_record)
-            total_planilla += salary_data["salary_to_pay"]
+                if "error" in result:
+                    if result.get("locked"):
+                        skipped_employees.append(employee.id)
+                    continue
+
+                salary_records.append(result["salary_record"])
+                total_planilla += result["salary_data"]["salary_to_pay"]
 
         # Serializar y devolver resultados
         serializer = SalaryRecordSerializer(salary_records, many=True)
@@ -587,6 +557,10 @@ class CalculateAllSalaries(APIView):
             "empleados_procesados": len(salary_records),
         }
 
+        # Empleados que otra ejecución simultánea estaba calculando
+        if skipped_employees:
+            response_data["empleados_en_otra_ejecucion"] = skipped_employees
+
         # Agregar advertencias si existen
         if warnings:
             response_data["warnings"] = warnings
@@ -594,13 +568,20 @@ class CalculateAllSalaries(APIView):
         return Response(response_data)
 
 
-class ListSalaryRecordsByPeriod(generics.ListAPIView):
+class ListSalaryRecordsByPeriod(ReplicaReadMixin, ReportFormatsMixin, generics.ListAPIView):
     """
-    Lista todos los registros de salario para un período específico
+    Lista todos los registros de salario para un período específico.
+    Acepta ?fields= y ?format=columnar (ver core.response_formats).
     """
 
     serializer_class = SalaryRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = "id"
+
+    # La foto guarda la lista completa; las páginas se leen por cursor
+    @serve_period_snapshot("salary_records", when=pagination_disabled)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
         period_id = self.request.query_params.get("period_id")
@@ -614,6 +595,50 @@ class ListSalaryRecordsByPeriod(generics.ListAPIView):
         except Exception:
             return SalaryRecord.objects.none()
 
+    def list(self, request, *args, **kwargs):
+        # Lectura rápida: una consulta con values() y el mismo formato que el serializer
+        rows = salary_record_values(self.get_queryset().order_by("id"))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([encode_salary_row(row) for row in page])
+        return Response([encode_salary_row(row) for row in rows])
+
+
+class ExportSalaryRecordsView(APIView):
+    """
+    Exporta en streaming los registros de salario de un período, sin cargar el
+    período completo en memoria.
+
+    GET /payrolls/records/export/?period_id=5               (CSV)
+    GET /payrolls/records/export/?period_id=5&output=ndjson (un JSON por línea)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        period_id = request.query_params.get("period_id", "")
+        output = request.query_params.get("output", "csv")
+
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"error": "Formato no válido. Use 'csv' o 'ndjson'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not period_id.isdigit() or not PayPeriod.objects.filter(id=period_id).exists():
+            return Response(
+                {"error": f"No existe un período de pago con ID {period_id}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stream, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(stream(period_id), content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="planilla-periodo-{period_id}.{output}"'
+        )
+        return response
+
 
 class SalaryRecordEmployeeDetail(generics.RetrieveAPIView):
     """
@@ -625,12 +650,20 @@ class SalaryRecordEmployeeDetail(generics.RetrieveAPIView):
     queryset = SalaryRecord.objects.all()
 
 
-class EmployeeAttendanceDetailView(generics.ListAPIView):
+class EmployeeAttendanceDetailView(ReplicaReadMixin, generics.ListAPIView):
     """
     Obtiene los detalles de asistencia para un empleado en un período específico
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    # Único por empleado (unique_together con employee) e indexado
+    keyset_ordering = "work_date"
+
+    @serve_period_snapshot(
+        "attendance_details", employee_attendance_details, when=pagination_disabled
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def get_serializer_class(self):
         from attendance.serializers import AttendanceDetailSerializer
@@ -647,20 +680,36 @@ class EmployeeAttendanceDetailView(generics.ListAPIView):
             return AttendanceDetail.objects.none()
 
         try:
-            return AttendanceDetail.objects.filter(
-                employee_id=employee_id, pay_period_id=period_id
-            ).order_by("work_date")
+            return (
+                AttendanceDetail.objects.filter(
+                    employee_id=employee_id, pay_period_id=period_id
+                )
+                .select_related("employee")
+                .order_by("work_date")
+            )
         except Exception:
             return AttendanceDetail.objects.none()
 
+    def list(self, request, *args, **kwargs):
+        # Lectura rápida: una consulta con values() y el mismo formato que el serializer
+        rows = attendance_detail_values(self.get_queryset())
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                [encode_attendance_detail_row(row) for row in page]
+            )
+        return Response([encode_attendance_detail_row(row) for row in rows])
 
-class LiveAttendanceSummaryView(APIView):
+
+class LiveAttendanceSummaryView(ReplicaReadMixin, ReportFormatsMixin, APIView):
     """
     Obtiene un resumen en tiempo real de las horas acumuladas en el período activo
     SIN calcular el salario ni marcar registros como pagados.
 
     GET /payrolls/live-summary/?period_id=5&employee_id=10
     GET /payrolls/live-summary/?period_id=5  (todos los empleados)
+    GET /payrolls/live-summary/?fields=employee_id,total_hours&format=columnar
 
     Respuesta:
     {
@@ -683,6 +732,8 @@ class LiveAttendanceSummaryView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]
 
+    @serve_period_snapshot("live_summary", employee_live_summary)
+    @cached_report(period_report_tags)
     def get(self, request):
         period_id = request.query_params.get("period_id")
         employee_id = request.query_params.get("employee_id")
@@ -715,91 +766,77 @@ class LiveAttendanceSummaryView(APIView):
                 )
         else:
             # Todos los empleados con registros en este período
-            employees = Employee.objects.filter(
-                attendanceregister__timestamp_in__date__gte=pay_period.start_date,
-                attendanceregister__timestamp_in__date__lte=pay_period.end_date,
-            ).distinct()
+            employees = period_employees(pay_period)
 
-        employees_summary = []
+        employees_summary = live_attendance_summary(pay_period, employees)
 
-        for employee in employees:
-            # Obtener todos los registros (pagados y no pagados) para ver el total real
-            records = AttendanceRegister.objects.filter(
-                employee=employee,
-                timestamp_in__date__gte=pay_period.start_date,
-                timestamp_in__date__lte=pay_period.end_date,
-            ).order_by("timestamp_in")
+        return Response(
+            {
+                "period": period_summary_header(pay_period),
+                "employees": employees_summary,
+                "total_employees": len(employees_summary),
+            }
+        )
 
-            if not records.exists():
-                continue
 
-            total_worked_hours = timedelta()
-            total_night_hours = timedelta()
-            pending_checkout = 0
-            days_worked = set()
+class PayrollPreviewView(ReplicaReadMixin, APIView):
+    """
+    Vista previa del cálculo de salario SIN marcar registros como pagados ni
+    guardar detalles de asistencia. Los resultados se memorizan hasta que
+    cambien las marcas del empleado.
 
-            for record in records:
-                if not record.timestamp_out:
-                    pending_checkout += 1
-                    continue
+    GET /payrolls/preview/?period_id=5&employee_id=10
+    GET /payrolls/preview/?period_id=5&apply_night_factor=true  (todos los empleados)
+    """
 
-                timestamp_in_local = localtime(record.timestamp_in)
-                timestamp_out_local = localtime(record.timestamp_out)
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = PayrollPreviewSerializer
 
-                if timestamp_out_local <= timestamp_in_local:
-                    continue
+    def get(self, request):
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-                worked_hours = timestamp_out_local - timestamp_in_local
-                days_worked.add(timestamp_in_local.date())
+        period_id = serializer.validated_data.get("period_id")
+        employee_id = serializer.validated_data.get("employee_id")
 
-                # Calcular horas nocturnas
-                day_of_week = timestamp_in_local.weekday()
-                timer = Timer.objects.filter(
-                    employee=employee, day=day_of_week, is_active=True
-                ).first()
+        if period_id:
+            try:
+                pay_period = PayPeriod.objects.get(id=period_id)
+            except PayPeriod.DoesNotExist:
+                return Response(
+                    {"error": f"No existe un período de pago con ID {period_id}"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+        else:
+            pay_period = PayPeriod.objects.filter(is_closed=False).first()
+            if not pay_period:
+                return Response(
+                    {"error": "No hay período de pago activo"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-                if timer and timer.is_night_shift:
-                    night_hours_for_shift = worked_hours
-                else:
-                    night_hours_for_shift = calculate_night_hours(
-                        timestamp_in_local, timestamp_out_local
-                    )
-
-                total_night_hours += night_hours_for_shift
-                total_worked_hours += worked_hours
-
-            # Convertir a decimal
-            total_hours = Decimal(total_worked_hours.total_seconds()) / Decimal(3600)
-            night_hours = Decimal(total_night_hours.total_seconds()) / Decimal(3600)
-
-            # Calcular horas regulares y extra
-            biweekly_limit = Decimal(employee.biweekly_hours)
-            regular_hours = min(total_hours, biweekly_limit)
-            extra_hours = max(Decimal("0"), total_hours - biweekly_limit)
-            night_hours = min(night_hours, regular_hours)
-
-            # Estimar salario (sin deducciones)
-            regular_pay = regular_hours * employee.salary_hour
-            night_premium = (
-                night_hours * employee.salary_hour * (employee.night_shift_factor - Decimal("1.0"))
+        if employee_id and not Employee.objects.filter(id=employee_id).exists():
+            return Response(
+                {"error": f"No existe empleado con ID {employee_id}"},
+                status=status.HTTP_404_NOT_FOUND,
             )
-            extra_pay = extra_hours * employee.salary_hour * Decimal("1.5")
-            estimated_salary = regular_pay + night_premium + extra_pay
 
-            employees_summary.append(
-                {
-                    "employee_id": employee.id,
-                    "employee_username": employee.username,
-                    "employee_full_name": f"{employee.first_name} {employee.last_name}",
-                    "total_hours": str(total_hours.quantize(Decimal("0.01"))),
-                    "regular_hours": str(regular_hours.quantize(Decimal("0.01"))),
-                    "night_hours": str(night_hours.quantize(Decimal("0.01"))),
-                    "extra_hours": str(extra_hours.quantize(Decimal("0.01"))),
-                    "estimated_salary": str(estimated_salary.quantize(Decimal("0.01"))),
-                    "days_worked": len(days_worked),
-                    "pending_checkout": pending_checkout,
-                }
-            )
+        employees = preview_period_pay(
+            pay_period,
+            employee_ids=[employee_id] if employee_id else None,
+            apply_night_factor=serializer.validated_data["apply_night_factor"],
+            other_deductions=serializer.validated_data["other_deductions"],
+            other_deductions_description=serializer.validated_data[
+                "other_deductions_description"
+            ],
+            using=read_alias(),
+        )
+
+        total_planilla = sum(
+            (Decimal(employee["salary_to_pay"]) for employee in employees),
+            Decimal("0.00"),
+        )
 
         return Response(
             {
@@ -810,7 +847,8 @@ class LiveAttendanceSummaryView(APIView):
                     "end_date": pay_period.end_date.isoformat(),
                     "is_closed": pay_period.is_closed,
                 },
-                "employees": employees_summary,
-                "total_employees": len(employees_summary),
+                "employees": employees,
+                "total_employees": len(employees),
+                "total_planilla": str(total_planilla),
             }
         )
@@ -5,10 +5,10 @@ IMPORTANTE: Estas vistas deben ser usadas con cuidado y solo por administradores
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
-from django.db import transaction
-from attendance.models import AttendanceRegister, AttendanceDetail
-from payrolls.models import SalaryRecord, PayPeriod
-from employee.models import Employee
+from core.permissions import IsAdmin
+from core.slow_queries import clear_captures, recent_captures
+from payrolls.models import PayPeriod
+from payrolls.services.attendance_reset import reset_attendance_paid_status
 
 
 class ResetAttendancePaidStatusView(APIView):
@@ -81,95 +81,28 @@ class ResetAttendancePaidStatusView(APIView):
         # Obtener empleados a procesar
         if employee_ids == "all":
             # Todos los empleados que tienen asistencias en este período
-            employee_ids_list = (
-                AttendanceRegister.objects.filter(pay_period=pay_period)
-                .values_list("employee_id", flat=True)
-                .distinct()
-            )
-            employees = Employee.objects.filter(id__in=employee_ids_list)
+            employee_ids_list = None
         else:
             if not isinstance(employee_ids, list):
                 return Response(
                     {"error": "employee_ids debe ser una lista de IDs o 'all'"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            employees = Employee.objects.filter(id__in=employee_ids)
+            employee_ids_list = employee_ids
+
+        result = reset_attendance_paid_status(
+            pay_period,
+            employee_ids=employee_ids_list,
+            delete_salary_records=delete_salary,
+            dry_run=dry_run,
+        )
 
-        if not employees.exists():
+        if not result["employees"]:
             return Response(
                 {"error": "No se encontraron empleados con los IDs especificados"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Estadísticas
-        total_attendance_reset = 0
-        total_details_deleted = 0
-        total_salary_deleted = 0
-        employees_data = []
-
-        # Procesar cada empleado
-        for employee in employees:
-            # Contar asistencias marcadas como pagadas
-            paid_attendance = AttendanceRegister.objects.filter(
-                employee=employee,
-                pay_period=pay_period,
-                paid=True,
-            )
-            count_paid = paid_attendance.count()
-
-            # Contar detalles de asistencia
-            attendance_details = AttendanceDetail.objects.filter(
-                employee=employee,
-                pay_period=pay_period,
-            )
-            count_details = attendance_details.count()
-
-            # Contar registros de salario
-            salary_records = SalaryRecord.objects.filter(
-                employee=employee,
-                pay_period=pay_period,
-            )
-            count_salary = salary_records.count()
-
-            employee_info = {
-                "employee_id": employee.id,
-                "employee_username": employee.username,
-                "attendance_to_reset": count_paid,
-                "details_to_delete": count_details,
-                "salary_records_to_delete": count_salary if delete_salary else 0,
-            }
-
-            # Información del registro de salario si existe
-            if count_salary > 0:
-                salary_record = salary_records.first()
-                employee_info["current_salary_info"] = {
-                    "salary_to_pay": str(salary_record.salary_to_pay),
-                    "total_hours": str(salary_record.total_hours),
-                    "calculated_at": salary_record.paid_at.isoformat(),
-                }
-
-            if not dry_run:
-                with transaction.atomic():
-                    # Resetear asistencias
-                    if count_paid > 0:
-                        updated = paid_attendance.update(paid=False)
-                        total_attendance_reset += updated
-                        employee_info["attendance_reset"] = updated
-
-                    # Eliminar detalles de asistencia
-                    if count_details > 0:
-                        deleted_count = attendance_details.delete()[0]
-                        total_details_deleted += deleted_count
-                        employee_info["details_deleted"] = deleted_count
-
-                    # Eliminar registros de salario si se solicita
-                    if delete_salary and count_salary > 0:
-                        deleted_count = salary_records.delete()[0]
-                        total_salary_deleted += deleted_count
-                        employee_info["salary_records_deleted"] = deleted_count
-
-            employees_data.append(employee_info)
-
         # Construir respuesta
         response_data = {
             "message": "Dry run completado - No se hicieron cambios" if dry_run else "Operación completada exitosamente",
@@ -180,13 +113,11 @@ class ResetAttendancePaidStatusView(APIView):
                 "start_date": pay_period.start_date.isoformat(),
                 "end_date": pay_period.end_date.isoformat(),
             },
-            "summary": {
-                "employees_processed": employees.count(),
-                "attendance_reset": total_attendance_reset,
-                "details_deleted": total_details_deleted,
-                "salary_records_deleted": total_salary_deleted,
-            },
-            "employees": employees_data,
+            "summary": result["summary"],
+            "employees": [
+                {key: value for key, value in info.items() if key != "current_salary_records"}
+                for info in result["employees"]
+            ],
         }
 
         if dry_run:
@@ -203,3 +134,37 @@ class ResetAttendancePaidStatusView(APIView):
             ]
 
         return Response(response_data, status=status.HTTP_200_OK)
+
+
+class SlowQueryCapturesView(APIView):
+    """
+    Consultas lentas capturadas con su plan de ejecución (core/slow_queries.py).
+
+    GET /v1/salary/admin/slow-queries/?limit=20
+    Devuelve las capturas de la más reciente a la más antigua.
+
+    DELETE /v1/salary/admin/slow-queries/
+    Vacía el buffer de capturas.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        captures = recent_captures()
+        limit = request.query_params.get("limit")
+        if limit:
+            try:
+                captures = captures[: max(int(limit), 0)]
+            except ValueError:
+                return Response(
+                    {"error": "limit debe ser un número entero"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        return Response(
+            {"count": len(captures), "captures": captures}, status=status.HTTP_200_OK
+        )
+
+    def delete(self, request):
+        clear_captures()
+        return Response(status=status.HTTP_204_NO_CONTENT)
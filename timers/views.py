@@ -1,5 +1,6 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
+from core.report_cache import cached_report
 from timers.models import Timer
 from timers.serializers import TimerSeriealizer
 
@@ -7,12 +8,21 @@ from timers.serializers import TimerSeriealizer
 class TimerListCreateView(generics.ListCreateAPIView):
     serializer_class = TimerSeriealizer
     permission_classes = [permissions.IsAuthenticated]
+    # Se pagina por empleado (índice de unique_together employee, day)
+    keyset_ordering = "employee_id"
 
     def get_queryset(self):
         return Timer.objects.select_related("employee")
 
+    @cached_report(lambda request: ["timers", "employees"])
     def list(self, request, *args, **kwargs):
         timers = self.get_queryset()
+
+        page = self.paginate_queryset(Timer.objects.values("employee_id").distinct())
+        if page is not None:
+            timers = timers.filter(
+                employee_id__in=[row["employee_id"] for row in page]
+            ).order_by("employee_id", "day")
         # Agrupamos los timers por empleado
         grouped_timers = {}
         for timer in timers:
@@ -27,12 +37,15 @@ class TimerListCreateView(generics.ListCreateAPIView):
         # Convertimos el diccionario a una lista para retornarlo
         response_data = list(grouped_timers.values())
 
+        if page is not None:
+            return self.get_paginated_response(response_data)
         return Response(response_data)
 
 
 class TimerDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TimerSeriealizer
-    queryset = Timer.objects.all()
+    # employee_username sale del empleado
+    queryset = Timer.objects.select_related("employee")
     permission_classes = [permissions.IsAuthenticated]
 
 
@@ -42,7 +55,7 @@ class TimerByEmployeeView(generics.ListAPIView):
 
     def get_queryset(self):
         employee_id = self.kwargs["employee_id"]
-        return Timer.objects.filter(employee_id=employee_id)
+        return Timer.objects.filter(employee_id=employee_id).select_related("employee")
 
     def list(self, request, *args, **kwargs):
         timers = self.get_queryset()